@@ -1,3 +1,4 @@
+import asyncio
 import os
 import pytest
 from moto import mock_s3
@@ -5,11 +6,30 @@ import boto3
 
 BUCKET_NAME = "my-data"
 
+
+def run(coro):
+    """Run a coroutine to completion on a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def aws_credentials():
     """Mocked AWS Credentials for moto."""
     os.environ["AWS_ACCESS_KEY_ID"] = "testing"
     os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    # moto does not decode the aws-chunked bodies botocore sends for checksummed uploads
+    os.environ["AWS_REQUEST_CHECKSUM_CALCULATION"] = "when_required"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Isolate on-disk caches per test."""
+    monkeypatch.setenv("PYCAPE_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -17,4 +37,4 @@ def s3_client(aws_credentials):
     with mock_s3():
         conn = boto3.resource("s3", region_name="us-east-1")
         conn.create_bucket(Bucket=BUCKET_NAME)
-        yield conn
\ No newline at end of file
+        yield conn
@@ -1,7 +1,6 @@
 import argparse
 import os
 import sys
-import time
 
 import pandas as pd
 
@@ -134,7 +133,7 @@ def make_job():
 
     print(f"\nSubmitted job {job} to run")
 
-    return job
+    return project, job
 
 
 if __name__ == "__main__":
@@ -145,21 +144,16 @@ if __name__ == "__main__":
     if not args.skip_setup:
         setup_project()
 
-    job = make_job()
-    status = job.get_status()
+    project, job = make_job()
     print("Waiting for job completion...")
-    count = 0
-    while status != "Completed" and status != "Error":
-        if count > args.timeout:
-            print(f"Timeout after {args.timeout} seconds")
-            sys.exit(-1)
-
-        status = job.get_status()
-        time.sleep(1)
-        count = count + 1
-
-    print(f"Received status {status}. Exiting...")
-    if status == "Completed":
+    try:
+        finished = next(project.wait_for_jobs([job], timeout=args.timeout))
+    except TimeoutError:
+        print(f"Timeout after {args.timeout} seconds")
+        sys.exit(-1)
+
+    print(f"Received status {finished.status}. Exiting...")
+    if finished.status == "Completed":
         sys.exit()
     else:
         sys.exit(-1)
@@ -1,4 +1,5 @@
 # flake8: noqa
+from .api.cape.async_cape import AsyncCape
 from .api.cape.cape import Cape
 from .api.dataview.dataview import DataView
 from .api.job.job import Job
@@ -0,0 +1,213 @@
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from ...network.async_requester import AsyncRequester
+from ...network.requester import Requester
+from ..dataview.dataview import DataView
+from ..job.job import Job
+from ..project.project import Project
+
+
+class AsyncCape:
+    """
+    Coroutine counterpart of `Cape` for services that drive many projects at once.
+
+    All calls share a single pooled connection to the coordinator, so status and metadata \
+    lookups can be fanned out with `asyncio.gather`. Returned `Project` and `Job` instances \
+    are bound to the same underlying requester and remain usable synchronously.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        max_workers: int = 32,
+        requester: Optional[Requester] = None,
+    ) -> None:
+        """
+        Arguments:
+            endpoint: Coordinator endoint to point to.
+            max_workers: Maximum number of coordinator requests in flight at once.
+            requester: A preconfigured `Requester` to use instead of creating one for `endpoint`.
+        """
+        self.__requester: AsyncRequester = AsyncRequester(
+            endpoint=endpoint, requester=requester, max_workers=max_workers
+        )
+        self.__user_id: str = None
+
+    async def __aenter__(self) -> "AsyncCape":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the worker threads and pooled connections.
+        """
+        self.__requester.close()
+
+    def _project(self, project: dict) -> Project:
+        return Project(
+            requester=self.__requester.requester, user_id=self.__user_id, **project
+        )
+
+    def _job(self, project_id: str, job: dict) -> Job:
+        return Job(project_id=project_id, requester=self.__requester.requester, **job)
+
+    async def login(self, token: Optional[str] = None) -> None:
+        """
+        Calls `POST /v1/login`. Authenticate with Cape Cloud in order to make subsequent requests.
+
+        Arguments:
+            token:  User authentication token.
+        """
+        self.__user_id = await self.__requester.login(token=token)
+
+    async def list_projects(self, include: Iterable[str] = ()) -> List[Project]:
+        """
+        Returns all list of projects that requesting user is a contributor of.
+
+        Arguments:
+            include: Nested collections to fetch for each `Project`, any of \
+                `"organizations"`, `"dataviews"` and `"jobs"`.
+        Returns:
+            A list of `Project` instances.
+        """
+        projects = await self.__requester.list_projects(include=include)
+        return [self._project(p) for p in projects]
+
+    async def get_project(
+        self,
+        id: Optional[str] = None,
+        label: Optional[str] = None,
+        include: Optional[Iterable[str]] = None,
+    ) -> Project:
+        """
+        Query a `Project` by either ID or label.
+
+        Arguments:
+            id: ID of `Project`.
+            label: Unique `Project` label.
+            include: Nested collections to fetch, any of `"organizations"`, `"dataviews"` \
+                and `"jobs"`. All of them are fetched by default.
+        Returns:
+            A `Project` instance.
+        """
+        project = await self.__requester.get_project(
+            id=id, label=label, include=include
+        )
+        return self._project(project)
+
+    async def create_project(
+        self, name: str, owner: str, description: Optional[str] = None
+    ) -> Project:
+        """
+        Calls GQL `mutation createProject`
+
+        Arguments:
+            name: name of project.
+            owner: ID of `Organization` this project should belong to.
+            description: description of project.
+        Returns:
+            A `Project` instance.
+        """
+        project = await self.__requester.create_project(
+            name=name, owner=owner, description=description
+        )
+        return self._project(project)
+
+    async def delete_project(self, id: str) -> None:
+        """
+        Archive a `Project` by ID.
+
+        Arguments:
+            id: ID of `Project`.
+        """
+        await self.__requester.archive_project(id=id)
+
+    async def list_dataviews(self, project_id: str) -> List[DataView]:
+        """
+        Returns a list of dataviews for a `Project`.
+
+        Arguments:
+            project_id: ID of `Project`.
+        Returns:
+            A list of `DataView` instances.
+        """
+        data_views = await self.__requester.list_dataviews(project_id=project_id)
+        return [DataView(user_id=self.__user_id, **d) for d in data_views]
+
+    async def get_dataview(
+        self, project_id: str, id: Optional[str] = None, uri: Optional[str] = None
+    ) -> Optional[DataView]:
+        """
+        Query a `DataView` of a `Project` by `DataView` ID or URI.
+
+        Arguments:
+            project_id: ID of `Project`.
+            id: ID of `DataView`.
+            uri: Unique `DataView` URI.
+        Returns:
+            A `DataView` instance.
+        """
+        data_view = await self.__requester.get_dataview(
+            project_id=project_id, dataview_id=id, uri=uri
+        )
+        return DataView(user_id=self.__user_id, **data_view[0]) if data_view else None
+
+    async def list_jobs(self, project_id: str) -> List[Job]:
+        """
+        Returns a list of `Jobs` for a `Project`.
+
+        Arguments:
+            project_id: ID of `Project`.
+        Returns:
+            A list of `Job` instances.
+        """
+        jobs = await self.__requester.list_jobs(project_id=project_id)
+        return [self._job(project_id, j) for j in jobs]
+
+    async def get_job(self, project_id: str, id: str) -> Job:
+        """
+        Returns a `Job` given an ID.
+
+        Arguments:
+            project_id: ID of `Project`.
+            id: ID of `Job`.
+        Returns:
+            A `Job` instance.
+        """
+        job = await self.__requester.get_job(
+            project_id=project_id, job_id=id, return_params=""
+        )
+        return self._job(project_id, job)
+
+    async def get_job_status(self, project_id: str, id: str) -> str:
+        """
+        Query the current status of a `Job`.
+
+        Arguments:
+            project_id: ID of `Project`.
+            id: ID of `Job`.
+        Returns:
+            A `Job` status string.
+        """
+        job = await self.__requester.get_job(
+            project_id=project_id, job_id=id, return_params=""
+        )
+        return job.get("status", {}).get("code")
+
+    async def approve_job(self, project_id: str, id: str, org_id: str) -> Job:
+        """
+        Approve a `Job` on behalf of your organization.
+
+        Arguments:
+            project_id: ID of `Project`.
+            id: ID of `Job`.
+            org_id: ID of `Organization`.
+        Returns:
+            A `Job` instance.
+        """
+        approved_job = await self.__requester.approve_job(job_id=id, org_id=org_id)
+        return self._job(project_id, approved_job)
@@ -0,0 +1,96 @@
+import asyncio
+import contextlib
+
+import pytest
+import responses
+
+from conftest import run
+from tests.fake import FAKE_HOST
+
+from ...exceptions import GQLException
+from ..job.job import Job
+from ..project.project import Project
+from .async_cape import AsyncCape
+
+
+@contextlib.contextmanager
+def notraising():
+    yield
+
+
+class TestAsyncCape:
+    @responses.activate
+    @pytest.mark.parametrize(
+        "json,exception",
+        [
+            (
+                {
+                    "data": {
+                        "projects": [
+                            {
+                                "id": "abc123",
+                                "label": "my-project",
+                                "name": "my-project",
+                                "jobs": [
+                                    {
+                                        "id": "job_123",
+                                        "status": {"code": "Initialized"},
+                                        "task": {"type": "LINEAR_REGRESSION"},
+                                    }
+                                ],
+                            }
+                        ]
+                    }
+                },
+                notraising(),
+            ),
+            (
+                {"errors": [{"message": "something went wrong"}]},
+                pytest.raises(GQLException, match="An error occurred: .*"),
+            ),
+        ],
+    )
+    def test_list_projects(self, json, exception):
+        with exception:
+            responses.add(
+                responses.POST, f"{FAKE_HOST}/v1/query", json=json,
+            )
+
+            async def main():
+                async with AsyncCape(endpoint=FAKE_HOST) as c:
+                    return await c.list_projects()
+
+            projects = run(main())
+
+        if isinstance(exception, contextlib._GeneratorContextManager):
+            assert len(projects) == 1
+            assert isinstance(projects[0], Project)
+            assert isinstance(projects[0].jobs[0], Job)
+
+    @responses.activate
+    def test_get_job_status_fan_out(self):
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={
+                "data": {
+                    "project": {
+                        "job": {
+                            "id": "job_123",
+                            "status": {"code": "Completed"},
+                            "task": {"type": "LINEAR_REGRESSION"},
+                        }
+                    }
+                }
+            },
+        )
+
+        async def main():
+            async with AsyncCape(endpoint=FAKE_HOST) as c:
+                return await asyncio.gather(
+                    *(c.get_job_status("project_123", "job_123") for _ in range(5))
+                )
+
+        statuses = run(main())
+
+        assert statuses == ["Completed"] * 5
@@ -1,11 +1,16 @@
 import io
 import sys
 from abc import ABC
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
-
-from tabulate import tabulate
+from typing import Union
 
 from ...network.requester import Requester
+from ...network.requester import unbatched
+from ...render import Renderer
+from ...render import get_renderer
 from ..project.project import Project
 
 
@@ -16,17 +21,43 @@ class Cape(ABC):
     Use to authenticate with the Cape Cloud and manage top-level resources such as `Project`.
     """
 
-    def __init__(self, out: io.StringIO = None, endpoint: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        out: io.StringIO = None,
+        endpoint: Optional[str] = None,
+        requester: Optional[Requester] = None,
+        render: Union[str, Renderer] = "table",
+    ) -> None:
         """
         Arguments:
             out: The interpreter to be written to.
             endpoint: Coordinator endoint to point to.
+            requester: A preconfigured `Requester` to use instead of creating one for `endpoint`, \
+                e.g. `Requester(endpoint=endpoint, cache=ResponseCache())` to cache metadata queries.
+            render: How listed entities and messages are written to `out`: `"table"`, \
+                `"json"`, `"ndjson"` (one JSON object per line, streamed as rows are built), \
+                `"quiet"` (nothing is written), or a custom `Renderer`. `Projects` returned by \
+                this instance render the same way.
         """
-        self.__requester: Requester = Requester(endpoint=endpoint)
+        self.__requester: Requester = requester or Requester(endpoint=endpoint)
         self.__user_id: str = None
         self._out: io.StringIO = out
         if out is None:
             self._out = sys.stdout
+        self._renderer: Renderer = get_renderer(render)
+
+    @property
+    def _requester(self) -> Requester:
+        return self.__requester
+
+    def _project(self, **project) -> Project:
+        return Project(
+            requester=self.__requester,
+            user_id=self.__user_id,
+            out=self._out,
+            renderer=self._renderer,
+            **project,
+        )
 
     def login(self, token: Optional[str] = None) -> None:
         """
@@ -38,31 +69,66 @@ class Cape(ABC):
             A success messsage write out.
         """
         self.__user_id = self.__requester.login(token=token)
-        self._out.write("Login successful\n")
+        self._renderer.message(self._out, "Login successful")
         return
 
-    def list_projects(self) -> str:
+    @unbatched
+    def list_projects(self, include: Iterable[str] = ()) -> List[Project]:
         """
         Returns all list of projects that requesting user is a contributor of.
 
+        Only the fields that are rendered are fetched by default. Use `include` to also \
+        fetch nested collections for each returned `Project`.
+
+        Arguments:
+            include: Any of `"organizations"`, `"dataviews"` and `"jobs"`.
         Returns:
             A list of `Project` instances.
         """
-        projects = self.__requester.list_projects()
-        get_project_values = [Project(user_id=self.__user_id, **p) for p in projects]
-        format_projects = {
-            "PROJECT ID": [x.id for x in get_project_values],
-            "NAME": [x.name for x in get_project_values],
-            "LABEL": [x.label for x in get_project_values],
-        }
-        self._out.write(tabulate(format_projects, headers="keys") + "\n")
-        return [
-            Project(requester=self.__requester, user_id=self.__user_id, **p)
-            for p in projects
+        projects = [
+            self._project(**p) for p in self.__requester.list_projects(include=include)
         ]
+        self._renderer.render(
+            self._out,
+            ("PROJECT ID", "NAME", "LABEL"),
+            ((x.id, x.name, x.label) for x in projects),
+        )
+        return projects
+
+    @unbatched
+    def iter_projects(
+        self, page_size: int = 100, prefetch: bool = False, include: Iterable[str] = ()
+    ) -> Iterator[Project]:
+        """
+        Lazily iterate over the projects that requesting user is a contributor of, fetching \
+        them a page at a time.
+
+        Arguments:
+            page_size: Number of `Projects` fetched per request.
+            prefetch: Whether to fetch the next page in the background while the current \
+                one is being consumed.
+            include: Nested collections to fetch for each `Project`, any of \
+                `"organizations"`, `"dataviews"` and `"jobs"`.
+        Returns:
+            An iterator of `Project` instances.
+        """
+        pages = self.__requester.iter_pages(
+            lambda first, after: self.__requester.list_projects_page(
+                first=first, after=after, include=include
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+        for page in pages:
+            for p in page:
+                yield self._project(**p)
 
+    @unbatched
     def get_project(
-        self, id: Optional[str] = None, label: Optional[str] = None
+        self,
+        id: Optional[str] = None,
+        label: Optional[str] = None,
+        include: Optional[Iterable[str]] = None,
     ) -> Project:
         """
         Query a `Project` by either ID or label.
@@ -73,12 +139,15 @@ class Cape(ABC):
         Arguments:
             id: ID of `Project`.
             label: Unique `Project` label.
+            include: Nested collections to fetch, any of `"organizations"`, `"dataviews"` \
+                and `"jobs"`. All of them are fetched by default.
         Returns:
             A `Project` instance.
         """
-        project = self.__requester.get_project(id=id, label=label)
-        return Project(requester=self.__requester, user_id=self.__user_id, **project)
+        project = self.__requester.get_project(id=id, label=label, include=include)
+        return self._project(**project)
 
+    @unbatched
     def create_project(
         self, name: str, owner: str, description: Optional[str] = None
     ) -> Project:
@@ -95,7 +164,7 @@ class Cape(ABC):
         project = self.__requester.create_project(
             name=name, owner=owner, description=description
         )
-        return Project(requester=self.__requester, user_id=self.__user_id, **project)
+        return self._project(**project)
 
     def delete_project(self, id: str) -> str:
         """
@@ -107,4 +176,4 @@ class Cape(ABC):
             A success messsage write out.
         """
         self.__requester.archive_project(id=id)
-        return self._out.write(f"Project ({id}) deleted" + "\n")
+        return self._renderer.message(self._out, f"Project ({id}) deleted")
@@ -1,5 +1,6 @@
 import contextlib
 import os
+import time
 from io import StringIO
 
 import pytest
@@ -10,6 +11,7 @@ from tests.fake import FAKE_TOKEN
 
 from ...exceptions import GQLException
 from ...network import NotAUserException
+from ...network import Requester
 from ..job.job import Job
 from ..project.project import Project
 from .cape import Cape
@@ -115,7 +117,7 @@ class TestCape:
             )
             out = StringIO()
             c = Cape(endpoint=FAKE_HOST, out=out)
-            projects = c.list_projects()
+            projects = c.list_projects(include=("jobs",))
 
         if isinstance(exception, contextlib._GeneratorContextManager):
             output = out.getvalue().strip()
@@ -130,6 +132,74 @@ class TestCape:
             assert isinstance(projects[0].jobs[0], Job)
             assert projects[0].jobs[0].id == "job_123"
 
+    @responses.activate
+    @pytest.mark.parametrize(
+        "render,expect",
+        [
+            ("quiet", ""),
+            (
+                "json",
+                '[{"PROJECT ID": "abc123", "NAME": "my-project", "LABEL": null}, '
+                '{"PROJECT ID": "def456", "NAME": "other", "LABEL": null}]',
+            ),
+            (
+                "ndjson",
+                '{"PROJECT ID": "abc123", "NAME": "my-project", "LABEL": null}\n'
+                '{"PROJECT ID": "def456", "NAME": "other", "LABEL": null}',
+            ),
+        ],
+    )
+    def test_list_projects_render(self, render, expect):
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={
+                "data": {
+                    "projects": [
+                        {"id": "abc123", "name": "my-project"},
+                        {"id": "def456", "name": "other"},
+                    ]
+                }
+            },
+        )
+        out = StringIO()
+        c = Cape(endpoint=FAKE_HOST, out=out, render=render)
+        projects = c.list_projects()
+
+        assert out.getvalue().strip() == expect
+        assert [p.id for p in projects] == ["abc123", "def456"]
+        # projects render the same way as the Cape instance they were returned by
+        assert projects[0]._renderer is c._renderer
+
+    @pytest.mark.parametrize("render", ["table", "quiet"])
+    def test_list_projects_10k(self, render, mocker):
+        n = 10000
+        r = Requester(endpoint=FAKE_HOST)
+        mocker.patch.object(
+            r,
+            "list_projects",
+            return_value=[
+                {"id": f"p_{i}", "name": f"project {i}", "label": f"project-{i}"}
+                for i in range(n)
+            ],
+        )
+        init = mocker.spy(Project, "__init__")
+        out = StringIO()
+        c = Cape(out=out, requester=r, render=render)
+
+        start = time.perf_counter()
+        projects = c.list_projects()
+        elapsed = time.perf_counter() - start
+
+        assert len(projects) == n
+        assert init.call_count == n
+        assert out.getvalue().count("\n") == (n + 2 if render == "table" else 0)
+        assert elapsed < 5
+
+    def test_unknown_render(self):
+        with pytest.raises(ValueError, match="Unknown render mode 'xml'"):
+            Cape(endpoint=FAKE_HOST, render="xml")
+
     @responses.activate
     @pytest.mark.parametrize(
         "id,label,json,exception",
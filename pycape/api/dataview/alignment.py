@@ -0,0 +1,182 @@
+import hashlib
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from urllib.parse import urlparse
+
+from ...exceptions import StorageSchemeException
+from ...utils import iter_boto_chunks
+from ...vars import STREAM_CHUNK_BYTES
+from ...vars import STREAM_MAX_WORKERS
+from .stream import iter_csv_blocks
+from .stream import map_blocks
+from .stream import process_pool
+from .stream import read_csv_block
+
+# Rows of a csv dataset: its number of data rows and, when an index column was given, the
+# SHA-256 digest of the sequence of its values.
+DatasetRows = namedtuple("DatasetRows", ["uri", "rows", "index_digest"])
+
+# Result of `check_alignment`, `reason` explains why the datasets are not aligned.
+Alignment = namedtuple("Alignment", ["aligned", "x", "y", "reason"])
+
+# The newline ending a blank line, i.e. one right after another newline.
+BLANK_LINE_RE = re.compile(rb"(?<=\n)\r?\n")
+
+
+def count_rows(
+    uri: str,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    client=None,
+) -> int:
+    """
+    Count the data rows (non-blank lines after the header) of the csv file at uri by counting \
+    the newlines of chunks fetched with concurrent ranged GETs (see `iter_boto_chunks`), \
+    without parsing it. Blank lines are skipped, as when the file is parsed with pandas. \
+    Values are expected not to span lines.
+    """
+    parsed_uri = urlparse(uri)
+    if parsed_uri.scheme != "s3":
+        raise StorageSchemeException(scheme=parsed_uri.scheme)
+
+    lines = 0
+    # the end of the previous chunk, to find blank lines across chunk boundaries
+    tail = b"\n"
+    for chunk in iter_boto_chunks(
+        parsed_uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+    ):
+        lines += chunk.count(b"\n")
+        lines -= sum(1 for _ in BLANK_LINE_RE.finditer(chunk))
+        # blank lines starting at the chunk boundary, which the lookbehind cannot see
+        head = tail + chunk[:2]
+        lines -= sum(
+            1 for m in BLANK_LINE_RE.finditer(head) if m.start() <= len(tail) < m.end()
+        )
+        tail = (tail + chunk)[-2:]
+
+    # the last line may not end with a newline
+    if tail[-1:] != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def read_index_block(block: bytes, names: Sequence[str], column: str) -> bytes:
+    """
+    Returns the text values of `column` in a headerless block of csv rows, stripped and \
+    terminated by newlines.
+    """
+    df = read_csv_block(
+        block, names, usecols=[column], dtype=str, keep_default_na=False
+    )
+    return "".join(f"{v.strip()}\n" for v in df[column]).encode()
+
+
+def hash_index(
+    uri: str,
+    column: str,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    processes: Optional[int] = None,
+    client=None,
+) -> Tuple[int, str]:
+    """
+    Stream the csv file at uri and hash the sequence of (textual) values of its index column.
+
+    Returns:
+        The number of data rows and the hexadecimal SHA-256 digest of the index values.
+    """
+    with process_pool(processes) as pool:
+        return _hash_index(
+            uri,
+            column,
+            chunk_bytes=chunk_bytes,
+            max_workers=max_workers,
+            pool=pool,
+            client=client,
+        )
+
+
+def _hash_index(
+    uri: str,
+    column: str,
+    chunk_bytes: int,
+    max_workers: int,
+    pool: Optional[ProcessPoolExecutor],
+    client,
+) -> Tuple[int, str]:
+    names, blocks = iter_csv_blocks(
+        uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+    )
+    if column not in names:
+        raise Exception(f"Columns not found in {uri}: {column}")
+
+    digest = hashlib.sha256()
+    rows = 0
+    for values in map_blocks(read_index_block, blocks, args=(names, column), pool=pool):
+        digest.update(values)
+        rows += values.count(b"\n")
+
+    return rows, digest.hexdigest()
+
+
+def check_alignment(
+    x_uri: str,
+    y_uri: str,
+    x_index_column: Optional[str] = None,
+    y_index_column: Optional[str] = None,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    processes: Optional[int] = None,
+    client=None,
+) -> Alignment:
+    """
+    Check that the rows of two csv files are aligned: that they have as many rows and, when \
+    index columns are given, the same sequence of index values. Both files are read at once.
+
+    Without index columns, rows are counted from the raw bytes of the files (see \
+    `count_rows`), so the check mostly costs the time to fetch them with `max_workers` \
+    concurrent ranged GETs each. With index columns, only those columns are parsed (see \
+    `hash_index`), on `processes` processes.
+
+    Arguments:
+        x_uri: S3 URI of the first csv file.
+        y_uri: S3 URI of the second csv file.
+        x_index_column: Index column of the first file.
+        y_index_column: Index column of the second file, `x_index_column` by default.
+        chunk_bytes: Size of the chunks the files are read in.
+        max_workers: Maximum number of concurrent ranged reads per file.
+        processes: Number of processes index columns are parsed on.
+    Returns:
+        An `Alignment`.
+    """
+    if x_index_column is None and y_index_column is not None:
+        raise ValueError("y_index_column requires x_index_column")
+    if y_index_column is None:
+        y_index_column = x_index_column
+    options = dict(chunk_bytes=chunk_bytes, max_workers=max_workers, client=client)
+
+    # both files share a process pool, started before any thread reading from S3
+    with process_pool(processes if x_index_column else 1) as procs:
+
+        def read(uri: str, column: Optional[str]) -> DatasetRows:
+            if column is None:
+                return DatasetRows(uri, count_rows(uri, **options), None)
+            return DatasetRows(uri, *_hash_index(uri, column, pool=procs, **options))
+
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            x_future = threads.submit(read, x_uri, x_index_column)
+            y_future = threads.submit(read, y_uri, y_index_column)
+            x, y = x_future.result(), y_future.result()
+
+    reason = None
+    if x.rows != y.rows:
+        reason = f"{x.rows} rows in {x.uri} but {y.rows} rows in {y.uri}"
+    elif x.index_digest != y.index_digest:
+        reason = f"Index values of {x.uri} and {y.uri} differ"
+
+    return Alignment(aligned=reason is None, x=x, y=y, reason=reason)
@@ -0,0 +1,84 @@
+import pytest
+
+from tests.fake import put_s3_object
+
+from ...exceptions import StorageSchemeException
+from .alignment import check_alignment
+from .alignment import count_rows
+from .alignment import hash_index
+
+
+@pytest.mark.parametrize(
+    "body,rows",
+    [
+        (b"", 0),
+        (b"a,b\n", 0),
+        (b"a,b\n1,2\n3,4\n", 2),
+        (b"a,b\n1,2\n3,4", 2),
+        (b"a,b\n" + b"1,2\n" * 1000, 1000),
+        # blank lines are skipped, as by pandas
+        (b"a,b\n1,2\n3,4\n\n", 2),
+        (b"a,b\r\n1,2\r\n\r\n3,4\r\n\r\n", 2),
+        (b"\na,b\n" + b"1,2\n\n\n" * 100, 100),
+    ],
+)
+def test_count_rows(s3_client, body, rows):
+    uri = put_s3_object("align/count.csv", body)
+
+    assert count_rows(uri, chunk_bytes=64, max_workers=4) == rows
+
+
+def test_count_rows_scheme():
+    with pytest.raises(StorageSchemeException):
+        count_rows("gs://my-data/data.csv")
+
+
+def test_hash_index(s3_client):
+    x = put_s3_object(
+        "align/hx.csv", b"id,a\n" + b"".join(b"%d,1.0\n" % i for i in range(500))
+    )
+    y = put_s3_object(
+        "align/hy.csv", b"y,id\n" + b"".join(b"2.0, %d\n" % i for i in range(500))
+    )
+
+    rows, digest = hash_index(x, "id", chunk_bytes=256, processes=1)
+    # values are compared as stripped text, wherever the column is
+    assert (rows, digest) == hash_index(y, "id", chunk_bytes=1024, processes=1)
+    assert rows == 500
+
+    with pytest.raises(Exception, match="Columns not found in .*: key"):
+        hash_index(x, "key", processes=1)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_check_alignment(s3_client, processes):
+    rows = [b"%d,%d\n" % (i, i * 2) for i in range(2000)]
+    x = put_s3_object("align/x.csv", b"id,a\n" + b"".join(rows))
+    y = put_s3_object("align/y.csv", b"id,b\n" + b"".join(rows))
+    shorter = put_s3_object("align/short.csv", b"id,b\n" + b"".join(rows[:-1]))
+    shuffled = put_s3_object(
+        "align/shuffled.csv", b"id,b\n" + b"".join(rows[1:] + rows[:1])
+    )
+
+    alignment = check_alignment(x, y, chunk_bytes=512)
+    assert alignment.aligned
+    assert alignment.x.rows == alignment.y.rows == 2000
+    assert alignment.x.index_digest is None
+
+    alignment = check_alignment(x, shorter, chunk_bytes=512)
+    assert not alignment.aligned
+    assert alignment.reason == f"2000 rows in {x} but 1999 rows in {shorter}"
+
+    # same number of rows, in another order
+    assert check_alignment(x, shuffled, chunk_bytes=512).aligned
+    alignment = check_alignment(
+        x, shuffled, x_index_column="id", chunk_bytes=512, processes=processes
+    )
+    assert not alignment.aligned
+    assert alignment.reason.startswith("Index values of")
+    assert check_alignment(
+        x, y, x_index_column="id", chunk_bytes=512, processes=processes
+    ).aligned
+
+    with pytest.raises(ValueError):
+        check_alignment(x, y, y_index_column="id")
@@ -1,5 +1,3 @@
-import json
-import tempfile
 from abc import ABC
 from typing import Dict
 from typing import List
@@ -7,14 +5,32 @@ from typing import Optional
 from typing import Union
 from urllib.parse import urlparse
 
-import pandas as pd
-from marshmallow import Schema
-from marshmallow import fields
-
 from ...exceptions import StorageAccessException, StorageSchemeException
-from ...utils import filter_date
-from ...utils import setup_boto_file
+from ...lazy import LazyModule
+from ...s3 import get_s3_client
+from ...utils import S3RangeReader
+from ...utils import detect_boto_format
+from ...utils import read_boto_decompressed_head
+from ...utils import read_boto_sample
 from ...vars import PANDAS_TO_JSON_DATATYPES
+from ...vars import SCHEMA_DATETIME_CONFIDENCE
+from ...vars import SCHEMA_INITIAL_BYTES
+from ...vars import SCHEMA_MAX_BYTES
+from ...vars import SCHEMA_SAMPLE_RANGE_BYTES
+from ...vars import SCHEMA_SAMPLE_RANGES
+from ...vars import SCHEMA_SAMPLE_ROWS
+from .inference import ColumnSchema
+from .inference import DateFormatDetector
+from .inference import infer_arrow_schema
+from .inference import infer_schema
+from .inference import read_csv_sample
+from .inference import read_jsonl_sample
+from .schema_cache import SchemaCache
+
+pd = LazyModule("pandas")
+botocore_exceptions = LazyModule("botocore.exceptions")
+# marshmallow is only loaded to validate schemas
+validation = LazyModule("pycape.api.dataview.validation")
 
 
 class DataView(ABC):
@@ -29,6 +45,10 @@ class DataView(ABC):
         owner (dict): Dictionary of fields related to the `DataView` owner.
         user_id (str): User ID of requester.
         development (bool): Whether this dataview is in development mode or not.
+        date_formats (dict): Date format of each datetime column, when its schema was inferred \
+        from the dataset.
+        scale_factors (dict): `ScaleFactor` of each column, when the dataset was scaled by \
+        `Project.create_scaled_dataview`.
     """
 
     def __init__(
@@ -36,7 +56,7 @@ class DataView(ABC):
         id: str = None,
         name: str = None,
         location: str = None,
-        schema: Union[pd.Series, List, None] = None,
+        schema: Union["pd.Series", List, None] = None,
         owner: dict = None,
         user_id: str = None,
         development: Optional[bool] = None,
@@ -44,11 +64,13 @@ class DataView(ABC):
         self.id: Optional[str] = id
         self.name: Optional[str] = name
         self.location: Optional[str] = location
-        self._schema: Union[pd.Series, List, None] = schema
+        self._schema: Union["pd.Series", List, None] = schema
         self._user_id: Optional[str] = user_id
         self._owner: Optional[Dict] = owner
         self._cols = None
         self.development = development
+        self.date_formats: Dict[str, str] = {}
+        self.scale_factors: Dict[str, tuple] = {}
 
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, name={self.name}, location={self.location})"
@@ -69,12 +91,12 @@ class DataView(ABC):
             return {s.get("name"): s.get("schema_type") for s in self._schema}
 
     @staticmethod
-    def _validate_schema(schema: Union[pd.Series, List, None]):
+    def _validate_schema(schema: Union["pd.Series", List, None]):
         """
         Validate that updates to the schema property are pd.Series.
         """
 
-        def _convert_pd_objects_json(pd_obj: pd.Series) -> list:
+        def _convert_pd_objects_json(pd_obj: "pd.Series") -> list:
             """
             Accepts a pandas dataframe.dtype, converts this pandas schema to a dictionary of JSON-like
             data types defined by the PANDAS_TO_JSON_DATATYPES. Returns converted schema list.
@@ -97,7 +119,7 @@ class DataView(ABC):
                 return None
             elif isinstance(schema, list):
                 try:
-                    DataViewSchema(many=True).load(schema)
+                    validation.DataViewSchema(many=True).load(schema)
                     return schema
                 except Exception as e:
                     raise Exception(f"Invalid schema list: {e}")
@@ -112,70 +134,167 @@ class DataView(ABC):
         raise Exception("Schema is not of type pd.Series.")
 
     @staticmethod
-    def _get_schema_from_uri(uri) -> list:
+    def _get_schema_from_uri(uri, **kwargs) -> list:
         """
-        Read first line from csv file read from uri as dataframe,
-        grab schema from dataframe object, return as list of json:
+        Infer the schema of the csv file at uri (see `_infer_columns_from_uri`), return as
+        list of json:
         {
           type: "string",
           name: "my_col_name"
         }
         """
+        return [
+            {"name": c.name, "schema_type": c.schema_type}
+            for c in DataView._infer_columns_from_uri(uri, **kwargs)
+        ]
 
-        def _get_date_cols(dataframe: pd.DataFrame) -> list:
-            """
-            Get list of column names that are of datetime data types
-            """
-            columns = df.columns
-            row_1 = df.iloc[0].values
-            date_cols = []
+    @staticmethod
+    def _infer_columns_from_uri(
+        uri,
+        sample_rows: int = SCHEMA_SAMPLE_ROWS,
+        sample_ranges: int = SCHEMA_SAMPLE_RANGES,
+        range_bytes: int = SCHEMA_SAMPLE_RANGE_BYTES,
+        initial_bytes: int = SCHEMA_INITIAL_BYTES,
+        max_bytes: int = SCHEMA_MAX_BYTES,
+        datetime_confidence: float = SCHEMA_DATETIME_CONFIDENCE,
+        cache: Union[SchemaCache, bool] = True,
+        detector: Optional[DateFormatDetector] = None,
+    ) -> List[ColumnSchema]:
+        """
+        Sample the dataset at uri with ranged reads and infer each column's type.
+
+        Inferred schemas are cached on disk (in `cache`, or a `SchemaCache` under the default \
+        cache directory if `True`) by the object's ETag and size, so inferring the schema of an \
+        unchanged dataset again only costs a HEAD request. Pass `cache=False` to always sample \
+        the dataset.
 
-            for i, d in enumerate(row_1):
-                if isinstance(d, str) and filter_date(d):
-                    date_cols.append(columns[i])
+        Pass the same `detector` when inferring the schemas of several datasets with the same \
+        columns (e.g. the parts of a dataset), so that the date format detected for a column is \
+        checked first on the following ones.
 
-            return date_cols
+        The format is detected from the key's extension (or the object's magic bytes):
 
-        df = None
+        - csv and JSON lines files are sampled as their first `sample_rows` rows plus \
+            `sample_ranges` randomly placed ranges of `range_bytes`, and the date format of \
+            datetime columns is detected.
+        - gzip or zstd compressed csv and JSON lines files are decompressed as they are \
+            streamed, up to their first `sample_rows` rows (or `max_bytes` compressed bytes).
+        - Parquet files only have their footer read, whose schema is mapped directly.
+        """
         parsed_uri = urlparse(uri)
-        if parsed_uri.scheme == "s3":
-            tf = tempfile.NamedTemporaryFile()
-            file_name = setup_boto_file(uri=parsed_uri, temp_file_name=tf.name)
+        if parsed_uri.scheme != "s3":
+            raise StorageSchemeException(scheme=parsed_uri.scheme)
+
+        client = get_s3_client()
+        options = {
+            "sample_rows": sample_rows,
+            "sample_ranges": sample_ranges,
+            "range_bytes": range_bytes,
+            "initial_bytes": initial_bytes,
+            "max_bytes": max_bytes,
+            "datetime_confidence": datetime_confidence,
+        }
+
+        if cache is True:
+            cache = SchemaCache()
+        elif cache is False:
+            cache = None
+
+        key = None
+        if cache is not None:
+            try:
+                head = client.head_object(
+                    Bucket=parsed_uri.netloc, Key=parsed_uri.path.lstrip("/")
+                )
+            except botocore_exceptions.ClientError:
+                # leave reporting inaccessible objects to the sampling below
+                head = None
+
+            if head is not None:
+                key = SchemaCache.key(
+                    parsed_uri.netloc,
+                    parsed_uri.path.lstrip("/"),
+                    head.get("ETag", "").strip('"'),
+                    head["ContentLength"],
+                    options,
+                )
+                columns = cache.get(key)
+                if columns is not None:
+                    return columns
+
+        columns = DataView._infer_columns_from_object(
+            parsed_uri, client, detector=detector, **options
+        )
+        if key is not None:
+            cache.set(key, columns)
+        return columns
 
+    @staticmethod
+    def _infer_columns_from_object(
+        parsed_uri,
+        client,
+        sample_rows: int,
+        sample_ranges: int,
+        range_bytes: int,
+        initial_bytes: int,
+        max_bytes: int,
+        datetime_confidence: float,
+        detector: Optional[DateFormatDetector] = None,
+    ) -> List[ColumnSchema]:
+        data_format, compression = detect_boto_format(parsed_uri, client=client)
+
+        if data_format == "parquet":
+            return DataView._infer_parquet_columns(parsed_uri, client=client)
+
+        if compression is not None:
+            head = read_boto_decompressed_head(
+                parsed_uri,
+                compression=compression,
+                min_lines=sample_rows + 1,
+                chunk_bytes=initial_bytes,
+                max_bytes=max_bytes,
+                client=client,
+            )
+            chunks = []
         else:
-            raise StorageSchemeException(scheme=parsed_uri.scheme)
+            head, chunks = read_boto_sample(
+                uri=parsed_uri,
+                head_lines=sample_rows + 1,
+                sample_ranges=sample_ranges,
+                range_bytes=range_bytes,
+                initial_bytes=initial_bytes,
+                max_bytes=max_bytes,
+                client=client,
+            )
 
         try:
-            df = pd.read_csv(file_name, nrows=1)
+            if data_format == "jsonl":
+                df = read_jsonl_sample(head, chunks)
+            else:
+                df = read_csv_sample(head, chunks)
         except (FileNotFoundError, ValueError):
             raise StorageAccessException()
 
-        date_cols = _get_date_cols(df)
-        for date_col in date_cols:
-            df[date_col] = pd.to_datetime(df[date_col])
-
-        # Pandas to_json function converts dataframe object to json
-        # in doing so it transforms df datatypes into json-like datatypes
-        # ---
-        # dtypes object -> string
-        # dtypes int64 -> integer
-        # dtypes float64 -> number
-        # dtypes datetime64[ns] -> datetime
-        # dtypes category -> any
-
-        return [
-            {"name": s["name"], "schema_type": s["type"]}
-            for s in json.loads(df.to_json(orient="table"))
-            .get("schema", {})
-            .get("fields")
-            if s["name"] != "index" and s["name"] != "Unnamed: 0"
-        ]
+        return infer_schema(
+            df, datetime_confidence=datetime_confidence, detector=detector
+        )
 
+    @staticmethod
+    def _infer_parquet_columns(uri, client=None) -> List[ColumnSchema]:
+        """
+        Read the schema of a Parquet file from its footer, with ranged reads of the end of the
+        file only.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "The pyarrow package is required to read Parquet datasets"
+            )
 
-class DataViewSchema(Schema):
-    """
-    Schema to validate the schema field on DataViews
-    """
+        try:
+            arrow_schema = pq.read_schema(S3RangeReader(uri, client=client))
+        except (OSError, ValueError):
+            raise StorageAccessException()
 
-    name = fields.Str(required=True)
-    schema_type = fields.Str(required=True)
+        return infer_arrow_schema(arrow_schema)
@@ -0,0 +1,245 @@
+import io
+import threading
+from collections import namedtuple
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from ...lazy import LazyModule
+from ...utils import DATE_FORMATS
+from ...vars import PANDAS_TO_JSON_DATATYPES
+
+pd = LazyModule("pandas")
+pdt = LazyModule("pandas.api.types")
+
+# Types are promoted along integer -> number -> string as conflicting values are seen;
+# datetime columns are detected separately on the values that are not numeric.
+# `date_format` is the strptime format of datetime columns, when it is one of DATE_FORMATS.
+ColumnSchema = namedtuple(
+    "ColumnSchema", ["name", "schema_type", "nullable", "date_format"]
+)
+ColumnSchema.__new__.__defaults__ = (None,)
+
+INTEGER_RE = r"^[+-]?\d+$"
+
+
+def _date_share(text: "pd.Series", fmt: str) -> float:
+    return pd.to_datetime(text, format=fmt, errors="coerce").notna().mean()
+
+
+def infer_date_format(
+    text: "pd.Series", confidence: float = 0.95, sample_size: int = 1000
+) -> Optional[str]:
+    """
+    Find the first of `DATE_FORMATS` that at least `confidence` of the (non-empty, stripped) \
+    values are in. Candidate formats are tried on a sample of the values, ruled out with a \
+    vectorized regex match first, and only the winner is parsed on the whole column.
+    """
+    if len(text) == 0:
+        return None
+
+    sample = text.iloc[:sample_size]
+    for fmt, pattern in DATE_FORMATS:
+        matched = sample.str.match(pattern)
+        if matched.mean() < confidence:
+            continue
+        if (
+            _date_share(sample, fmt) >= confidence
+            and _date_share(text, fmt) >= confidence
+        ):
+            return fmt
+
+    return None
+
+
+class DateFormatDetector:
+    """
+    Memoizes the date format detected for each column, so that columns seen again (e.g. in \
+    further samples of the same dataset) are checked against a single format.
+    """
+
+    def __init__(self, confidence: float = 0.95):
+        self.confidence = confidence
+        self._formats: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def formats(self) -> Dict[str, str]:
+        return {k: v for k, v in self._formats.items() if v is not None}
+
+    def detect(self, column: str, text: "pd.Series") -> Optional[str]:
+        with self._lock:
+            known = self._formats.get(column)
+
+        if known is not None and _date_share(text, known) >= self.confidence:
+            return known
+
+        fmt = infer_date_format(text, confidence=self.confidence)
+        with self._lock:
+            self._formats[column] = fmt
+        return fmt
+
+
+def _infer_text_column(
+    name: str,
+    values: "pd.Series",
+    datetime_confidence: float,
+    detector: Optional[DateFormatDetector],
+) -> Tuple[str, Optional[str]]:
+    text = values.astype(str).str.strip()
+
+    numeric = pd.to_numeric(text, errors="coerce")
+    if numeric.notna().all():
+        return ("integer" if text.str.match(INTEGER_RE).all() else "number"), None
+
+    if detector is None:
+        detector = DateFormatDetector(confidence=datetime_confidence)
+    fmt = detector.detect(name, text)
+    if fmt is not None:
+        return "datetime", fmt
+
+    return "string", None
+
+
+def infer_column(
+    name: str,
+    series: "pd.Series",
+    datetime_confidence: float = 0.95,
+    detector: Optional[DateFormatDetector] = None,
+) -> ColumnSchema:
+    """
+    Infer the schema type of a sampled column.
+
+    Columns read as text are promoted across all sampled rows: a column is `integer` only if \
+    every value is an integer, `number` if every value is numeric, `datetime` if at least \
+    `datetime_confidence` of the values are dates in one of `DATE_FORMATS`, and `string` \
+    otherwise. Missing and empty values make a column nullable without affecting its type.
+    """
+    values = series.dropna()
+    if pdt.is_object_dtype(values.dtype) or pdt.is_string_dtype(values.dtype):
+        values = values[values.astype(str).str.strip() != ""]
+    nullable = len(values) < len(series)
+    date_format = None
+
+    if len(values) == 0 or pdt.is_bool_dtype(values.dtype):
+        schema_type = "string"
+    elif pdt.is_integer_dtype(values.dtype):
+        schema_type = "integer"
+    elif pdt.is_float_dtype(values.dtype):
+        schema_type = "number"
+    elif pdt.is_datetime64_any_dtype(values.dtype):
+        schema_type = "datetime"
+    else:
+        schema_type, date_format = _infer_text_column(
+            name, values, datetime_confidence, detector
+        )
+
+    return ColumnSchema(
+        name=name, schema_type=schema_type, nullable=nullable, date_format=date_format
+    )
+
+
+def infer_schema(
+    df: "pd.DataFrame",
+    datetime_confidence: float = 0.95,
+    detector: Optional[DateFormatDetector] = None,
+) -> List[ColumnSchema]:
+    """
+    Infer the schema of every column of a sampled dataframe, skipping unnamed index columns.
+    """
+    if detector is None:
+        detector = DateFormatDetector(confidence=datetime_confidence)
+
+    return [
+        infer_column(
+            str(c), df[c], datetime_confidence=datetime_confidence, detector=detector
+        )
+        for c in df.columns
+        if str(c) != "index" and not str(c).startswith("Unnamed: ")
+    ]
+
+
+def json_datatype(dtype) -> str:
+    """
+    Map a pandas dtype onto the schema types of `PANDAS_TO_JSON_DATATYPES`, normalizing sized \
+    and timezone-aware variants (e.g. `int32`, `datetime64[ns, UTC]`) to their base type.
+    """
+    if pdt.is_bool_dtype(dtype):
+        key = "object"
+    elif pdt.is_integer_dtype(dtype):
+        key = "int64"
+    elif pdt.is_float_dtype(dtype):
+        key = "float64"
+    elif pdt.is_datetime64_any_dtype(dtype):
+        key = "datetime64[ns]"
+    elif isinstance(dtype, pd.CategoricalDtype):
+        key = "category"
+    else:
+        key = "object"
+    return PANDAS_TO_JSON_DATATYPES[key]
+
+
+def infer_arrow_schema(arrow_schema) -> List[ColumnSchema]:
+    """
+    Map the schema of a Parquet file (a `pyarrow.Schema`, read from its footer) onto column \
+    schemas, without reading any row groups.
+    """
+    dtypes = arrow_schema.empty_table().to_pandas().dtypes
+    return [
+        ColumnSchema(
+            name=field.name,
+            schema_type=json_datatype(dtypes[field.name]),
+            nullable=field.nullable,
+        )
+        for field in arrow_schema
+        if field.name in dtypes
+        and field.name != "index"
+        and not field.name.startswith("__index_level_")
+    ]
+
+
+def read_jsonl_sample(head: io.BytesIO, chunks: List[bytes]) -> "pd.DataFrame":
+    """
+    Parse sampled lines of a JSON lines file. Values are kept as parsed (dates are not \
+    converted) so that text columns are typed the same way as in csv files. Chunks that do \
+    not parse are skipped.
+    """
+    df = pd.read_json(head, lines=True, convert_dates=False)
+
+    frames = [df]
+    for chunk in chunks:
+        try:
+            frames.append(
+                pd.read_json(io.BytesIO(chunk), lines=True, convert_dates=False)
+            )
+        except ValueError:
+            continue
+
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else df
+
+
+def read_csv_sample(head: io.BytesIO, chunks: List[bytes]) -> "pd.DataFrame":
+    """
+    Parse the sampled head of a csv file (including its header) and additional chunks of \
+    complete lines sampled from the rest of it as text. Chunks that do not parse into the \
+    header's columns (e.g. because a quoted value spans lines) are skipped.
+    """
+    df = pd.read_csv(head, dtype=str)
+
+    frames = [df]
+    for chunk in chunks:
+        try:
+            frame = pd.read_csv(
+                io.BytesIO(chunk),
+                header=None,
+                names=list(df.columns),
+                index_col=False,
+                dtype=str,
+            )
+        except (ValueError, pd.errors.ParserError):
+            continue
+        if len(frame.columns) == len(df.columns):
+            frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else df
@@ -0,0 +1,249 @@
+import gzip
+import io
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from . import inference
+from .dataview import DataView
+from .inference import ColumnSchema
+from .inference import DateFormatDetector
+from .inference import infer_column
+from .inference import infer_date_format
+from .inference import infer_schema
+from .inference import json_datatype
+from .inference import read_csv_sample
+from .inference import read_jsonl_sample
+
+
+@pytest.mark.parametrize(
+    "values,expect",
+    [
+        (["1", "2", "3"], ("integer", False)),
+        (["1", "2.5", "3"], ("number", False)),
+        (["1", "2.5", "abc"], ("string", False)),
+        (["1", None, "3"], ("integer", True)),
+        (["", "2", "3"], ("integer", True)),
+        (["2021-01-01", "2021-02-01", None], ("datetime", True)),
+        (["2021-01-01", "tomorrow", "2021-02-01"], ("string", False)),
+        # only DATE_FORMATS are dates, not whatever dateutil can make sense of
+        (["Jan", "Feb", "Mar"], ("string", False)),
+        (["March", "April", "May"], ("string", False)),
+        (["1st", "2nd", "3rd"], ("string", False)),
+        (["10:30", "11:00"], ("string", False)),
+        ([None, None], ("string", True)),
+        ([1.0, 2.0], ("number", False)),
+        ([1, 2], ("integer", False)),
+    ],
+)
+def test_infer_column(values, expect):
+    column = infer_column("col", pd.Series(values, dtype=object))
+
+    assert (column.schema_type, column.nullable) == expect
+
+
+def test_infer_column_datetime_confidence():
+    values = pd.Series(["2021-01-01"] * 9 + ["n/a"], dtype=object)
+
+    assert (
+        infer_column("col", values, datetime_confidence=0.9).schema_type == "datetime"
+    )
+    assert infer_column("col", values, datetime_confidence=0.95).schema_type == "string"
+
+
+def test_infer_schema_skips_index():
+    df = pd.DataFrame({"Unnamed: 0": ["0", "1"], "a": ["1", "2"]})
+
+    assert infer_schema(df) == [ColumnSchema("a", "integer", False)]
+
+
+def test_read_csv_sample_skips_bad_chunks():
+    head = io.BytesIO(b"a,b\n1,x\n")
+    df = read_csv_sample(head, [b"2,y\n3,z\n", b'4,"unterminated\n'])
+
+    assert list(df["a"]) == ["1", "2", "3"]
+
+
+def test_get_schema_from_uri_samples_whole_object(s3_client):
+    n = 20000
+    df = pd.DataFrame(
+        {
+            "id": np.arange(n),
+            # only rows far past the head are fractional or missing
+            "score": [str(i) for i in range(n - 10)] + ["1.5"] * 5 + [""] * 5,
+            "name": ["alice"] * n,
+        }
+    )
+    body = df.to_csv(index=False).encode()
+    put_s3_object("inference/data.csv", body)
+
+    head_only = DataView._get_schema_from_uri(
+        f"s3://{BUCKET_NAME}/inference/data.csv", sample_rows=100, sample_ranges=0
+    )
+    sampled = DataView._get_schema_from_uri(
+        f"s3://{BUCKET_NAME}/inference/data.csv",
+        sample_rows=100,
+        sample_ranges=2,
+        range_bytes=len(body) // 2,
+    )
+
+    assert head_only == [
+        {"name": "id", "schema_type": "integer"},
+        {"name": "score", "schema_type": "integer"},
+        {"name": "name", "schema_type": "string"},
+    ]
+    assert sampled[1] == {"name": "score", "schema_type": "number"}
+
+
+@pytest.mark.parametrize(
+    "values,expect",
+    [
+        (["2006-01-13", "2006-1-2"], "%Y-%m-%d"),
+        (["01/13/2006", "12/31/1999"], "%m/%d/%Y"),
+        (["01/13/06", "12/31/99"], "%m/%d/%y"),
+        (["Jan 13, 2006", "Feb 1, 2007"], "%b %d, %Y"),
+        (["January 13, 2006", "February 1, 2007"], "%B %d, %Y"),
+        (["Jan 2006", "Feb 2007"], "%b %Y"),
+        (["2006-13-01", "2006-14-01"], None),
+        (["alice", "bob"], None),
+    ],
+)
+def test_infer_date_format(values, expect):
+    assert infer_date_format(pd.Series(values)) == expect
+
+
+def test_date_format_detector_memoizes(mocker):
+    detector = DateFormatDetector()
+    spy = mocker.spy(inference, "infer_date_format")
+
+    detector.detect("dob", pd.Series(["2006-01-13"]))
+    detector.detect("dob", pd.Series(["2007-02-14"]))
+    detector.detect("dob", pd.Series(["02/14/2007"]))
+
+    assert spy.call_count == 2
+    assert detector.formats == {"dob": "%m/%d/%Y"}
+
+
+def test_infer_columns_from_uri_date_format(s3_client):
+    body = b"id,dob\n1,01/13/2006\n2,12/31/1999\n"
+    put_s3_object("inference/dates.csv", body)
+
+    columns = DataView._infer_columns_from_uri(
+        f"s3://{BUCKET_NAME}/inference/dates.csv"
+    )
+
+    assert columns == [
+        ColumnSchema("id", "integer", False),
+        ColumnSchema("dob", "datetime", False, "%m/%d/%Y"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "dtype,expect",
+    [
+        ("int32", "integer"),
+        ("Int64", "integer"),
+        ("float32", "number"),
+        ("datetime64[ns]", "datetime"),
+        (pd.DatetimeTZDtype(tz="UTC"), "datetime"),
+        ("category", "any"),
+        ("bool", "string"),
+        ("object", "string"),
+    ],
+)
+def test_json_datatype(dtype, expect):
+    assert json_datatype(pd.Series([], dtype=dtype).dtype) == expect
+
+
+def test_read_jsonl_sample():
+    head = io.BytesIO(b'{"a": 1, "b": "x"}\n{"a": 2, "b": "2021-01-01"}\n')
+    df = read_jsonl_sample(head, [b'{"a": 3.5, "b": "y"}\n', b"{not json\n"])
+
+    assert [c.schema_type for c in infer_schema(df)] == ["number", "string"]
+
+
+def _frame(n: int = 5000) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "score": np.arange(n) / 2,
+            "name": ["alice"] * n,
+            "dob": ["2006-01-13"] * n,
+        }
+    )
+
+
+EXPECT_TYPES = [
+    ("id", "integer"),
+    ("score", "number"),
+    ("name", "string"),
+    ("dob", "datetime"),
+]
+
+
+def test_infer_columns_from_gzip_csv(s3_client, mocker):
+    uri = put_s3_object(
+        "inference/data.csv.gz", gzip.compress(_frame().to_csv(index=False).encode())
+    )
+    read_csv = mocker.spy(pd, "read_csv")
+
+    columns = DataView._infer_columns_from_uri(uri, sample_rows=100)
+
+    assert [(c.name, c.schema_type) for c in columns] == EXPECT_TYPES
+    assert columns[3].date_format == "%Y-%m-%d"
+    # only the decompressed head was parsed
+    assert len(read_csv.call_args_list) == 1
+
+
+def test_infer_columns_from_zstd_jsonl(s3_client):
+    zstandard = pytest.importorskip("zstandard")
+    body = _frame().to_json(orient="records", lines=True).encode()
+    uri = put_s3_object(
+        "inference/data.jsonl.zst", zstandard.ZstdCompressor().compress(body)
+    )
+
+    columns = DataView._infer_columns_from_uri(uri, sample_rows=100)
+
+    assert [(c.name, c.schema_type) for c in columns] == EXPECT_TYPES
+
+
+def test_infer_columns_from_jsonl(s3_client):
+    body = _frame().to_json(orient="records", lines=True).encode()
+    uri = put_s3_object("inference/data.ndjson", body)
+
+    columns = DataView._infer_columns_from_uri(uri, sample_rows=100, sample_ranges=2)
+
+    assert [(c.name, c.schema_type) for c in columns] == EXPECT_TYPES
+
+
+def test_infer_columns_from_parquet(s3_client, mocker):
+    pytest.importorskip("pyarrow")
+    df = _frame()
+    df["dob"] = pd.to_datetime(df["dob"])
+    df["name"] = df["name"].astype("category")
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    # no extension, detected from the magic bytes
+    uri = put_s3_object("inference/part-00000", buf.getvalue())
+
+    client = boto3.client("s3")
+    mocker.patch("pycape.api.dataview.dataview.get_s3_client", return_value=client)
+    get_object = mocker.spy(client, "get_object")
+
+    columns = DataView._infer_columns_from_uri(uri)
+
+    assert [(c.name, c.schema_type) for c in columns] == [
+        ("id", "integer"),
+        ("score", "number"),
+        ("name", "any"),
+        ("dob", "datetime"),
+    ]
+    # the magic bytes, then the footer in a single ranged read of the tail
+    ranges = [c.kwargs["Range"] for c in get_object.call_args_list]
+    assert ranges[0] == "bytes=0-3"
+    assert len(ranges) == 2
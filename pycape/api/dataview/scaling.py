@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import math
+from collections import namedtuple
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+from urllib.parse import urlparse
+
+from ...exceptions import StorageSchemeException
+from ...lazy import LazyModule
+from ...s3 import get_s3_client
+from ...utils import S3MultipartWriter
+from ...vars import SCALING_MAX_MAX
+from ...vars import SCALING_MIN_MAX
+from ...vars import STREAM_CHUNK_BYTES
+from ...vars import STREAM_MAX_WORKERS
+from .stats import ColumnStats
+from .stats import column_stats
+from .stream import iter_csv_blocks
+from .stream import map_blocks
+from .stream import process_pool
+from .stream import read_csv_block
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Transform applied to a column by `scale_dataset`: values are mapped by `log1p` first if
+# `log`, then divided by `10 ** exponent`.
+ScaleFactor = namedtuple("ScaleFactor", ["column", "exponent", "log"])
+
+# Result of `scale_dataset`: the URI of the scaled dataset and of the JSON file its scale
+# factors were recorded in, the `ScaleFactor` of each scaled column, and the `ColumnStats` of
+# the input dataset's columns.
+ScaledDataset = namedtuple("ScaledDataset", ["uri", "factors_uri", "factors", "stats"])
+
+
+def scale_values(values, factor: ScaleFactor):
+    """
+    Apply a `ScaleFactor` to a float array (or a float).
+    """
+    if factor.log:
+        values = np.log1p(values)
+    # dividing by an exact power of ten keeps e.g. 1000.0 / 10 ** 3 == 1.0
+    if factor.exponent >= 0:
+        return values / 10.0 ** factor.exponent
+    return values * 10.0 ** -factor.exponent
+
+
+def scale_factor(stats: ColumnStats, log: bool = False) -> ScaleFactor:
+    """
+    Find the power of ten that brings the maximum of a column (after a `log1p` transform if \
+    `log`) within `[SCALING_MIN_MAX, SCALING_MAX_MAX)`.
+    """
+    if stats.max is None:
+        raise Exception(f"Column {stats.name} has no numeric values")
+    if log and stats.min <= -1:
+        raise Exception(
+            f"Column {stats.name} cannot be log-transformed, its min is {stats.min}"
+        )
+
+    top = math.log1p(stats.max) if log else stats.max
+    if not top > 0:
+        raise Exception(f"Column {stats.name} cannot be scaled, its max is {stats.max}")
+
+    factor = ScaleFactor(stats.name, math.floor(math.log10(top)), log)
+    # correct for the rounding of log10 around powers of ten
+    while scale_values(stats.max, factor) >= SCALING_MAX_MAX:
+        factor = factor._replace(exponent=factor.exponent + 1)
+    while scale_values(stats.max, factor) < SCALING_MIN_MAX:
+        factor = factor._replace(exponent=factor.exponent - 1)
+    return factor
+
+
+def scale_block(
+    block: bytes, names: Sequence[str], factors: Dict[str, ScaleFactor]
+) -> bytes:
+    """
+    Scale the columns of a headerless block of csv rows that have a `ScaleFactor`, leaving \
+    the text of the other columns as is.
+    """
+    df = read_csv_block(block, names, dtype=str, keep_default_na=False)
+    for column, factor in factors.items():
+        values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+        df[column] = scale_values(values, factor)
+    return df.to_csv(header=False, index=False).encode()
+
+
+def _csv_header(names: Sequence[str]) -> bytes:
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(names)
+    return out.getvalue().encode()
+
+
+def scale_dataset(
+    uri: str,
+    output_uri: str,
+    columns: Optional[Sequence[str]] = None,
+    log_columns: Iterable[str] = (),
+    factors_uri: Optional[str] = None,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    processes: Optional[int] = None,
+    client=None,
+) -> ScaledDataset:
+    """
+    Write a copy of the csv file at uri to output_uri with its numeric columns scaled such \
+    that `1.0 <= max(c) < 10.0`, as `VerticallyPartitionedLinearRegression` expects.
+
+    The file is streamed twice, holding only a few chunks in memory at once: the maxima of the \
+    columns are computed on a first pass (see `column_stats`), and the chunks are rescaled on \
+    a second pass on several processes and written to S3 with a parallel multipart upload. \
+    Columns are divided by a power of ten, after a `log1p` transform for `log_columns`, and \
+    the resulting `ScaleFactor` of each column is recorded as JSON at factors_uri.
+
+    Arguments:
+        uri: S3 URI of the csv file.
+        output_uri: S3 URI to write the scaled csv file to.
+        columns: Columns to scale, by default all the columns with numeric values (except \
+            unnamed index columns). Other columns are copied as is.
+        log_columns: Columns to log-transform before scaling them.
+        factors_uri: S3 URI to record the scale factors to, `{output_uri}.scaling.json` by \
+            default.
+        chunk_bytes: Size of the chunks the file is read in and of the uploaded parts (at \
+            least 5 MiB).
+        max_workers: Maximum number of concurrent ranged reads and part uploads.
+        processes: Number of processes the chunks are parsed on, the number of CPUs by \
+            default.
+    Returns:
+        A `ScaledDataset`.
+    """
+    log_columns = set(log_columns)
+    if factors_uri is None:
+        factors_uri = f"{output_uri}.scaling.json"
+    for u in (output_uri, factors_uri):
+        scheme = urlparse(u).scheme
+        if scheme != "s3":
+            raise StorageSchemeException(scheme=scheme)
+    if client is None:
+        client = get_s3_client()
+
+    stats = column_stats(
+        uri,
+        columns=columns,
+        chunk_bytes=chunk_bytes,
+        max_workers=max_workers,
+        processes=processes,
+        client=client,
+    )
+    if columns is None:
+        columns = [c for c, s in stats.items() if s.max is not None]
+
+    missing = log_columns.difference(columns)
+    if missing:
+        raise Exception(f"Log columns are not scaled: {', '.join(sorted(missing))}")
+
+    factors = {c: scale_factor(stats[c], log=c in log_columns) for c in columns}
+
+    with process_pool(processes) as pool:
+        names, blocks = iter_csv_blocks(
+            uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+        )
+        with S3MultipartWriter(
+            urlparse(output_uri),
+            part_bytes=chunk_bytes,
+            max_workers=max_workers,
+            content_type="text/csv",
+            client=client,
+        ) as out:
+            out.write(_csv_header(names))
+            for scaled in map_blocks(
+                scale_block, blocks, args=(names, factors), pool=pool
+            ):
+                out.write(scaled)
+
+    parsed_factors_uri = urlparse(factors_uri)
+    client.put_object(
+        Bucket=parsed_factors_uri.netloc,
+        Key=parsed_factors_uri.path.lstrip("/"),
+        Body=json.dumps(
+            {"source": uri, "factors": [f._asdict() for f in factors.values()]}
+        ).encode(),
+        ContentType="application/json",
+    )
+
+    return ScaledDataset(
+        uri=output_uri, factors_uri=factors_uri, factors=factors, stats=stats
+    )
@@ -0,0 +1,125 @@
+import json
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from ...exceptions import StorageSchemeException
+from .scaling import ScaleFactor
+from .scaling import scale_dataset
+from .scaling import scale_factor
+from .scaling import scale_values
+from .stats import ColumnStats
+
+
+@pytest.fixture
+def small_parts(mocker):
+    # moto rejects parts below 5 MiB (except the last one) by default
+    mocker.patch("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 256)
+
+
+@pytest.mark.parametrize(
+    "max,log,exponent",
+    [
+        (1.0, False, 0),
+        (9.99, False, 0),
+        (10.0, False, 1),
+        (1000.0, False, 3),
+        (999.9, False, 2),
+        (0.05, False, -2),
+        (0.1, False, -1),
+        (1e6, True, 1),
+    ],
+)
+def test_scale_factor(max, log, exponent):
+    factor = scale_factor(ColumnStats("c", 1, 0, 0.0, max), log=log)
+
+    assert factor == ScaleFactor("c", exponent, log)
+    assert 1.0 <= scale_values(max, factor) < 10.0
+
+
+@pytest.mark.parametrize(
+    "stats,match",
+    [
+        (ColumnStats("c", 1, 1, None, None), "no numeric values"),
+        (ColumnStats("c", 2, 0, -5.0, 0.0), "cannot be scaled"),
+    ],
+)
+def test_scale_factor_errors(stats, match):
+    with pytest.raises(Exception, match=match):
+        scale_factor(stats)
+
+    with pytest.raises(Exception, match="cannot be log-transformed"):
+        scale_factor(ColumnStats("c", 2, 0, -2.0, 5.0), log=True)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_scale_dataset(s3_client, small_parts, processes):
+    n = 5000
+    df = pd.DataFrame(
+        {
+            "id": [f"row-{i}" for i in range(n)],
+            "x": np.linspace(0, 2500.0, n),
+            "y": np.r_[np.nan, np.linspace(0.001, 0.05, n - 1)],
+            "z": np.geomspace(1, 1e8, n),
+        }
+    )
+    put_s3_object("scale/in.csv", df.to_csv(index=False).encode())
+    output_uri = f"s3://{BUCKET_NAME}/scale/out-{processes}.csv"
+
+    scaled = scale_dataset(
+        f"s3://{BUCKET_NAME}/scale/in.csv",
+        output_uri,
+        log_columns=["z"],
+        chunk_bytes=4096,
+        processes=processes,
+    )
+
+    assert scaled.uri == output_uri
+    assert scaled.factors == {
+        "x": ScaleFactor("x", 3, False),
+        "y": ScaleFactor("y", -2, False),
+        "z": ScaleFactor("z", 1, True),
+    }
+
+    out = pd.read_csv(
+        boto3.resource("s3")
+        .Object(BUCKET_NAME, f"scale/out-{processes}.csv")
+        .get()["Body"]
+    )
+    assert list(out.columns) == ["id", "x", "y", "z"]
+    assert out["id"].tolist() == df["id"].tolist()
+    np.testing.assert_allclose(out["x"], df["x"] / 1000)
+    np.testing.assert_allclose(out["y"], df["y"] * 100)
+    np.testing.assert_allclose(out["z"], np.log1p(df["z"]) / 10)
+    for c in ["x", "y", "z"]:
+        assert 1.0 <= out[c].max() < 10.0
+
+    factors = json.loads(
+        boto3.resource("s3")
+        .Object(BUCKET_NAME, f"scale/out-{processes}.csv.scaling.json")
+        .get()["Body"]
+        .read()
+    )
+    assert factors["factors"][0] == {"column": "x", "exponent": 3, "log": False}
+
+
+def test_scale_dataset_errors(s3_client):
+    put_s3_object("scale/errors.csv", b"a,b\n1,20\n2,30\n")
+    uri = f"s3://{BUCKET_NAME}/scale/errors.csv"
+
+    with pytest.raises(StorageSchemeException):
+        scale_dataset(uri, "gs://bucket/out.csv", processes=1)
+
+    with pytest.raises(Exception, match="Log columns are not scaled: b"):
+        scale_dataset(
+            uri,
+            f"s3://{BUCKET_NAME}/out.csv",
+            columns=["a"],
+            log_columns=["b"],
+            processes=1,
+        )
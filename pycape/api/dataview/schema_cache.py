@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import List
+from typing import Optional
+
+from ...vars import SCHEMA_CACHE_DIR
+from ...vars import SCHEMA_CACHE_MAX_BYTES
+from ...vars import SCHEMA_CACHE_MAX_ENTRIES
+from .inference import ColumnSchema
+
+SCHEMA_CACHE_FILE = "schemas.sqlite3"
+
+
+def default_cache_dir() -> str:
+    return os.path.expanduser(os.environ.get("PYCAPE_CACHE_DIR", SCHEMA_CACHE_DIR))
+
+
+class SchemaCache:
+    """
+    On-disk cache of inferred dataset schemas, stored in a SQLite database.
+
+    Schemas are keyed by the dataset's bucket, key, ETag and size (and the options they were \
+    inferred with), so a changed object is never served a stale schema. The least recently \
+    used schemas are evicted once either `max_entries` or `max_bytes` of stored schemas is \
+    exceeded. The database can be shared by threads and processes.
+
+    Arguments:
+        path (str): Path of the SQLite database, `schemas.sqlite3` under `default_cache_dir()` \
+        by default.
+        max_entries (int): Maximum number of cached schemas.
+        max_bytes (int): Upper bound on the serialized size of cached schemas.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = SCHEMA_CACHE_MAX_ENTRIES,
+        max_bytes: int = SCHEMA_CACHE_MAX_BYTES,
+    ):
+        self.path = path or os.path.join(default_cache_dir(), SCHEMA_CACHE_FILE)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._lock, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS schemas ("
+                    " key TEXT PRIMARY KEY,"
+                    " columns TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " used REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS schemas_used ON schemas (used)"
+                )
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def key(bucket: str, path: str, etag: str, size: int, options: dict = None) -> str:
+        return json.dumps([bucket, path, etag, size, options or {}], sort_keys=True)
+
+    def get(self, key: str) -> Optional[List[ColumnSchema]]:
+        """
+        Returns the cached columns for a key, or `None`.
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT columns FROM schemas WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE schemas SET used = ? WHERE key = ?", (time.time(), key)
+                )
+        except sqlite3.Error:
+            # the cache is an optimization only, fall back to inferring the schema
+            return None
+
+        return [ColumnSchema(*c) for c in json.loads(row[0])]
+
+    def set(self, key: str, columns: List[ColumnSchema]) -> None:
+        data = json.dumps([list(c) for c in columns])
+        if len(data) > self.max_bytes:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO schemas (key, columns, size, used)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()),
+                )
+                self._evict(conn)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM schemas"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM schemas ORDER BY used"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM schemas WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM schemas")
+        except sqlite3.Error:
+            pass
+
+    def __len__(self) -> int:
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT COUNT(*) FROM schemas").fetchone()[0]
+        except sqlite3.Error:
+            return 0
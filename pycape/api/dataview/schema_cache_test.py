@@ -0,0 +1,93 @@
+import boto3
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from .dataview import DataView
+from .inference import ColumnSchema
+from .schema_cache import SchemaCache
+
+COLUMNS = [
+    ColumnSchema("id", "integer", False),
+    ColumnSchema("dob", "datetime", True, "%Y-%m-%d"),
+]
+
+
+def test_schema_cache(tmp_path):
+    cache = SchemaCache(path=str(tmp_path / "schemas.sqlite3"))
+    key = SchemaCache.key("bucket", "data.csv", "etag", 10)
+
+    assert cache.get(key) is None
+    cache.set(key, COLUMNS)
+    assert cache.get(key) == COLUMNS
+    assert cache.get(SchemaCache.key("bucket", "data.csv", "other-etag", 10)) is None
+
+    # the database is shared with other instances
+    assert SchemaCache(path=str(tmp_path / "schemas.sqlite3")).get(key) == COLUMNS
+
+
+def test_schema_cache_eviction(tmp_path):
+    cache = SchemaCache(path=str(tmp_path / "schemas.sqlite3"), max_entries=2)
+    keys = [SchemaCache.key("bucket", f"{i}.csv", "etag", 10) for i in range(3)]
+
+    cache.set(keys[0], COLUMNS)
+    cache.set(keys[1], COLUMNS)
+    # using the first schema makes the second the least recently used
+    assert cache.get(keys[0]) == COLUMNS
+    cache.set(keys[2], COLUMNS)
+
+    assert len(cache) == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == COLUMNS
+
+
+def test_schema_cache_max_bytes(tmp_path):
+    cache = SchemaCache(path=str(tmp_path / "schemas.sqlite3"), max_bytes=100)
+    keys = [SchemaCache.key("bucket", f"{i}.csv", "etag", 10) for i in range(3)]
+
+    for key in keys:
+        cache.set(key, COLUMNS)
+
+    assert len(cache) == 1
+    assert cache.get(keys[2]) == COLUMNS
+
+
+def test_schema_cache_unwritable(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = SchemaCache(path=str(blocker / "schemas.sqlite3"))
+    key = SchemaCache.key("bucket", "data.csv", "etag", 10)
+
+    cache.set(key, COLUMNS)
+    assert cache.get(key) is None
+
+
+def test_infer_columns_from_uri_cached(s3_client, mocker):
+    put_s3_object("schema_cache/data.csv", b"id,dob\n1,2006-01-13\n")
+    uri = f"s3://{BUCKET_NAME}/schema_cache/data.csv"
+
+    client = boto3.client("s3")
+    mocker.patch("pycape.api.dataview.dataview.get_s3_client", return_value=client)
+    get_object = mocker.spy(client, "get_object")
+    head_object = mocker.spy(client, "head_object")
+
+    columns = DataView._infer_columns_from_uri(uri)
+    assert [(c.name, c.schema_type) for c in columns] == [
+        ("id", "integer"),
+        ("dob", "datetime"),
+    ]
+
+    get_object.reset_mock()
+    head_object.reset_mock()
+    assert DataView._infer_columns_from_uri(uri) == columns
+    assert get_object.call_count == 0
+    assert head_object.call_count == 1
+
+    # a changed object has a different ETag and is sampled again
+    put_s3_object("schema_cache/data.csv", b"id,dob\n1.5,2006-01-13\n")
+    assert DataView._infer_columns_from_uri(uri)[0].schema_type == "number"
+    assert get_object.call_count > 0
+
+    get_object.reset_mock()
+    DataView._infer_columns_from_uri(uri, cache=False)
+    assert get_object.call_count > 0
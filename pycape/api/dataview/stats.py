@@ -0,0 +1,116 @@
+from collections import namedtuple
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from ...lazy import LazyModule
+from ...vars import STREAM_CHUNK_BYTES
+from ...vars import STREAM_MAX_WORKERS
+from .stream import iter_csv_blocks
+from .stream import map_blocks
+from .stream import process_pool
+from .stream import read_csv_block
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Summary of a numeric column: `count` values of which `nan_count` are missing or not
+# numeric. `min` and `max` are `None` when no value is numeric.
+ColumnStats = namedtuple("ColumnStats", ["name", "count", "nan_count", "min", "max"])
+
+
+def _merge(a: ColumnStats, b: ColumnStats) -> ColumnStats:
+    def pick(f, x, y):
+        if x is None:
+            return y
+        if y is None:
+            return x
+        return f(x, y)
+
+    return ColumnStats(
+        name=a.name,
+        count=a.count + b.count,
+        nan_count=a.nan_count + b.nan_count,
+        min=pick(min, a.min, b.min),
+        max=pick(max, a.max, b.max),
+    )
+
+
+def block_stats(
+    block: bytes, names: Sequence[str], columns: Sequence[str]
+) -> List[ColumnStats]:
+    """
+    Compute the stats of `columns` over a headerless block of csv rows.
+    """
+    df = read_csv_block(block, names, usecols=columns)
+
+    stats = []
+    for c in columns:
+        values = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        valid = values[~np.isnan(values)]
+        stats.append(
+            ColumnStats(
+                name=c,
+                count=len(values),
+                nan_count=len(values) - len(valid),
+                min=float(valid.min()) if len(valid) else None,
+                max=float(valid.max()) if len(valid) else None,
+            )
+        )
+    return stats
+
+
+def merge_stats(stats: Iterable[List[ColumnStats]]) -> Dict[str, ColumnStats]:
+    """
+    Merge the stats of several blocks of the same columns.
+    """
+    merged: Dict[str, ColumnStats] = {}
+    for block in stats:
+        for s in block:
+            merged[s.name] = _merge(merged[s.name], s) if s.name in merged else s
+    return merged
+
+
+def column_stats(
+    uri: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    processes: Optional[int] = None,
+    client=None,
+) -> Dict[str, ColumnStats]:
+    """
+    Compute the count, missing values, minimum and maximum of numeric columns of the csv file \
+    at uri in a single streaming pass, holding only a few chunks in memory at once.
+
+    Arguments:
+        uri: S3 URI of the csv file.
+        columns: Columns to compute stats of, all of them (except unnamed index columns) by \
+            default. Other columns are not parsed.
+        chunk_bytes: Size of the chunks the file is read in.
+        max_workers: Maximum number of concurrent ranged reads.
+        processes: Number of processes the chunks are parsed on, the number of CPUs by \
+            default. Chunks are parsed in the calling process when 1.
+    Returns:
+        The `ColumnStats` of each column, by name.
+    """
+    with process_pool(processes) as pool:
+        names, blocks = iter_csv_blocks(
+            uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+        )
+        if columns is None:
+            columns = [
+                n for n in names if n and n != "index" and not n.startswith("Unnamed: ")
+            ]
+
+        missing = [c for c in columns if c not in names]
+        if missing:
+            raise Exception(f"Columns not found in {uri}: {', '.join(missing)}")
+
+        stats = merge_stats(
+            map_blocks(block_stats, blocks, args=(names, list(columns)), pool=pool)
+        )
+
+    return {c: stats.get(c, ColumnStats(c, 0, 0, None, None)) for c in columns}
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.fake import put_s3_object
+
+from .stats import ColumnStats
+from .stats import column_stats
+from .stream import iter_csv_blocks
+
+
+def test_iter_csv_blocks(s3_client):
+    df = pd.DataFrame({"a": np.arange(1000), "b": np.arange(1000) * 2})
+    uri = put_s3_object("stats/blocks.csv", df.to_csv(index=False).encode())
+
+    names, blocks = iter_csv_blocks(uri, chunk_bytes=512)
+    blocks = list(blocks)
+
+    assert names == ["a", "b"]
+    assert len(blocks) > 1
+    assert sum(b.count(b"\n") for b in blocks) == 1000
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_column_stats(s3_client, processes):
+    n = 5000
+    df = pd.DataFrame(
+        {
+            "x": np.linspace(1.0, 9.5, n),
+            "y": np.r_[np.arange(n - 2) / 1000, np.nan, np.nan],
+            "label": ["a"] * n,
+        }
+    )
+    uri = put_s3_object(f"stats/data-{processes}.csv", df.to_csv().encode())
+
+    stats = column_stats(uri, chunk_bytes=4096, processes=processes)
+
+    # the unnamed index column is skipped
+    assert list(stats) == ["x", "y", "label"]
+    assert stats["x"] == ColumnStats("x", n, 0, 1.0, 9.5)
+    assert stats["y"] == ColumnStats("y", n, 2, 0.0, (n - 3) / 1000)
+    assert stats["label"] == ColumnStats("label", n, n, None, None)
+
+
+def test_column_stats_columns(s3_client, mocker):
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+    uri = put_s3_object("stats/columns.csv", df.to_csv(index=False).encode())
+    read_csv = mocker.spy(pd, "read_csv")
+
+    stats = column_stats(uri, columns=["y"], processes=1)
+
+    assert stats == {"y": ColumnStats("y", 2, 0, 3.0, 4.0)}
+    assert read_csv.call_args.kwargs["usecols"] == ["y"]
+
+    with pytest.raises(Exception, match="Columns not found in .*: z"):
+        column_stats(uri, columns=["y", "z"], processes=1)
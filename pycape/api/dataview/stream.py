@@ -0,0 +1,194 @@
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from urllib.parse import urlparse
+
+from ...exceptions import StorageSchemeException
+from ...lazy import LazyModule
+from ...utils import iter_boto_lines
+from ...vars import STREAM_CHUNK_BYTES
+from ...vars import STREAM_MAX_WORKERS
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+
+def iter_csv_blocks(
+    uri: str,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    client=None,
+) -> Tuple[List[str], Iterator[bytes]]:
+    """
+    Stream the csv file at uri from S3 in blocks of complete rows (see `iter_boto_lines`), \
+    without downloading it first. Values are expected not to span lines.
+
+    Returns:
+        The column names from the header, and an iterator of headerless blocks of rows.
+    """
+    parsed_uri = urlparse(uri)
+    if parsed_uri.scheme != "s3":
+        raise StorageSchemeException(scheme=parsed_uri.scheme)
+
+    blocks = iter_boto_lines(
+        parsed_uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+    )
+    first = next(blocks, b"")
+    header, _, rest = first.partition(b"\n")
+    names = next(csv.reader([header.decode().rstrip("\r")]), [])
+
+    def rows() -> Iterator[bytes]:
+        if rest:
+            yield rest
+        yield from blocks
+
+    return names, rows()
+
+
+def read_csv_block(
+    block: bytes,
+    names: Sequence[str],
+    usecols: Optional[Sequence[str]] = None,
+    **kwargs,
+) -> "pd.DataFrame":
+    """
+    Parse a headerless block of csv rows, keeping only the `usecols` columns if given. \
+    Other keyword arguments are passed on to `pd.read_csv`.
+    """
+    return pd.read_csv(
+        io.BytesIO(block),
+        header=None,
+        names=list(names),
+        usecols=list(usecols) if usecols is not None else None,
+        index_col=False,
+        **kwargs,
+    )
+
+
+def map_blocks(
+    fn,
+    blocks: Iterator[bytes],
+    args: tuple = (),
+    pool: Optional[ProcessPoolExecutor] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator:
+    """
+    Apply `fn(block, *args)` to every block, on a process pool if given, yielding the results \
+    in order. At most `max_pending` blocks (two per CPU by default) are in flight, to bound \
+    memory.
+    """
+    if pool is None:
+        for block in blocks:
+            yield fn(block, *args)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+
+    pending = deque()
+    for block in blocks:
+        pending.append(pool.submit(fn, block, *args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+@contextmanager
+def process_pool(
+    processes: Optional[int] = None,
+) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """
+    Process pool for parsing blocks on several CPUs, or `None` if `processes` is 1.
+    Defaults to the number of CPUs.
+
+    The worker processes are started right away, before any thread reading from S3 is, so
+    that they are not forked while those threads hold locks.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1:
+        yield None
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        list(pool.map(int, range(processes)))
+        yield pool
+
+
+def read_numeric_block(
+    block: bytes, names: Sequence[str], columns: Sequence[str]
+) -> "np.ndarray":
+    """
+    Parse `columns` of a headerless block of csv rows as a 2-d float array, with `NaN` for \
+    missing or non-numeric values.
+    """
+    df = read_csv_block(block, names, usecols=columns)
+    return np.column_stack(
+        [pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float) for c in columns]
+    ).reshape(len(df), len(columns))
+
+
+def iter_numeric_arrays(
+    uri: str,
+    columns: Sequence[str],
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    pool: Optional[ProcessPoolExecutor] = None,
+    client=None,
+) -> Iterator["np.ndarray"]:
+    """
+    Stream `columns` of the csv file at uri as consecutive 2-d float arrays of rows (see \
+    `read_numeric_block`), parsed on a process pool if given.
+    """
+    names, blocks = iter_csv_blocks(
+        uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+    )
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise Exception(f"Columns not found in {uri}: {', '.join(missing)}")
+
+    return map_blocks(
+        read_numeric_block, blocks, args=(names, list(columns)), pool=pool
+    )
+
+
+def iter_aligned_arrays(
+    a: Iterable["np.ndarray"], b: Iterable["np.ndarray"]
+) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """
+    Re-chunk two streams of row arrays into pairs of arrays with the same rows, i.e. the \
+    `k`-th rows of both streams are yielded together. Raises if the streams do not have the \
+    same number of rows.
+    """
+    a, b = iter(a), iter(b)
+    a_buf = b_buf = None
+    while True:
+        if a_buf is None or len(a_buf) == 0:
+            a_buf = next(a, None)
+        if b_buf is None or len(b_buf) == 0:
+            b_buf = next(b, None)
+        if a_buf is None or b_buf is None:
+            break
+
+        n = min(len(a_buf), len(b_buf))
+        if n:
+            yield a_buf[:n], b_buf[:n]
+        a_buf, b_buf = a_buf[n:], b_buf[n:]
+
+    a_rest = (0 if a_buf is None else len(a_buf)) + sum(len(x) for x in a)
+    b_rest = (0 if b_buf is None else len(b_buf)) + sum(len(x) for x in b)
+    if a_rest or b_rest:
+        raise Exception(
+            f"Datasets do not have the same number of rows, {a_rest or b_rest} extra rows "
+            f"in the {'first' if a_rest else 'second'} one"
+        )
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from .stream import iter_aligned_arrays
+from .stream import read_numeric_block
+
+
+def test_read_numeric_block():
+    block = b"1,a,2.5\n,b,x\n3,c,4\n"
+
+    values = read_numeric_block(block, ["i", "s", "f"], ["f", "i"])
+
+    np.testing.assert_array_equal(values, [[2.5, 1.0], [np.nan, np.nan], [4.0, 3.0]])
+
+
+@pytest.mark.parametrize(
+    "a_sizes,b_sizes", [([3, 3, 4], [10]), ([1, 9], [4, 4, 2]), ([0, 10], [5, 0, 5])]
+)
+def test_iter_aligned_arrays(a_sizes, b_sizes):
+    def chunks(sizes, offset):
+        start = 0
+        for n in sizes:
+            yield np.arange(start, start + n) + offset
+            start += n
+
+    pairs = list(iter_aligned_arrays(chunks(a_sizes, 0), chunks(b_sizes, 100)))
+
+    a = np.concatenate([p[0] for p in pairs])
+    b = np.concatenate([p[1] for p in pairs])
+    np.testing.assert_array_equal(a, np.arange(10))
+    np.testing.assert_array_equal(b, np.arange(10) + 100)
+    assert all(len(x) == len(y) for x, y in pairs)
+
+
+def test_iter_aligned_arrays_mismatch():
+    with pytest.raises(Exception, match="2 extra rows in the second"):
+        list(iter_aligned_arrays([np.zeros(3)], [np.zeros(4), np.zeros(1)]))
@@ -0,0 +1,11 @@
+from marshmallow import Schema
+from marshmallow import fields
+
+
+class DataViewSchema(Schema):
+    """
+    Schema to validate the schema field on DataViews
+    """
+
+    name = fields.Str(required=True)
+    schema_type = fields.Str(required=True)
@@ -1,13 +1,15 @@
-import tempfile
 from abc import ABC
+from typing import Optional
 from typing import Tuple
 from urllib.parse import urlparse
 
-import numpy as np
-
 from ...exceptions import StorageSchemeException
+from ...lazy import LazyModule
 from ...network.requester import Requester
-from ...utils import setup_boto_file
+from ...network.requester import unbatched
+from ...utils import read_boto_object
+
+np = LazyModule("numpy")
 
 
 class Job(ABC):
@@ -39,6 +41,7 @@ class Job(ABC):
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, job_type={self.job_type}, status={self.status})"
 
+    @unbatched
     def get_status(self) -> str:
         """
         Query the current status of the Cape `Job`.
@@ -64,7 +67,8 @@ class Job(ABC):
         )
         return job.get("status", {}).get("code")
 
-    def get_results(self) -> Tuple[np.ndarray, dict]:
+    @unbatched
+    def get_results(self) -> Tuple["np.ndarray", dict]:
         """
         Given the requesters project role and authorization level, returns the trained model's weights and metrics.
 
@@ -75,9 +79,14 @@ class Job(ABC):
         job_results = self._requester.get_job(
             project_id=self.project_id,
             job_id=self.id,
-            return_params="model_metrics { name value }\nmodel_location",
+            return_params=Requester.job_results_fragment,
         )
 
+        weights = self._load_weights(job_results.get("model_location", None))
+        return weights, self._parse_metrics(job_results)
+
+    @staticmethod
+    def _parse_metrics(job_results: dict) -> dict:
         # gql returns metrics in key/value pairs within an array
         # e.g. [{"name": "mse_result", "value": [1.0]}, {"name": "r_squared", "value": [1.0]]
         # here we map to a more pythonic key, value
@@ -86,14 +95,17 @@ class Job(ABC):
         #   "r_squared": [1.0],
         # }
 
-        gql_metrics = job_results.get("model_metrics", [])
+        gql_metrics = job_results.get("model_metrics", None) or []
         metrics = {}
         for m in gql_metrics:
             metrics[m["name"]] = m["value"]
 
-        location = job_results.get("model_location", None)
+        return metrics
+
+    @staticmethod
+    def _load_weights(location: Optional[str], client=None) -> Optional["np.ndarray"]:
         if location is None or location == "":
-            return None, metrics
+            return None
 
         # pull the bucket info if the regression weights were stored on s3
         # location will look like s3://my-bucket/<job_id>
@@ -101,16 +113,16 @@ class Job(ABC):
         if p.scheme != "s3":
             raise StorageSchemeException(scheme=p.scheme)
 
-        tf = tempfile.NamedTemporaryFile()
-        file_name = setup_boto_file(
+        weights = read_boto_object(
             uri=p,
-            temp_file_name=tf.name,
             download_path=p.path.lstrip("/") + "/regression_weights.csv",
+            client=client,
         )
 
-        # return the weights (decoded to np) & metrics
-        return np.loadtxt(file_name, delimiter=","), metrics
+        # return the weights decoded to np
+        return np.loadtxt(weights, delimiter=",")
 
+    @unbatched
     def approve(self, org_id: str) -> "Job":
         """
         Approve the Job on behalf of your organization. Once all organizations \
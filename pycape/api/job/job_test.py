@@ -9,6 +9,7 @@ import responses
 from conftest import BUCKET_NAME
 from tests.fake import FAKE_HOST
 
+from ...exceptions import GQLException
 from ...exceptions import StorageSchemeException
 from ...network.requester import Requester
 from ...vars import JOB_TYPE_LR
@@ -220,6 +221,25 @@ class TestJob:
             assert isinstance(get_status, str)
             assert get_status == "Initialized"
 
+    @responses.activate
+    def test_get_job_status_in_batch(self):
+        r = Requester(endpoint=FAKE_HOST)
+        job = Job(
+            id="abc_123",
+            status={"code": "Initialized"},
+            task={"type": JOB_TYPE_LR},
+            requester=r,
+            project_id="p_123",
+        )
+
+        with r.batch():
+            with pytest.raises(
+                GQLException, match="Job.get_status cannot be called inside"
+            ):
+                job.get_status()
+
+        assert len(responses.calls) == 0
+
     @responses.activate
     @pytest.mark.parametrize(
         "json,weights_result,exception",
@@ -1,21 +1,41 @@
 import io
 import sys
+import time
 from abc import ABC
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
-import pandas as pd
-from tabulate import tabulate
-
+from ...lazy import LazyModule
 from ...network.requester import Requester
+from ...network.requester import unbatched
+from ...render import Renderer
+from ...render import get_renderer
+from ...s3 import get_s3_client
 from ...utils import validate_s3_location
+from ...vars import JOB_TERMINAL_STATUSES
+from ...vars import SCHEMA_DATETIME_CONFIDENCE
 from ..dataview.dataview import DataView
+from ..dataview.inference import ColumnSchema
+from ..dataview.inference import DateFormatDetector
+from ..dataview.scaling import scale_dataset
 from ..job.job import Job
 from ..organization.organization import Organization
 from ..task.task import Task
 
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Outcome of creating one of the dataviews passed to `Project.create_dataviews`, exactly one
+# of `dataview` and `error` is set.
+DataViewResult = namedtuple("DataViewResult", ["name", "uri", "dataview", "error"])
+
 
 class Project(ABC):
     """
@@ -30,6 +50,8 @@ class Project(ABC):
         organizations (list): Returned list of fields related to the organizations associated with the `Project`.
         dataviews (list): Returned list of `DataViews` added to the `Project`.
         jobs (list) Returned list of `Jobs` submitted on the `Project`.
+        renderer (Renderer): How listed entities and messages are written to `out`, see \
+        `pycape.render`. Tables by default.
     """
 
     def __init__(
@@ -45,12 +67,14 @@ class Project(ABC):
         jobs: Optional[List[Dict]] = None,
         requester: Optional[Requester] = None,
         out: Optional[io.StringIO] = None,
+        renderer: Union[str, Renderer] = "table",
     ):
         self._requester: Requester = requester
         self._user_id: str = user_id
         self._out: io.StringIO = out
         if out is None:
             self._out = sys.stdout
+        self._renderer: Renderer = get_renderer(renderer)
 
         if id is None:
             raise Exception("Projects cannot be initialized without an id")
@@ -76,6 +100,7 @@ class Project(ABC):
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, name={self.name}, label={self.label})"
 
+    @unbatched
     def list_organizations(self) -> str:
         """
         Returns all list of organizations that requesting user is a contributor of.
@@ -83,17 +108,19 @@ class Project(ABC):
         Returns:
             A list of `Organization` instances.
         """
-        orgs = self._requester.get_project(id=self.id).get("organizations")
+        orgs = self._requester.get_project(id=self.id, include=("organizations",)).get(
+            "organizations"
+        )
         get_org_values = [Organization(**o) for o in orgs]
 
-        format_orgs = {
-            "ORGANIZATION ID": [x.id for x in get_org_values],
-            "NAME": [x.name for x in get_org_values],
-            "LABEL": [x.label for x in get_org_values],
-        }
-        self._out.write(tabulate(format_orgs, headers="keys") + "\n")
+        self._renderer.render(
+            self._out,
+            ("ORGANIZATION ID", "NAME", "LABEL"),
+            ((x.id, x.name, x.label) for x in get_org_values),
+        )
         return get_org_values
 
+    @unbatched
     def list_dataviews(self) -> List[DataView]:
         """
         Returns a list of dataviews for the scoped `Project`.
@@ -102,34 +129,59 @@ class Project(ABC):
             A list of `DataView` instances.
         """
 
-        data_views = self._requester.list_dataviews(project_id=self.id)
-        get_data_view_values = [
-            DataView(user_id=self._user_id, **d) for d in data_views
+        data_views = [
+            DataView(user_id=self._user_id, **d)
+            for d in self._requester.list_dataviews(project_id=self.id)
         ]
-        dv_ids = []
-        dv_names = []
-        dv_locations = []
-        dv_owners = []
-
-        for dv in get_data_view_values:
-            dv_ids.append(dv.id)
-            dv_names.append(dv.name)
-            dv_locations.append(dv.location)
-            dv_owner_label = dv._owner.get("label")
-            if self._user_id in [x.get("id") for x in dv._owner.get("members")]:
-                dv_owners.append(f"{dv_owner_label} (You)")
-            else:
-                dv_owners.append(dv_owner_label)
 
-        format_data_views = {
-            "DATAVIEW ID": dv_ids,
-            "NAME": dv_names,
-            "LOCATION": dv_locations,
-            "OWNER": dv_owners,
-        }
-        self._out.write(tabulate(format_data_views, headers="keys") + "\n")
-        return [DataView(user_id=self._user_id, **d) for d in data_views]
+        # dataviews are typically owned by a handful of organizations, so whether the user is
+        # a member is only looked up once per organization
+        owner_labels: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+
+        def owner(dv: DataView) -> str:
+            key = (dv._owner.get("id"), dv._owner.get("label"))
+            label = owner_labels.get(key)
+            if label is None:
+                member_ids = {x.get("id") for x in dv._owner.get("members") or ()}
+                label = dv._owner.get("label")
+                if self._user_id in member_ids:
+                    label = f"{label} (You)"
+                owner_labels[key] = label
+            return label
+
+        self._renderer.render(
+            self._out,
+            ("DATAVIEW ID", "NAME", "LOCATION", "OWNER"),
+            ((dv.id, dv.name, dv.location, owner(dv)) for dv in data_views),
+        )
+        return data_views
+
+    @unbatched
+    def iter_dataviews(
+        self, page_size: int = 100, prefetch: bool = False
+    ) -> Iterator[DataView]:
+        """
+        Lazily iterate over the dataviews of the scoped `Project`, fetching them a page at a time.
+
+        Arguments:
+            page_size: Number of `DataViews` fetched per request.
+            prefetch: Whether to fetch the next page in the background while the current \
+                one is being consumed.
+        Returns:
+            An iterator of `DataView` instances.
+        """
+        pages = self._requester.iter_pages(
+            lambda first, after: self._requester.list_dataviews_page(
+                project_id=self.id, first=first, after=after
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+        for page in pages:
+            for d in page:
+                yield DataView(user_id=self._user_id, **d)
 
+    @unbatched
     def get_dataview(
         self, id: Optional[str] = None, uri: Optional[str] = None
     ) -> DataView:
@@ -149,13 +201,14 @@ class Project(ABC):
 
         return DataView(user_id=self._user_id, **data_view[0]) if data_view else None
 
+    @unbatched
     def create_dataview(
         self,
         name: str,
         uri: str,
         owner_id: Optional[str] = None,
         owner_label: Optional[str] = None,
-        schema: Union[pd.Series, List, None] = None,
+        schema: Union["pd.Series", List, None] = None,
         development: bool = False,
     ) -> DataView:
         """
@@ -176,11 +229,7 @@ class Project(ABC):
         Returns:
             A `DataView` instance.
         """
-        parse_schema = DataView._validate_schema(schema)
-        if not parse_schema:
-            parse_schema = DataView._get_schema_from_uri(uri)
-
-        validate_s3_location(uri)
+        parse_schema, inferred_columns = self._prepare_dataview(uri, schema)
 
         data_view_dict = self._requester.create_dataview(
             project_id=self.id,
@@ -191,7 +240,7 @@ class Project(ABC):
             schema=parse_schema,
             development=development,
         )
-        data_view = DataView(user_id=self._user_id, **data_view_dict)
+        data_view = self._make_dataview(data_view_dict, inferred_columns)
 
         if hasattr(self, "dataviews"):
             self.dataviews.append(data_view)
@@ -199,6 +248,176 @@ class Project(ABC):
             self.dataviews = [data_view]
         return data_view
 
+    @unbatched
+    def create_dataviews(
+        self, dataviews: List[dict], max_workers: int = 8, batch_size: int = 50
+    ) -> List[DataViewResult]:
+        """
+        Creates many `DataViews` in Cape Cloud at once.
+
+        URIs are validated and schemas inferred concurrently, then the `DataViews` are created \
+        with batched requests of at most `batch_size` mutations. A failure to create one \
+        `DataView` does not prevent the others from being created. Date formats detected in a \
+        dataset are tried first on the columns of the same name of the others.
+
+        Arguments:
+            dataviews: the `create_dataview` arguments of each `DataView`, as a dict with a \
+                `name` and `uri` and optionally `owner_id`, `owner_label`, `schema` and \
+                `development`.
+            max_workers: Maximum number of schemas inferred at once.
+            batch_size: Maximum number of `DataViews` created per request.
+        Returns:
+            A `DataViewResult` for each item of `dataviews`, in order, holding either the \
+            created `DataView` or the exception raised while creating it.
+        """
+
+        detector = DateFormatDetector(confidence=SCHEMA_DATETIME_CONFIDENCE)
+
+        def prepare(spec: dict):
+            try:
+                missing = [k for k in ("name", "uri") if k not in spec]
+                if missing:
+                    raise Exception(f"DataView is missing: {', '.join(missing)}")
+                return self._prepare_dataview(
+                    spec["uri"], spec.get("schema"), detector=detector
+                )
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            prepared = list(pool.map(prepare, dataviews))
+
+        results: List[Optional[DataViewResult]] = [None] * len(dataviews)
+        futures = []
+        try:
+            with self._requester.batch(max_size=batch_size):
+                for i, (spec, p) in enumerate(zip(dataviews, prepared)):
+                    if isinstance(p, Exception):
+                        results[i] = DataViewResult(
+                            spec.get("name"), spec.get("uri"), None, p
+                        )
+                        continue
+
+                    try:
+                        future = self._requester.create_dataview(
+                            project_id=self.id,
+                            name=spec["name"],
+                            uri=spec["uri"],
+                            owner_id=spec.get("owner_id"),
+                            owner_label=spec.get("owner_label"),
+                            schema=p[0],
+                            development=spec.get("development", False),
+                        )
+                    except Exception as e:
+                        results[i] = DataViewResult(
+                            spec.get("name"), spec.get("uri"), None, e
+                        )
+                    else:
+                        futures.append((i, future, p[1]))
+        except Exception as e:
+            # the batch could not be sent, every pending item failed with it
+            for i, future, _ in futures:
+                if not future.done():
+                    future._set_error(e)
+
+        for i, future, inferred_columns in futures:
+            spec = dataviews[i]
+            try:
+                data_view = self._make_dataview(future.result(), inferred_columns)
+            except Exception as e:
+                results[i] = DataViewResult(spec.get("name"), spec.get("uri"), None, e)
+            else:
+                results[i] = DataViewResult(
+                    spec.get("name"), spec.get("uri"), data_view, None
+                )
+
+        created = [r.dataview for r in results if r.error is None]
+        if hasattr(self, "dataviews"):
+            self.dataviews.extend(created)
+        else:
+            self.dataviews = created
+        return results
+
+    @unbatched
+    def create_scaled_dataview(
+        self,
+        name: str,
+        uri: str,
+        output_uri: str,
+        columns: Optional[List[str]] = None,
+        log_columns: Iterable[str] = (),
+        owner_id: Optional[str] = None,
+        owner_label: Optional[str] = None,
+        schema: Union["pd.Series", List, None] = None,
+        development: bool = False,
+        **scale_kwargs,
+    ) -> DataView:
+        """
+        Scales the csv dataset at uri such that `1.0 <= max(c) < 10.0` for each of its \
+        numeric columns, as `VerticallyPartitionedLinearRegression` expects, writes it to \
+        output_uri and creates a `DataView` of it (see `create_dataview`).
+
+        The dataset is streamed in chunks and never loaded whole (see `scale_dataset`), so \
+        datasets larger than memory can be prepared. The scale factors are recorded next to \
+        the scaled dataset and set on the returned `DataView`.
+
+        Arguments:
+            name: a name for the `DataView`.
+            uri: URI location of the dataset to scale.
+            output_uri: URI location to write the scaled dataset to.
+            columns: Columns to scale, all the columns with numeric values by default.
+            log_columns: Columns to log-transform before scaling them.
+            owner_id: The ID of the organization that owns this dataset.
+            owner_label: The label of the organization that owns this dataset.
+            schema: The schema of the scaled dataset, inferred from it by default.
+            development: Whether the created dataview is in development mode or not.
+            scale_kwargs: Options passed on to `scale_dataset`, e.g. `chunk_bytes` and \
+                `processes`.
+        Returns:
+            A `DataView` instance.
+        """
+        validate_s3_location(output_uri)
+        scaled = scale_dataset(
+            uri, output_uri, columns=columns, log_columns=log_columns, **scale_kwargs
+        )
+
+        data_view = self.create_dataview(
+            name=name,
+            uri=scaled.uri,
+            owner_id=owner_id,
+            owner_label=owner_label,
+            schema=schema,
+            development=development,
+        )
+        data_view.scale_factors = scaled.factors
+        return data_view
+
+    @staticmethod
+    def _prepare_dataview(
+        uri: str,
+        schema: Union["pd.Series", List, None],
+        detector: Optional[DateFormatDetector] = None,
+    ) -> Tuple[List[dict], List[ColumnSchema]]:
+        inferred_columns = []
+        parse_schema = DataView._validate_schema(schema)
+        if not parse_schema:
+            inferred_columns = DataView._infer_columns_from_uri(uri, detector=detector)
+            parse_schema = [
+                {"name": c.name, "schema_type": c.schema_type} for c in inferred_columns
+            ]
+
+        validate_s3_location(uri)
+        return parse_schema, inferred_columns
+
+    def _make_dataview(
+        self, data_view_dict: dict, inferred_columns: List[ColumnSchema]
+    ) -> DataView:
+        data_view = DataView(user_id=self._user_id, **data_view_dict)
+        data_view.date_formats = {
+            c.name: c.date_format for c in inferred_columns if c.date_format
+        }
+        return data_view
+
     def _create_task(self, task: Task, timeout: float = 600) -> Job:
         """
         Calls GQL `mutation createTask`
@@ -211,7 +430,10 @@ class Project(ABC):
         """
 
         def get_props(cls):
-            return [i for i in cls.__dict__.keys() if i[:1] != "_"]
+            # public attributes and properties, but not methods
+            return [
+                i for i, v in cls.__dict__.items() if i[:1] != "_" and not callable(v)
+            ]
 
         task_config = {}
         task_config.update(
@@ -224,7 +446,14 @@ class Project(ABC):
 
         return task.__class__(**created_task, **task_config)
 
-    def submit_job(self, task: Task, timeout: float = 600) -> Job:
+    @unbatched
+    def submit_job(
+        self,
+        task: Task,
+        timeout: float = 600,
+        validate: bool = False,
+        **validate_kwargs,
+    ) -> Job:
         """
         Submits a `Job` to be run by your Cape worker in \
         collaboration with other organizations in your `Project`.
@@ -232,15 +461,24 @@ class Project(ABC):
         Arguments:
             task: Instance of class that inherits from `Task`.
             timeout: How long (in ms) a Cape Worker should run before canceling the `Job`.
+            validate: Whether to check the task's inputs (see `Task.validate`) before \
+                creating the `Job`, e.g. that the datasets of a \
+                `VerticallyPartitionedLinearRegression` are scaled as expected. This reads \
+                the datasets, which must be accessible to you.
+            validate_kwargs: Options passed on to `Task.validate`.
         Returns:
             A `Job` instance.
         """
+        if validate:
+            task.validate(**validate_kwargs)
+
         created_job = self._create_task(task=task, timeout=timeout)
 
         submitted_job = created_job._submit_job(requester=self._requester)
 
         return Job(project_id=self.id, **submitted_job, requester=self._requester)
 
+    @unbatched
     def get_job(self, id: str) -> List[Job]:
         """
         Returns a `Job` given an ID.
@@ -254,6 +492,7 @@ class Project(ABC):
 
         return Job(**job, project_id=self.id, requester=self._requester)
 
+    @unbatched
     def list_jobs(self) -> Job:
         """
         Returns a list of `Jobs` for the scoped `Project`.
@@ -265,23 +504,168 @@ class Project(ABC):
         get_job_values = [
             Job(project_id=self.id, requester=self._requester, **j) for j in jobs
         ]
-        j_ids = []
-        j_type = []
-        j_status = []
-
-        for j in get_job_values:
-            j_ids.append(j.id)
-            j_type.append(j.job_type)
-            j_status.append(j.status)
-
-        format_jobs = {
-            "JOB ID": j_ids,
-            "TYPE": j_type,
-            "STATUS": j_status,
-        }
-        self._out.write(tabulate(format_jobs, headers="keys") + "\n")
+
+        self._renderer.render(
+            self._out,
+            ("JOB ID", "TYPE", "STATUS"),
+            ((j.id, j.job_type, j.status) for j in get_job_values),
+        )
         return get_job_values
 
+    @unbatched
+    def iter_jobs(self, page_size: int = 100, prefetch: bool = False) -> Iterator[Job]:
+        """
+        Lazily iterate over the `Jobs` of the scoped `Project`, fetching them a page at a time.
+
+        Arguments:
+            page_size: Number of `Jobs` fetched per request.
+            prefetch: Whether to fetch the next page in the background while the current \
+                one is being consumed.
+        Returns:
+            An iterator of `Job` instances.
+        """
+        pages = self._requester.iter_pages(
+            lambda first, after: self._requester.list_jobs_page(
+                project_id=self.id, first=first, after=after
+            ),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+        for page in pages:
+            for j in page:
+                yield Job(project_id=self.id, requester=self._requester, **j)
+
+    @unbatched
+    def wait_for_jobs(
+        self,
+        jobs: Iterable[Union[Job, str]],
+        terminal: Iterable[str] = JOB_TERMINAL_STATUSES,
+        timeout: Optional[float] = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+    ) -> Iterator[Job]:
+        """
+        Wait for `Jobs` of the scoped `Project` to finish, yielding each one as soon as it \
+        reaches a terminal status.
+
+        The status of every outstanding `Job` is fetched with a single query per tick. The \
+        polling interval grows by `backoff` (up to `max_interval`) while no status changes, and \
+        resets to `interval` whenever one does.
+
+        An exception is raised if any of the `Jobs` is not a `Job` of the scoped `Project`.
+
+        Arguments:
+            jobs: `Job` instances or IDs to wait for.
+            terminal: Status codes after which a `Job` is considered finished.
+            timeout: How long (in seconds) to wait before raising `TimeoutError`. Waits \
+                indefinitely by default.
+            interval: Initial delay (in seconds) between polls.
+            max_interval: Upper bound (in seconds) for the delay between polls.
+            backoff: Factor the delay is multiplied by after a poll with no status change.
+        Returns:
+            An iterator of `Job` instances, in the order they finished.
+        """
+        terminal = set(terminal)
+        pending = {j.id if isinstance(j, Job) else j: None for j in jobs}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = interval
+
+        first = True
+        while pending:
+            changed = False
+            listed = [
+                j
+                for j in self._requester.list_jobs(project_id=self.id) or []
+                if j.get("id") in pending
+            ]
+
+            if first:
+                # jobs missing from the project would otherwise be polled forever
+                found = {j["id"] for j in listed}
+                missing = [i for i in pending if i not in found]
+                if missing:
+                    raise Exception(
+                        f"Jobs not found in project {self.id}: {', '.join(missing)}"
+                    )
+                first = False
+
+            for j in listed:
+                job = Job(project_id=self.id, requester=self._requester, **j)
+                if job.status != pending[job.id]:
+                    changed = True
+                    pending[job.id] = job.status
+
+                if job.status in terminal:
+                    del pending[job.id]
+                    yield job
+
+            if not pending:
+                return
+
+            delay = interval if changed else min(delay * backoff, max_interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out waiting for jobs: {', '.join(pending)}"
+                    )
+                delay = min(delay, remaining)
+
+            time.sleep(delay)
+
+    @unbatched
+    def get_results(
+        self,
+        jobs: Iterable[Union[Job, str]],
+        max_workers: int = 8,
+        batch_size: int = 50,
+    ) -> Dict[str, Tuple[Optional["np.ndarray"], dict]]:
+        """
+        Returns the trained model's weights and metrics for several `Jobs` of the scoped `Project`.
+
+        The metrics of each `Job` are fetched with batched requests of at most `batch_size` \
+        queries and the weights are downloaded concurrently.
+
+        Arguments:
+            jobs: `Job` instances or IDs to fetch the results of.
+            max_workers: Maximum number of concurrent weight downloads.
+            batch_size: Maximum number of `Jobs` fetched per request.
+        Returns:
+            A dictionary mapping each `Job` ID to its `(weights, metrics)` tuple, as returned \
+            by `Job.get_results`.
+        """
+        # an insertion-ordered set, each job is only fetched once
+        ids = list(dict.fromkeys(j.id if isinstance(j, Job) else j for j in jobs))
+
+        with self._requester.batch(max_size=batch_size):
+            futures = {
+                i: self._requester.get_job(
+                    project_id=self.id,
+                    job_id=i,
+                    return_params=Requester.job_results_fragment,
+                )
+                for i in ids
+            }
+        job_results = {i: f.result() for i, f in futures.items()}
+
+        missing = [i for i in ids if not job_results[i]]
+        if missing:
+            raise Exception(
+                f"Jobs not found in project {self.id}: {', '.join(missing)}"
+            )
+
+        locations = [job_results[i].get("model_location") for i in ids]
+        client = get_s3_client() if any(locations) else None
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            weights = list(
+                pool.map(lambda loc: Job._load_weights(loc, client=client), locations)
+            )
+
+        return {
+            i: (w, Job._parse_metrics(job_results[i])) for i, w in zip(ids, weights)
+        }
+
     def delete_dataview(self, id: str) -> None:
         """
         Remove a `DataView` by ID.
@@ -294,5 +678,5 @@ class Project(ABC):
         if hasattr(self, "dataviews"):
             self.dataviews = [x for x in self.dataviews if id != x.id]
 
-        self._out.write(f"DataView ({id}) deleted" + "\n")
+        self._renderer.message(self._out, f"DataView ({id}) deleted")
         return
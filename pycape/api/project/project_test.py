@@ -1,23 +1,30 @@
 import contextlib
+import json
 import tempfile
+import time
 from io import StringIO
 
 import boto3
+import numpy as np
 import pytest
 import responses
 
 from conftest import BUCKET_NAME
 from tests.fake import FAKE_HOST
 from tests.fake import fake_dataframe
+from tests.fake import put_s3_object
 
 from ...exceptions import StorageSchemeException
 from ...exceptions import GQLException
+from ...exceptions import ScalingException
 from ...network.requester import Requester
 from ...vars import JOB_TYPE_LR
+from ..dataview import inference
 from ..dataview.dataview import DataView
 from ..job.job import Job
 from ..organization.organization import Organization
 from ..project.project import Project
+from ..task.vertical_linear_regression_task import VerticallyPartitionedLinearRegression
 
 
 @contextlib.contextmanager
@@ -620,3 +627,454 @@ class TestProject:
             assert output == out_expect
             assert isinstance(jobs, list)
             assert jobs[0].id == "def123"
+
+    @responses.activate
+    def test_list_jobs_in_batch(self):
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, out=StringIO(), id="123", user_id="user_123")
+
+        with r.batch():
+            with pytest.raises(
+                GQLException, match="Project.list_jobs cannot be called inside"
+            ):
+                my_project.list_jobs()
+
+        assert len(responses.calls) == 0
+
+    @responses.activate
+    def test_wait_for_jobs(self, mocker):
+        sleep = mocker.patch("pycape.api.project.project.time.sleep")
+
+        def jobs_json(*statuses):
+            return {
+                "data": {
+                    "project": {
+                        "jobs": [
+                            {
+                                "id": f"job_{i}",
+                                "status": {"code": s},
+                                "task": {"type": JOB_TYPE_LR},
+                            }
+                            for i, s in enumerate(statuses)
+                        ]
+                    }
+                }
+            }
+
+        for statuses in [
+            ("Started", "Completed", "Started"),
+            ("Started", "Completed", "Started"),
+            ("Completed", "Completed", "Started"),
+        ]:
+            responses.add(
+                responses.POST, f"{FAKE_HOST}/v1/query", json=jobs_json(*statuses),
+            )
+
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        jobs = [
+            Job(id="job_0", status=None, task=None, project_id="123", requester=r),
+            "job_1",
+        ]
+        finished = list(my_project.wait_for_jobs(jobs, interval=1, backoff=2))
+
+        assert [j.id for j in finished] == ["job_1", "job_0"]
+        assert all(j.status == "Completed" for j in finished)
+        assert len(responses.calls) == 3
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 2]
+
+    @responses.activate
+    def test_wait_for_jobs_timeout(self, mocker):
+        mocker.patch("pycape.api.project.project.time.sleep")
+        mocker.patch(
+            "pycape.api.project.project.time.monotonic", side_effect=[0, 5, 11],
+        )
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={
+                "data": {
+                    "project": {
+                        "jobs": [
+                            {
+                                "id": "job_0",
+                                "status": {"code": "Started"},
+                                "task": {"type": JOB_TYPE_LR},
+                            }
+                        ]
+                    }
+                }
+            },
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        with pytest.raises(TimeoutError, match="job_0"):
+            list(my_project.wait_for_jobs(["job_0"], timeout=10))
+
+    @responses.activate
+    def test_wait_for_jobs_not_found(self, mocker):
+        sleep = mocker.patch("pycape.api.project.project.time.sleep")
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={
+                "data": {
+                    "project": {
+                        "jobs": [
+                            {
+                                "id": "job_0",
+                                "status": {"code": "Started"},
+                                "task": {"type": JOB_TYPE_LR},
+                            }
+                        ]
+                    }
+                }
+            },
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        with pytest.raises(Exception, match="Jobs not found in project 123: typo"):
+            list(my_project.wait_for_jobs(["job_0", "typo"]))
+
+        assert len(responses.calls) == 1
+        sleep.assert_not_called()
+
+    @responses.activate
+    def test_iter_jobs(self):
+        for ids in [["job_1", "job_2"], ["job_3"]]:
+            responses.add(
+                responses.POST,
+                f"{FAKE_HOST}/v1/query",
+                json={
+                    "data": {
+                        "project": {
+                            "jobs": [
+                                {
+                                    "id": i,
+                                    "status": {"code": "Completed"},
+                                    "task": {"type": JOB_TYPE_LR},
+                                }
+                                for i in ids
+                            ]
+                        }
+                    }
+                },
+            )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        jobs = list(my_project.iter_jobs(page_size=2))
+
+        assert [j.id for j in jobs] == ["job_1", "job_2", "job_3"]
+        assert all(isinstance(j, Job) for j in jobs)
+        assert json.loads(responses.calls[1].request.body)["variables"] == {
+            "project_id": "123",
+            "first": 2,
+            "after": "job_2",
+        }
+
+    @responses.activate
+    def test_get_results(self):
+        b = boto3.resource("s3").Bucket(BUCKET_NAME)
+        expected = {
+            "job_1": np.array([[1.0, 2.0], [3.0, 4.0]]),
+            "job_2": np.array([[5.0, 6.0], [7.0, 8.0]]),
+        }
+        for job_id, weights in expected.items():
+            tf = tempfile.NamedTemporaryFile(suffix=".csv")
+            np.savetxt(tf.name, weights, delimiter=",")
+            b.upload_file(tf.name, f"{job_id}/regression_weights.csv")
+
+        def job(n, i):
+            return {
+                "id": i,
+                "status": {"code": "Completed"},
+                "task": {"type": JOB_TYPE_LR},
+                "model_metrics": [{"name": "r_squared", "value": [n]}],
+                "model_location": f"s3://{BUCKET_NAME}/{i}" if i in expected else None,
+            }
+
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json=[
+                {"data": {"project": {"job": job(n, i)}}}
+                for n, i in enumerate(["job_1", "job_2", "job_3"])
+            ],
+        )
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json=[{"data": {"project": {"job": None}}}],
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        results = my_project.get_results(
+            ["job_1", "job_2", "job_3", "job_1"], max_workers=2
+        )
+
+        # one GetJob query per distinct job, sent in a single request
+        assert len(responses.calls) == 1
+        sent = json.loads(responses.calls[0].request.body)
+        assert [q["variables"]["job_id"] for q in sent] == ["job_1", "job_2", "job_3"]
+        assert all(q["query"].strip().startswith("query GetJob") for q in sent)
+        for job_id, weights in expected.items():
+            np.testing.assert_array_equal(results[job_id][0], weights)
+        assert results["job_2"][1] == {"r_squared": [1]}
+        assert results["job_3"] == (None, {"r_squared": [2]})
+
+        with pytest.raises(Exception, match="Jobs not found in project 123: job_4"):
+            my_project.get_results(["job_4"])
+
+    @responses.activate
+    def test_create_dataviews(self):
+        for i in range(3):
+            put_s3_object(f"bulk/part-{i}.csv", b"id,dob\n%d,2006-01-13\n" % i)
+
+        def dataview(i):
+            return {
+                "data": {
+                    "addDataView": {
+                        "id": f"dv_{i}",
+                        "name": f"part-{i}",
+                        "location": f"s3://{BUCKET_NAME}/bulk/part-{i}.csv",
+                    }
+                }
+            }
+
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json=[
+                dataview(0),
+                {"errors": [{"message": "name already taken"}]},
+                dataview(2),
+            ],
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123", data_views=[])
+
+        specs = [
+            {"name": f"part-{i}", "uri": f"s3://{BUCKET_NAME}/bulk/part-{i}.csv"}
+            for i in range(3)
+        ]
+        specs.append(
+            {
+                "name": "local",
+                "uri": "gs://my-data/data.csv",
+                "schema": fake_dataframe().dtypes,
+            }
+        )
+        results = my_project.create_dataviews(specs, max_workers=2)
+
+        # every dataview is created with a single request
+        assert len(responses.calls) == 1
+        payload = json.loads(responses.calls[0].request.body)
+        assert len(payload) == 3
+        assert payload[0]["variables"]["data_view_input"]["schema"] == [
+            {"name": "id", "schema_type": "integer"},
+            {"name": "dob", "schema_type": "datetime"},
+        ]
+
+        assert [r.name for r in results] == ["part-0", "part-1", "part-2", "local"]
+        assert [r.dataview.id for r in results if r.error is None] == ["dv_0", "dv_2"]
+        assert results[0].dataview.date_formats == {"dob": "%Y-%m-%d"}
+        assert isinstance(results[1].error, GQLException)
+        assert isinstance(results[3].error, StorageSchemeException)
+        assert [d.id for d in my_project.dataviews] == ["dv_0", "dv_2"]
+
+    @responses.activate
+    def test_create_dataviews_date_formats(self, mocker):
+        for i in range(3):
+            put_s3_object(f"bulk-dates/part-{i}.csv", b"id,dob\n%d,01/13/2006\n" % i)
+
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json=[
+                {"data": {"addDataView": {"id": f"dv_{i}", "name": f"part-{i}"}}}
+                for i in range(3)
+            ],
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+        spy = mocker.spy(inference, "infer_date_format")
+
+        results = my_project.create_dataviews(
+            [
+                {
+                    "name": f"part-{i}",
+                    "uri": f"s3://{BUCKET_NAME}/bulk-dates/part-{i}.csv",
+                }
+                for i in range(3)
+            ],
+            max_workers=1,
+        )
+
+        # the format detected in the first part is checked first on the others
+        assert spy.call_count == 1
+        assert [r.dataview.date_formats for r in results] == [{"dob": "%m/%d/%Y"}] * 3
+
+    @responses.activate
+    def test_create_dataviews_invalid_spec(self, mocker):
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json=[{"data": {"addDataView": {"id": "dv_1", "name": "my-data"}}}],
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        create_dataview = r.create_dataview
+
+        def queue(**kwargs):
+            if kwargs["name"] == "bad":
+                raise TypeError("bad dataview")
+            return create_dataview(**kwargs)
+
+        mocker.patch.object(r, "create_dataview", side_effect=queue)
+        my_project = Project(requester=r, user_id=None, id="123")
+        uri = f"s3://{BUCKET_NAME}/data.csv"
+        schema = fake_dataframe().dtypes
+
+        results = my_project.create_dataviews(
+            [
+                {"uri": uri, "schema": schema},
+                {"name": "bad", "uri": uri, "schema": schema},
+                {"name": "my-data", "uri": uri, "schema": schema},
+            ]
+        )
+
+        # every item gets a result, even when it could not be queued
+        assert None not in results
+        assert str(results[0].error) == "DataView is missing: name"
+        assert isinstance(results[1].error, TypeError)
+        assert results[2].dataview.id == "dv_1"
+        assert [d.id for d in my_project.dataviews] == ["dv_1"]
+
+    @responses.activate
+    def test_create_dataviews_request_failure(self):
+        responses.add(responses.POST, f"{FAKE_HOST}/v1/query", status=400)
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        results = my_project.create_dataviews(
+            [
+                {
+                    "name": "my-data",
+                    "uri": f"s3://{BUCKET_NAME}/data.csv",
+                    "schema": fake_dataframe().dtypes,
+                }
+            ]
+        )
+
+        assert None not in results
+        assert results[0].dataview is None
+        assert results[0].error is not None
+        assert my_project.dataviews == []
+
+    @responses.activate
+    def test_create_scaled_dataview(self, s3_client, mocker):
+        mocker.patch("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 256)
+        put_s3_object("raw.csv", b"id,a,b\nx,150,0.5\ny,300,0.02\n")
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={
+                "data": {
+                    "addDataView": {
+                        "id": "dv_scaled",
+                        "name": "scaled",
+                        "location": f"s3://{BUCKET_NAME}/scaled.csv",
+                    }
+                }
+            },
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123", data_views=[])
+
+        dv = my_project.create_scaled_dataview(
+            name="scaled",
+            uri=f"s3://{BUCKET_NAME}/raw.csv",
+            output_uri=f"s3://{BUCKET_NAME}/scaled.csv",
+            processes=1,
+        )
+
+        body = boto3.resource("s3").Object(BUCKET_NAME, "scaled.csv").get()["Body"]
+        assert body.read() == b"id,a,b\nx,1.5,5.0\ny,3.0,0.2\n"
+        assert {c: f.exponent for c, f in dv.scale_factors.items()} == {
+            "a": 2,
+            "b": -1,
+        }
+        payload = json.loads(responses.calls[0].request.body)
+        assert payload["variables"]["data_view_input"]["schema"] == [
+            {"name": "id", "schema_type": "string"},
+            {"name": "a", "schema_type": "number"},
+            {"name": "b", "schema_type": "number"},
+        ]
+        assert my_project.dataviews == [dv]
+
+    @responses.activate
+    def test_submit_job_validate(self, s3_client):
+        put_s3_object("unscaled.csv", b"a,b\n1.5,20.0\n2.5,30.0\n")
+        uri = f"s3://{BUCKET_NAME}/unscaled.csv"
+        schema = [
+            {"name": "a", "schema_type": "number"},
+            {"name": "b", "schema_type": "number"},
+        ]
+        task = VerticallyPartitionedLinearRegression(
+            x_train_dataview=DataView(id="x", name="x", location=uri, schema=schema)[
+                "a"
+            ],
+            y_train_dataview=DataView(id="y", name="y", location=uri, schema=schema)[
+                "b"
+            ],
+            model_location="s3://my-location",
+            model_owner="org123",
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        my_project = Project(requester=r, user_id=None, id="123")
+
+        with pytest.raises(ScalingException, match=r"y\[b\]: max is 30.0"):
+            my_project.submit_job(task, validate=True, processes=1)
+
+        assert len(responses.calls) == 0
+
+    @pytest.mark.parametrize("render", ["table", "ndjson"])
+    def test_list_dataviews_10k(self, render, mocker):
+        n = 10000
+        members = [{"id": f"user_{i}"} for i in range(500)]
+        orgs = [
+            {"id": f"org_{i}", "label": f"org-{i}", "members": members}
+            for i in range(5)
+        ]
+        r = Requester(endpoint=FAKE_HOST)
+        mocker.patch.object(
+            r,
+            "list_dataviews",
+            return_value=[
+                {
+                    "id": f"dv_{i}",
+                    "name": f"data-{i}",
+                    "location": f"s3://my-data/{i}.csv",
+                    "owner": orgs[i % len(orgs)],
+                }
+                for i in range(n)
+            ],
+        )
+        init = mocker.spy(DataView, "__init__")
+        out = StringIO()
+        my_project = Project(
+            requester=r, user_id="user_499", id="123", out=out, renderer=render
+        )
+
+        start = time.perf_counter()
+        data_views = my_project.list_dataviews()
+        elapsed = time.perf_counter() - start
+
+        assert len(data_views) == n
+        assert init.call_count == n
+        assert out.getvalue().count("org-0 (You)") == n // len(orgs)
+        assert elapsed < 5
@@ -0,0 +1,119 @@
+from collections import namedtuple
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from ...lazy import LazyModule
+from ...vars import FIXEDPOINT_FRACTIONAL_PRECISION
+from ...vars import FIXEDPOINT_INTEGRAL_PRECISION
+from ...vars import FIXEDPOINT_RING_BITS
+from .normal_equations import NormalEquations
+
+np = LazyModule("numpy")
+
+# Value of the linear regression computation that is likely to overflow or lose precision
+# once encoded as a fixed-point number. `column` is an input column (as `(dataview, name)`,
+# `dataview` is "x", "y", or `None` for the intercept), `stage` is one of "input",
+# "product", "gram", "moment", "inverse" and "weights", `kind` is either "overflow" or
+# "precision". `magnitude` is the largest (for an overflow) or smallest (for a precision
+# loss) magnitude seen, compared against `limit`.
+FixedPointIssue = namedtuple(
+    "FixedPointIssue", ["column", "stage", "kind", "magnitude", "limit"]
+)
+
+# Result of `simulate_fixed_point`: the number of rows accumulated, the largest magnitude
+# reached at each stage, and the `FixedPointIssue` found.
+FixedPointReport = namedtuple("FixedPointReport", ["rows", "magnitudes", "issues"])
+
+INTERCEPT = (None, "intercept")
+
+
+def simulate_fixed_point(
+    eq: NormalEquations,
+    columns: Sequence[Tuple[Optional[str], str]],
+    integral_precision: int = FIXEDPOINT_INTEGRAL_PRECISION,
+    fractional_precision: int = FIXEDPOINT_FRACTIONAL_PRECISION,
+    ring_bits: int = FIXEDPOINT_RING_BITS,
+    min_significant_bits: int = 8,
+) -> FixedPointReport:
+    """
+    Estimate the magnitudes of the values computed while solving accumulated normal equations \
+    with fixed-point numbers of `integral_precision` integral and `fractional_precision` \
+    fractional bits, encoded on a ring of `ring_bits` bits, and flag the columns they come from.
+
+    A value overflows once its magnitude reaches `2 ** integral_precision`, and products \
+    (computed with `2 * fractional_precision` fractional bits before they are truncated) once \
+    they reach `2 ** (ring_bits - 1 - 2 * fractional_precision)`. A non-zero value loses \
+    precision when it has less than `min_significant_bits` significant bits, i.e. when its \
+    magnitude is below `2 ** (min_significant_bits - fractional_precision)`; `eq` should be \
+    accumulated with that `small_threshold` to count such inputs.
+
+    Arguments:
+        eq: Accumulated `NormalEquations`.
+        columns: The input columns followed by the target columns, as `(dataview, name)`.
+        integral_precision: Number of bits of the integral part of fixed-point numbers.
+        fractional_precision: Number of bits of the fractional part of fixed-point numbers.
+        ring_bits: Number of bits of the ring fixed-point numbers are encoded on.
+        min_significant_bits: Minimal number of significant bits of a non-zero value.
+    Returns:
+        A `FixedPointReport`.
+    """
+    d = eq.n_features + 1
+    columns = [INTERCEPT] + list(columns)
+    if len(columns) != len(eq.abs_max):
+        raise ValueError(
+            f"Expected {len(eq.abs_max) - 1} columns, got {len(columns) - 1}"
+        )
+
+    overflow = 2.0 ** integral_precision
+    product_overflow = min(overflow, 2.0 ** (ring_bits - 1 - 2 * fractional_precision))
+    small = 2.0 ** (min_significant_bits - fractional_precision)
+
+    issues: List[FixedPointIssue] = []
+    magnitudes = {}
+
+    def check(stage: str, per_column: "np.ndarray", limit: float, kind: str, cols):
+        flagged = per_column >= limit if kind == "overflow" else per_column < limit
+        for i in np.flatnonzero(flagged):
+            issues.append(
+                FixedPointIssue(cols[i], stage, kind, float(per_column[i]), limit)
+            )
+
+    # inputs as encoded
+    magnitudes["input"] = float(eq.abs_max.max())
+    check("input", eq.abs_max, overflow, "overflow", columns)
+    for i in np.flatnonzero(eq.small_counts):
+        issues.append(
+            FixedPointIssue(
+                columns[i], "input", "precision", float(eq.abs_min[i]), small
+            )
+        )
+
+    # elementwise products of A^T A and A^T y, before they are summed
+    products = np.outer(eq.abs_max[:d], eq.abs_max).max(axis=1)
+    magnitudes["product"] = float(products.max())
+    check("product", products, product_overflow, "overflow", columns)
+
+    # the sums themselves
+    gram = np.abs(eq.ata).max(axis=1)
+    magnitudes["gram"] = float(gram.max())
+    check("gram", gram, overflow, "overflow", columns)
+
+    moment = np.abs(eq.aty).max(axis=1)
+    magnitudes["moment"] = float(moment.max())
+    check("moment", moment, overflow, "overflow", columns)
+
+    if eq.n:
+        # inverting A^T A: large entries overflow, and when it is large (i.e. with many rows)
+        # its inverse gets small enough to lose precision
+        inverse = np.abs(np.linalg.pinv(eq.ata)).max(axis=1)
+        magnitudes["inverse"] = float(inverse.max())
+        check("inverse", inverse, overflow, "overflow", columns)
+        check("inverse", inverse, small, "precision", columns)
+
+        weights = np.abs(eq.solve().reshape(d, -1)).max(axis=1)
+        magnitudes["weights"] = float(weights.max())
+        check("weights", weights, overflow, "overflow", columns)
+
+    return FixedPointReport(rows=eq.n, magnitudes=magnitudes, issues=issues)
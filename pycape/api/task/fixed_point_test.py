@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from .fixed_point import INTERCEPT
+from .fixed_point import simulate_fixed_point
+from .normal_equations import NormalEquations
+
+COLUMNS = [("x", "a"), ("x", "b"), ("y", "y")]
+
+
+def _equations(x, y, fractional_precision=40, min_significant_bits=8):
+    eq = NormalEquations(
+        x.shape[1], small_threshold=2.0 ** (min_significant_bits - fractional_precision)
+    )
+    eq.update(x, y)
+    return eq
+
+
+def test_simulate_fixed_point_scaled():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1, 9.9, size=(10000, 2))
+    y = x @ [0.3, 0.5]
+
+    report = simulate_fixed_point(_equations(x, y), COLUMNS)
+
+    assert report.rows == 10000
+    assert report.issues == []
+    assert report.magnitudes["input"] < 10
+    assert report.magnitudes["gram"] < 2 ** 24
+    assert set(report.magnitudes) == {
+        "input",
+        "product",
+        "gram",
+        "moment",
+        "inverse",
+        "weights",
+    }
+
+
+@pytest.mark.parametrize(
+    "scale,expected",
+    [
+        # inputs themselves overflow
+        (1e8, {(("x", "b"), "input", "overflow")}),
+        # inputs fit, but their squares do not
+        (5e3, {(("x", "b"), "product", "overflow")}),
+    ],
+)
+def test_simulate_fixed_point_overflow(scale, expected):
+    rng = np.random.default_rng(1)
+    x = np.column_stack([rng.uniform(1, 9, 100), rng.uniform(1, 9, 100) * scale])
+    y = x[:, 0]
+
+    report = simulate_fixed_point(_equations(x, y), COLUMNS)
+
+    flagged = {(i.column, i.stage, i.kind) for i in report.issues}
+    assert expected <= flagged
+    assert all(i.column != ("x", "a") for i in report.issues if i.stage == "input")
+
+
+def test_simulate_fixed_point_gram_overflow():
+    # many rows make sums of squares overflow even for scaled inputs
+    x = np.full((300000, 2), 9.0) + np.arange(300000)[:, None] % 2 * [0.0, 0.5]
+    y = x[:, 0]
+
+    report = simulate_fixed_point(_equations(x, y), COLUMNS, integral_precision=24)
+
+    flagged = {(i.column, i.stage) for i in report.issues if i.kind == "overflow"}
+    assert (("x", "a"), "gram") in flagged
+    # its row of the gram matrix only sums the inputs, not their squares
+    assert (INTERCEPT, "gram") not in flagged
+
+
+def test_simulate_fixed_point_precision():
+    x = np.column_stack([np.linspace(1, 9, 100), np.linspace(1e-12, 9, 100)])
+    y = x[:, 0]
+
+    report = simulate_fixed_point(_equations(x, y), COLUMNS)
+
+    precision = [i for i in report.issues if i.kind == "precision"]
+    assert [(i.column, i.stage) for i in precision] == [(("x", "b"), "input")]
+    assert precision[0].magnitude == pytest.approx(1e-12)
+
+
+def test_simulate_fixed_point_columns():
+    with pytest.raises(ValueError, match="Expected 3 columns, got 2"):
+        simulate_fixed_point(_equations(np.ones((2, 2)), np.ones(2)), COLUMNS[:2])
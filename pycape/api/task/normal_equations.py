@@ -0,0 +1,148 @@
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from ...lazy import LazyModule
+from ...vars import STREAM_CHUNK_BYTES
+from ...vars import STREAM_MAX_WORKERS
+from ..dataview.stream import iter_aligned_arrays
+from ..dataview.stream import iter_numeric_arrays
+from ..dataview.stream import process_pool
+
+np = LazyModule("numpy")
+
+
+class NormalEquations:
+    """
+    Out-of-core accumulator of the normal equations `(A^T A) w = A^T y` of a linear regression, \
+    where the design matrix `A` is the input matrix `X` with a leading column of ones for the \
+    intercept. Rows are added chunk by chunk, only `d x d` sums are kept in memory.
+
+    Rows with a missing value are not accumulated, they are counted in `dropped`.
+
+    Arguments:
+        n_features (int): Number of columns of `X`.
+        n_targets (int): Number of columns of `y`.
+        small_threshold (float): Non-zero values with a magnitude below this threshold are \
+        counted, per column, in `small_counts`.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        n_targets: int = 1,
+        small_threshold: Optional[float] = None,
+    ):
+        d = n_features + 1
+        self.small_threshold = small_threshold
+        self.n = 0
+        self.dropped = 0
+        self.ata = np.zeros((d, d))
+        self.aty = np.zeros((d, n_targets))
+        self.yty = np.zeros((n_targets, n_targets))
+        self.y_sum = np.zeros(n_targets)
+        # per column of `A` followed by the columns of `y`
+        self.abs_max = np.zeros(d + n_targets)
+        self.abs_min = np.full(d + n_targets, np.inf)
+        self.small_counts = np.zeros(d + n_targets, dtype=int)
+
+    @property
+    def n_features(self) -> int:
+        return self.ata.shape[0] - 1
+
+    def update(self, x: "np.ndarray", y: "np.ndarray") -> None:
+        """
+        Accumulate aligned rows of `X` and `y`.
+        """
+        y = y.reshape(len(y), -1)
+        keep = ~(np.isnan(x).any(axis=1) | np.isnan(y).any(axis=1))
+        self.dropped += int(len(keep) - keep.sum())
+        x, y = x[keep], y[keep]
+        if not len(x):
+            return
+
+        a = np.hstack([np.ones((len(x), 1)), x])
+        self.n += len(a)
+        self.ata += a.T @ a
+        self.aty += a.T @ y
+        self.yty += y.T @ y
+        self.y_sum += y.sum(axis=0)
+
+        values = np.abs(np.hstack([a, y]))
+        self.abs_max = np.maximum(self.abs_max, values.max(axis=0))
+        self.abs_min = np.minimum(
+            self.abs_min, np.where(values > 0, values, np.inf).min(axis=0)
+        )
+        if self.small_threshold is not None:
+            self.small_counts += ((values > 0) & (values < self.small_threshold)).sum(
+                axis=0
+            )
+
+    def solve(self) -> "np.ndarray":
+        """
+        Returns the least squares weights, intercept first, as a `(d,)` array for a single \
+        target or a `(d, n_targets)` array otherwise.
+        """
+        if self.n == 0:
+            raise Exception("No rows to solve the normal equations with")
+        w = np.linalg.lstsq(self.ata, self.aty, rcond=None)[0]
+        return w[:, 0] if w.shape[1] == 1 else w
+
+    def metrics(self, weights: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Returns the mean squared error and coefficient of determination of each target for \
+        the given weights, computed from the accumulated sums (without another pass).
+        """
+        w = weights.reshape(self.ata.shape[0], -1)
+        sse = (
+            np.diag(self.yty)
+            - 2 * np.einsum("dt,dt->t", w, self.aty)
+            + np.einsum("dt,de,et->t", w, self.ata, w)
+        )
+        sst = np.diag(self.yty) - self.y_sum ** 2 / self.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = 1 - sse / sst
+        return sse / self.n, r_squared
+
+
+def accumulate_normal_equations(
+    x_uri: str,
+    x_columns: Sequence[str],
+    y_uri: str,
+    y_columns: Sequence[str],
+    small_threshold: Optional[float] = None,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+    max_workers: int = STREAM_MAX_WORKERS,
+    processes: Optional[int] = None,
+    client=None,
+) -> NormalEquations:
+    """
+    Stream the `x_columns` of the csv file at x_uri and the `y_columns` of the csv file at \
+    y_uri, whose rows are aligned, and accumulate their normal equations. Chunks of both files \
+    are parsed on a shared process pool.
+
+    Arguments:
+        x_uri: S3 URI of the csv file of inputs.
+        x_columns: Input columns.
+        y_uri: S3 URI of the csv file of targets, it may be the same as x_uri.
+        y_columns: Target columns.
+        small_threshold: See `NormalEquations`.
+        chunk_bytes: Size of the chunks the files are read in.
+        max_workers: Maximum number of concurrent ranged reads per file.
+        processes: Number of processes the chunks are parsed on, the number of CPUs by \
+            default.
+    Returns:
+        A `NormalEquations` instance.
+    """
+    eq = NormalEquations(
+        len(x_columns), n_targets=len(y_columns), small_threshold=small_threshold
+    )
+    options = dict(chunk_bytes=chunk_bytes, max_workers=max_workers, client=client)
+
+    with process_pool(processes) as pool:
+        xs = iter_numeric_arrays(x_uri, x_columns, pool=pool, **options)
+        ys = iter_numeric_arrays(y_uri, y_columns, pool=pool, **options)
+        for x, y in iter_aligned_arrays(xs, ys):
+            eq.update(x, y)
+
+    return eq
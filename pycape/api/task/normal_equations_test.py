@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from .normal_equations import NormalEquations
+from .normal_equations import accumulate_normal_equations
+
+
+def test_normal_equations():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1, 9, size=(1000, 3))
+    y = 2.0 + x @ [0.5, -1.0, 3.0] + rng.normal(scale=0.1, size=1000)
+
+    eq = NormalEquations(3, small_threshold=1.5)
+    for i in range(0, 1000, 128):
+        eq.update(x[i : i + 128], y[i : i + 128])
+
+    a = np.hstack([np.ones((1000, 1)), x])
+    expected = np.linalg.lstsq(a, y, rcond=None)[0]
+    weights = eq.solve()
+    np.testing.assert_allclose(weights, expected)
+
+    mse, r_squared = eq.metrics(weights)
+    residuals = y - a @ expected
+    np.testing.assert_allclose(mse, [np.mean(residuals ** 2)])
+    np.testing.assert_allclose(
+        r_squared, [1 - np.sum(residuals ** 2) / np.sum((y - y.mean()) ** 2)]
+    )
+
+    np.testing.assert_allclose(eq.abs_max, np.r_[1.0, x.max(axis=0), y.max()])
+    assert eq.small_counts[1:4].tolist() == (x < 1.5).sum(axis=0).tolist()
+    # the intercept column of ones
+    assert eq.small_counts[0] == 1000
+
+
+def test_normal_equations_missing_values():
+    eq = NormalEquations(1)
+    eq.update(np.array([[1.0], [np.nan], [3.0]]), np.array([1.0, 2.0, np.nan]))
+
+    assert (eq.n, eq.dropped) == (1, 2)
+
+    with pytest.raises(Exception, match="No rows"):
+        NormalEquations(1).solve()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_accumulate_normal_equations(s3_client, processes):
+    n = 3000
+    x = pd.DataFrame({"a": np.linspace(1, 5, n), "b": np.cos(np.arange(n)) + 2})
+    y = pd.DataFrame({"y": 1 + 2 * x["a"] - x["b"]})
+    put_s3_object("ne/x.csv", x.to_csv().encode())
+    put_s3_object("ne/y.csv", y.to_csv(index=False).encode())
+
+    eq = accumulate_normal_equations(
+        f"s3://{BUCKET_NAME}/ne/x.csv",
+        ["a", "b"],
+        f"s3://{BUCKET_NAME}/ne/y.csv",
+        ["y"],
+        chunk_bytes=2048,
+        processes=processes,
+    )
+
+    assert eq.n == n
+    np.testing.assert_allclose(eq.solve(), [1.0, 2.0, -1.0], atol=1e-8)
@@ -47,6 +47,13 @@ class Task(ABC):
             raise Exception("no model owner provided")
         self.__model_owner = model_owner
 
+    def validate(self, **kwargs) -> None:
+        """
+        Check the task's inputs before it is submitted, raising if they are invalid. Tasks \
+        without client-side checks accept any input.
+        """
+        pass
+
     def _create_task(
         self,
         project_id: str,
@@ -1,7 +1,15 @@
 import contextlib
 
+import numpy as np
+import pandas as pd
 import pytest
 
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from ...exceptions import AlignmentException
+from ...exceptions import FixedPointException
+from ...exceptions import ScalingException
 from ...exceptions import StorageSchemeException, StorageException
 from ..dataview.dataview import DataView
 from .task import Task
@@ -230,3 +238,160 @@ class TestTask:
         if isinstance(exception, contextlib._GeneratorContextManager):
             assert t.x_train_dataview == x_dataview
             assert t.y_train_dataview == y_dataview
+
+    @pytest.mark.parametrize(
+        "body,reasons",
+        [
+            (b"a,b,y\n1.0,9.5,2.0\n0.5,3.0,1.0\n", []),
+            (b"a,b,y\n1.0,12.0,2.0\n0.5,3.0,1.0\n", ["x[b]: max is 12.0"]),
+            (
+                b"a,b,y\n0.5,,2.0\n0.25,3.0,x\n",
+                [
+                    "x[a]: max is 0.5",
+                    "x[b]: 1 of 2 values are missing",
+                    "y[y]: 1 of 2 values are missing",
+                ],
+            ),
+        ],
+    )
+    def test_check_scaling(self, s3_client, body, reasons):
+        put_s3_object("train.csv", body)
+        uri = f"s3://{BUCKET_NAME}/train.csv"
+        schema = [
+            {"name": "a", "schema_type": "number"},
+            {"name": "b", "schema_type": "number"},
+            {"name": "y", "schema_type": "number"},
+        ]
+        t = VerticallyPartitionedLinearRegression(
+            x_train_dataview=DataView(id="x", name="x", location=uri, schema=schema)[
+                "a", "b"
+            ],
+            y_train_dataview=DataView(id="y", name="y", location=uri, schema=schema)[
+                "y"
+            ],
+            model_location="s3://my-location",
+            model_owner="org123",
+        )
+
+        violations = t.check_scaling(processes=1)
+
+        assert len(violations) == len(reasons)
+        for v, reason in zip(violations, reasons):
+            assert f"{v.dataview}[{v.column}]: {v.reason}".startswith(reason)
+
+        with pytest.raises(ScalingException) if reasons else notraising():
+            t.validate(processes=1)
+
+    def test_check_fixed_point(self, s3_client):
+        rows = b"".join(b"%f,%f\n" % (1 + i % 8, 1 + (i * 7) % 9) for i in range(2000))
+        put_s3_object("fp/x.csv", b"a,b\n" + rows)
+        put_s3_object("fp/y.csv", b"y\n" + b"2.5\n" * 2000)
+        schema = [
+            {"name": "a", "schema_type": "number"},
+            {"name": "b", "schema_type": "number"},
+        ]
+        t = VerticallyPartitionedLinearRegression(
+            x_train_dataview=DataView(
+                id="x", name="x", location=f"s3://{BUCKET_NAME}/fp/x.csv", schema=schema
+            ),
+            y_train_dataview=DataView(
+                id="y",
+                name="y",
+                location=f"s3://{BUCKET_NAME}/fp/y.csv",
+                schema=[{"name": "y", "schema_type": "number"}],
+            ),
+            model_location="s3://my-location",
+            model_owner="org123",
+        )
+
+        report = t.check_fixed_point(processes=1)
+
+        assert report.rows == 2000
+        assert report.issues == []
+        with notraising():
+            t.validate(fixed_point=True, processes=1)
+
+        # sums over 2000 rows overflow 12 integral bits
+        report = t.check_fixed_point(integral_precision=12, processes=1)
+
+        assert {i.stage for i in report.issues} >= {"gram", "moment"}
+        assert all(i.kind == "overflow" for i in report.issues)
+
+        # precision options reach the simulation, and only it
+        with pytest.raises(FixedPointException, match=r"x.a \(gram\)"):
+            t.validate(fixed_point=True, integral_precision=12, processes=1)
+
+    def test_dry_run(self, s3_client):
+        x = np.column_stack([np.linspace(1, 9, 1000), np.cos(np.arange(1000)) + 2])
+        y = 0.5 + x @ [0.25, 1.5]
+        put_s3_object(
+            "dry/x.csv",
+            pd.DataFrame(x, columns=["a", "b"]).to_csv(index=False).encode(),
+        )
+        put_s3_object(
+            "dry/y.csv", pd.DataFrame({"y": y, "z": -y}).to_csv(index=False).encode()
+        )
+        schema = [
+            {"name": "a", "schema_type": "number"},
+            {"name": "b", "schema_type": "number"},
+        ]
+        t = VerticallyPartitionedLinearRegression(
+            x_train_dataview=DataView(
+                id="x",
+                name="x",
+                location=f"s3://{BUCKET_NAME}/dry/x.csv",
+                schema=schema,
+                development=True,
+            ),
+            y_train_dataview=DataView(
+                id="y",
+                name="y",
+                location=f"s3://{BUCKET_NAME}/dry/y.csv",
+                schema=[
+                    {"name": "y", "schema_type": "number"},
+                    {"name": "z", "schema_type": "number"},
+                ],
+                development=True,
+            )["y"],
+            model_location="s3://my-location",
+            model_owner="org123",
+        )
+
+        weights, metrics = t.dry_run(chunk_bytes=4096, processes=1)
+
+        np.testing.assert_allclose(weights, [0.5, 0.25, 1.5])
+        assert set(metrics) == {"mse_result", "r_squared_result"}
+        assert metrics["mse_result"][0] == pytest.approx(0, abs=1e-12)
+        assert metrics["r_squared_result"][0] == pytest.approx(1)
+
+        t.y_train_dataview.development = False
+        with pytest.raises(Exception, match="y DataView y is not in development mode"):
+            t.dry_run(processes=1)
+
+    def test_check_alignment(self, s3_client):
+        put_s3_object("aligned/x.csv", b"id,a\n1,1.5\n2,2.5\n3,3.5\n")
+        put_s3_object("aligned/y.csv", b"id,y\n1,1.0\n3,2.0\n")
+        t = VerticallyPartitionedLinearRegression(
+            x_train_dataview=DataView(
+                id="x",
+                name="x",
+                location=f"s3://{BUCKET_NAME}/aligned/x.csv",
+                schema=[{"name": "a", "schema_type": "number"}],
+            ),
+            y_train_dataview=DataView(
+                id="y",
+                name="y",
+                location=f"s3://{BUCKET_NAME}/aligned/y.csv",
+                schema=[{"name": "y", "schema_type": "number"}],
+            ),
+            model_location="s3://my-location",
+            model_owner="org123",
+        )
+
+        alignment = t.check_alignment()
+
+        assert not alignment.aligned
+        assert (alignment.x.rows, alignment.y.rows) == (3, 2)
+
+        with pytest.raises(AlignmentException, match="3 rows in .* but 2 rows"):
+            t.validate(processes=1)
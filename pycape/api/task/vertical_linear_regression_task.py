@@ -1,10 +1,60 @@
-from typing import Optional, List, NoReturn
-
+import warnings
+from collections import namedtuple
+from typing import Dict, List, NoReturn, Optional, Tuple
+
+from ...exceptions import AlignmentException
+from ...exceptions import FixedPointException
+from ...exceptions import ScalingException
+from ...lazy import LazyModule
 from ...network.requester import Requester
+from ...vars import FIXEDPOINT_FRACTIONAL_PRECISION
+from ...vars import FIXEDPOINT_INTEGRAL_PRECISION
+from ...vars import FIXEDPOINT_RING_BITS
 from ...vars import JOB_TYPE_LR
+from ...vars import SCALING_MAX_MAX
+from ...vars import SCALING_MIN_MAX
+from ..dataview.alignment import Alignment
+from ..dataview.alignment import check_alignment
 from ..dataview.dataview import DataView
+from ..dataview.stats import ColumnStats
+from ..dataview.stats import column_stats
+from .fixed_point import FixedPointReport
+from .fixed_point import simulate_fixed_point
+from .normal_equations import accumulate_normal_equations
 from .task import Task
 
+np = LazyModule("numpy")
+
+# Input column that does not satisfy the scaling expected by
+# `VerticallyPartitionedLinearRegression`, `dataview` is either "x" or "y".
+ScalingViolation = namedtuple(
+    "ScalingViolation", ["dataview", "column", "stats", "reason"]
+)
+
+
+def scaling_violations(
+    dataview: str, stats: Dict[str, ColumnStats]
+) -> List[ScalingViolation]:
+    """
+    Check that every column has no missing values and a maximum in \
+    `[SCALING_MIN_MAX, SCALING_MAX_MAX)`.
+    """
+    violations = []
+    for column, s in stats.items():
+        if s.nan_count:
+            reason = f"{s.nan_count} of {s.count} values are missing or not numeric"
+            violations.append(ScalingViolation(dataview, column, s, reason))
+        if s.max is None:
+            violations.append(
+                ScalingViolation(dataview, column, s, "no numeric values")
+            )
+        elif not SCALING_MIN_MAX <= s.max < SCALING_MAX_MAX:
+            reason = (
+                f"max is {s.max}, expected {SCALING_MIN_MAX} <= max < {SCALING_MAX_MAX}"
+            )
+            violations.append(ScalingViolation(dataview, column, s, reason))
+    return violations
+
 
 class VerticallyPartitionedLinearRegression(Task):
     """
@@ -135,6 +185,213 @@ class VerticallyPartitionedLinearRegression(Task):
         if missing_params:
             raise Exception(f"DataView Missing Properties: {', '.join(missing_params)}")
 
+    def check_alignment(
+        self,
+        x_index_column: Optional[str] = None,
+        y_index_column: Optional[str] = None,
+        **kwargs,
+    ) -> Alignment:
+        """
+        Check that the datasets of the x and y `DataViews` are aligned by index: that they \
+        have as many rows and, when index columns are given, the same sequence of index \
+        values. Both datasets are read with concurrent ranged GETs rather than downloaded \
+        (see `check_alignment`).
+
+        Arguments:
+            x_index_column: Index column of the x dataset.
+            y_index_column: Index column of the y dataset, `x_index_column` by default.
+            kwargs: Options passed on to `check_alignment`, e.g. `chunk_bytes` and \
+                `max_workers`.
+        Returns:
+            An `Alignment`.
+        """
+        return check_alignment(
+            self._x_train_dataview.location,
+            self._y_train_dataview.location,
+            x_index_column=x_index_column,
+            y_index_column=y_index_column,
+            **kwargs,
+        )
+
+    def check_scaling(self, **kwargs) -> List[ScalingViolation]:
+        """
+        Stream the datasets of the x and y `DataViews` and check that each selected column \
+        has no missing values and is scaled such that `1.0 <= max(c) < 10.0`. Only the \
+        selected columns are parsed, chunk by chunk, on several processes.
+
+        Arguments:
+            kwargs: Options passed on to `column_stats`, e.g. `chunk_bytes`, `max_workers` \
+                and `processes`.
+        Returns:
+            A list of `ScalingViolation`, empty if the inputs are scaled as expected.
+        """
+        violations = []
+        for name, dataview in (
+            ("x", self._x_train_dataview),
+            ("y", self._y_train_dataview),
+        ):
+            stats = column_stats(
+                dataview.location, columns=self._get_dataview_cols(dataview), **kwargs
+            )
+            violations.extend(scaling_violations(name, stats))
+        return violations
+
+    def check_fixed_point(
+        self,
+        integral_precision: int = FIXEDPOINT_INTEGRAL_PRECISION,
+        fractional_precision: int = FIXEDPOINT_FRACTIONAL_PRECISION,
+        ring_bits: int = FIXEDPOINT_RING_BITS,
+        min_significant_bits: int = 8,
+        **kwargs,
+    ) -> FixedPointReport:
+        """
+        Stream the selected columns of the x and y `DataViews`, accumulate their normal \
+        equations and estimate the magnitudes the Cape Worker's fixed-point computation will \
+        reach, flagging the columns likely to overflow or lose precision (see \
+        `simulate_fixed_point`). Rows of both datasets are expected to be aligned.
+
+        Arguments:
+            integral_precision: Number of bits of the integral part of fixed-point numbers.
+            fractional_precision: Number of bits of the fractional part of fixed-point numbers.
+            ring_bits: Number of bits of the ring fixed-point numbers are encoded on.
+            min_significant_bits: Minimal number of significant bits of a non-zero value.
+            kwargs: Options passed on to `accumulate_normal_equations`, e.g. `chunk_bytes`, \
+                `max_workers` and `processes`.
+        Returns:
+            A `FixedPointReport`.
+        """
+        x_cols = self._get_dataview_cols(self._x_train_dataview)
+        y_cols = self._get_dataview_cols(self._y_train_dataview)
+
+        eq = accumulate_normal_equations(
+            self._x_train_dataview.location,
+            x_cols,
+            self._y_train_dataview.location,
+            y_cols,
+            small_threshold=2.0 ** (min_significant_bits - fractional_precision),
+            **kwargs,
+        )
+        return simulate_fixed_point(
+            eq,
+            [("x", c) for c in x_cols] + [("y", c) for c in y_cols],
+            integral_precision=integral_precision,
+            fractional_precision=fractional_precision,
+            ring_bits=ring_bits,
+            min_significant_bits=min_significant_bits,
+        )
+
+    def dry_run(
+        self, development_only: bool = True, **kwargs
+    ) -> Tuple["np.ndarray", dict]:
+        """
+        Train the linear regression locally, in plaintext, to check that it converges and \
+        what metrics to expect before running the encrypted `Job`. Both datasets must be \
+        readable from your environment, as is typically the case in a development setting.
+
+        The selected columns of the x and y `DataViews` are streamed in chunks and their \
+        normal equations accumulated with NumPy (see `accumulate_normal_equations`), so \
+        datasets larger than memory can be trained on. Rows with missing values are skipped.
+
+        Arguments:
+            development_only: Whether to refuse to read `DataViews` that are not in \
+                development mode.
+            kwargs: Options passed on to `accumulate_normal_equations`, e.g. `chunk_bytes`, \
+                `max_workers` and `processes`.
+        Returns:
+            weights: A numpy array, the intercept first, as returned by `Job.get_results`.
+            metrics: A dictionary of metric values, as returned by `Job.get_results`.
+        """
+        if development_only:
+            for name, dataview in (
+                ("x", self._x_train_dataview),
+                ("y", self._y_train_dataview),
+            ):
+                if not dataview.development:
+                    raise Exception(
+                        f"{name} DataView {dataview.name} is not in development mode"
+                    )
+
+        eq = accumulate_normal_equations(
+            self._x_train_dataview.location,
+            self._get_dataview_cols(self._x_train_dataview),
+            self._y_train_dataview.location,
+            self._get_dataview_cols(self._y_train_dataview),
+            **kwargs,
+        )
+        if eq.dropped:
+            warnings.warn(f"Skipped {eq.dropped} rows with missing values")
+
+        weights = eq.solve()
+        mse, r_squared = eq.metrics(weights)
+        metrics = {
+            "mse_result": [float(v) for v in mse],
+            "r_squared_result": [float(v) for v in r_squared],
+        }
+        return weights, metrics
+
+    def validate(
+        self,
+        alignment: bool = True,
+        fixed_point: bool = False,
+        x_index_column: Optional[str] = None,
+        y_index_column: Optional[str] = None,
+        integral_precision: int = FIXEDPOINT_INTEGRAL_PRECISION,
+        fractional_precision: int = FIXEDPOINT_FRACTIONAL_PRECISION,
+        ring_bits: int = FIXEDPOINT_RING_BITS,
+        min_significant_bits: int = 8,
+        **kwargs,
+    ) -> None:
+        """
+        Check the inputs of the task, raising a `ScalingException` listing the input columns \
+        that are not scaled as expected (see `check_scaling`).
+
+        Arguments:
+            alignment: Whether to first check that the x and y datasets have as many rows \
+                (see `check_alignment`) and raise an `AlignmentException` otherwise. Skipped \
+                when both `DataViews` point to the same dataset.
+            fixed_point: Whether to also simulate the fixed-point computation (see \
+                `check_fixed_point`) and raise a `FixedPointException` listing the values \
+                likely to overflow. Precision losses are only warned about.
+            x_index_column: Index column of the x dataset, see `check_alignment`.
+            y_index_column: Index column of the y dataset, see `check_alignment`.
+            integral_precision: See `check_fixed_point`.
+            fractional_precision: See `check_fixed_point`.
+            ring_bits: See `check_fixed_point`.
+            min_significant_bits: See `check_fixed_point`.
+            kwargs: Options passed on to every check, i.e. `chunk_bytes`, `max_workers` and \
+                `processes`.
+        """
+        if (
+            alignment
+            and self._x_train_dataview.location != self._y_train_dataview.location
+        ):
+            result = self.check_alignment(
+                x_index_column=x_index_column, y_index_column=y_index_column, **kwargs
+            )
+            if not result.aligned:
+                raise AlignmentException(result)
+
+        violations = self.check_scaling(**kwargs)
+        if violations:
+            raise ScalingException(violations)
+
+        if fixed_point:
+            report = self.check_fixed_point(
+                integral_precision=integral_precision,
+                fractional_precision=fractional_precision,
+                ring_bits=ring_bits,
+                min_significant_bits=min_significant_bits,
+                **kwargs,
+            )
+            overflows = [i for i in report.issues if i.kind == "overflow"]
+            if overflows:
+                raise FixedPointException(overflows)
+            for i in report.issues:
+                warnings.warn(
+                    f"{'.'.join(c for c in i.column if c)} may lose precision in "
+                    f"fixed-point ({i.stage}): {i.magnitude:g} < {i.limit:g}"
+                )
+
     def _create_task(self, project_id: str, requester: Requester, timeout: float = 600):
         x_cols = self._get_dataview_cols(self._x_train_dataview)
         y_cols = self._get_dataview_cols(self._y_train_dataview)
@@ -35,3 +35,49 @@ class StorageAccessException(Exception):
 
     def __str__(self):
         return str(self.message)
+
+
+class CircuitOpenException(Exception):
+    def __init__(self, endpoint: str, retry_in: float, message: str = None):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        self.message = message or (
+            f"Coordinator ({endpoint}) is failing, not sending requests for another {retry_in:.1f}s"
+        )
+
+    def __str__(self):
+        return str(self.message)
+
+
+class ScalingException(Exception):
+    def __init__(self, violations: list, message: str = None):
+        self.violations = violations
+        self.message = (
+            message
+            or "Task inputs are not scaled as expected:\n"
+            + "\n".join(f"  {v.dataview}[{v.column}]: {v.reason}" for v in violations)
+        )
+
+    def __str__(self):
+        return str(self.message)
+
+
+class FixedPointException(Exception):
+    def __init__(self, issues: list, message: str = None):
+        self.issues = issues
+        self.message = message or "Task inputs are likely to overflow:\n" + "\n".join(
+            f"  {'.'.join(c for c in i.column if c)} ({i.stage}): {i.magnitude:g} >= {i.limit:g}"
+            for i in issues
+        )
+
+    def __str__(self):
+        return str(self.message)
+
+
+class AlignmentException(Exception):
+    def __init__(self, alignment, message: str = None):
+        self.alignment = alignment
+        self.message = message or f"Task inputs are not aligned: {alignment.reason}"
+
+    def __str__(self):
+        return str(self.message)
@@ -0,0 +1,47 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Heavy dependencies (pandas, numpy, boto3, ...) are only needed on some code paths, e.g. \
+    schema inference or results download. Binding them through `LazyModule` keeps \
+    `import pycape` fast while the rest of the code uses them as usual (`pd.read_csv(...)`). \
+    Attributes set or deleted on the stand-in are set or deleted on the module itself.
+
+    Arguments:
+        name (str): Absolute name of the module, e.g. `"pandas.api.types"`.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = object.__getattribute__(self, "_module")
+        if module is None:
+            with LazyModule._lock:
+                module = importlib.import_module(object.__getattribute__(self, "_name"))
+                object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_name")
+        loaded = object.__getattribute__(self, "_module") is not None
+        return f"<lazy module '{name}'{'' if loaded else ' (not loaded)'}>"
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from unittest import mock
+
+from .lazy import LazyModule
+
+HEAVY_MODULES = ("pandas", "numpy", "boto3", "botocore", "marshmallow", "tabulate")
+
+# `import pycape` should stay well below this many seconds
+IMPORT_BUDGET = 1.0
+
+
+def test_lazy_module():
+    lazy_json = LazyModule("json")
+
+    assert "not loaded" in repr(lazy_json)
+    assert lazy_json.dumps([1]) == "[1]"
+    assert "not loaded" not in repr(lazy_json)
+
+
+def test_lazy_module_patch():
+    lazy_json = LazyModule("json")
+
+    with mock.patch.object(lazy_json, "dumps", return_value="patched"):
+        assert json.dumps([1]) == "patched"
+        assert lazy_json.dumps([1]) == "patched"
+
+    assert json.dumps([1]) == "[1]"
+
+
+def test_import_pycape():
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import pycape\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], check=True, stdout=subprocess.PIPE
+    ).stdout
+    result = json.loads(out)
+
+    assert result["heavy"] == []
+    assert result["elapsed"] < IMPORT_BUDGET
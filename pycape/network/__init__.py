@@ -1,5 +1,13 @@
+from .cache import ResponseCache
 from .requester import NotAUserException
+from .requester import Requester
+from .retry import CircuitBreaker
+from .retry import RetryPolicy
 
 __all__ = [
+    "CircuitBreaker",
     "NotAUserException",
+    "Requester",
+    "ResponseCache",
+    "RetryPolicy",
 ]
@@ -0,0 +1,142 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from typing import Optional
+
+from .requester import Requester
+
+
+class AsyncRequester:
+    """
+    Coroutine interface over `Requester`.
+
+    Calls are dispatched onto a bounded thread pool that shares the wrapped requester's
+    `requests.Session`, so many coordinator round-trips can be awaited concurrently from a
+    single event loop while reusing one pool of keep-alive connections.
+
+    Arguments:
+        endpoint (str): Coordinator endpoint to point to.
+        requester (Requester): An existing (optionally logged in) requester to wrap. Its \
+        `pool_maxsize` should be at least `max_workers`. Its session is not closed by \
+        `close`.
+        max_workers (int): Maximum number of requests in flight at once.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        requester: Optional[Requester] = None,
+        max_workers: int = 32,
+    ):
+        # size the connection pool to the number of workers so concurrent
+        # requests reuse connections instead of discarding them
+        self.requester: Requester = requester or Requester(
+            endpoint=endpoint, pool_connections=1, pool_maxsize=max_workers
+        )
+        # a requester passed in belongs to the caller, its session is left open
+        self._owns_requester: bool = requester is None
+        self.max_workers: int = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def __aenter__(self) -> "AsyncRequester":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self._owns_requester:
+            self.requester.session.close()
+
+    async def _call(self, method: str, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        fn = functools.partial(getattr(self.requester, method), *args, **kwargs)
+        return await loop.run_in_executor(self._executor, fn)
+
+    async def login(self, token: Optional[str] = None) -> str:
+        return await self._call("login", token=token)
+
+    async def me(self) -> dict:
+        return await self._call("me")
+
+    async def list_projects(
+        self, include: Optional[Iterable[str]] = None
+    ) -> Optional[list]:
+        return await self._call("list_projects", include=include)
+
+    async def get_project(
+        self, id: str = None, label: str = None, include: Optional[Iterable[str]] = None
+    ) -> Optional[dict]:
+        return await self._call("get_project", id=id, label=label, include=include)
+
+    async def create_project(
+        self, name: str, owner: str, description: str
+    ) -> Optional[dict]:
+        return await self._call(
+            "create_project", name=name, owner=owner, description=description
+        )
+
+    async def archive_project(self, id: str) -> Optional[dict]:
+        return await self._call("archive_project", id=id)
+
+    async def create_dataview(
+        self,
+        project_id: str,
+        name: str,
+        uri: str,
+        owner_id: Optional[str],
+        owner_label: Optional[str],
+        schema: list,
+        development: bool = False,
+    ) -> Optional[dict]:
+        return await self._call(
+            "create_dataview",
+            project_id=project_id,
+            name=name,
+            uri=uri,
+            owner_id=owner_id,
+            owner_label=owner_label,
+            schema=schema,
+            development=development,
+        )
+
+    async def list_dataviews(self, project_id: str) -> Optional[list]:
+        return await self._call("list_dataviews", project_id=project_id)
+
+    async def get_dataview(
+        self, project_id: str, dataview_id: str = None, uri: str = None
+    ) -> Optional[dict]:
+        return await self._call(
+            "get_dataview", project_id=project_id, dataview_id=dataview_id, uri=uri
+        )
+
+    async def delete_dataview(self, id: str) -> dict:
+        return await self._call("delete_dataview", id=id)
+
+    async def create_job(
+        self, project_id: str, job_type: str, task_config: str
+    ) -> dict:
+        return await self._call(
+            "create_job",
+            project_id=project_id,
+            job_type=job_type,
+            task_config=task_config,
+        )
+
+    async def approve_job(self, job_id: str, org_id: str) -> dict:
+        return await self._call("approve_job", job_id=job_id, org_id=org_id)
+
+    async def submit_job(self, job_id: str) -> dict:
+        return await self._call("submit_job", job_id=job_id)
+
+    async def get_job(
+        self, project_id: str, job_id: str, return_params: str = ""
+    ) -> Optional[dict]:
+        return await self._call(
+            "get_job", project_id=project_id, job_id=job_id, return_params=return_params
+        )
+
+    async def list_jobs(self, project_id: str) -> Optional[dict]:
+        return await self._call("list_jobs", project_id=project_id)
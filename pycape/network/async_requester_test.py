@@ -0,0 +1,45 @@
+import asyncio
+
+import responses
+
+from conftest import run
+from tests.fake import FAKE_HOST
+
+from .async_requester import AsyncRequester
+from .requester import Requester
+
+
+@responses.activate
+def test_concurrent_get_job():
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json={"data": {"project": {"job": {"id": "abc123", "status": {"code": "Ok"}}}}},
+    )
+
+    async def main():
+        async with AsyncRequester(endpoint=FAKE_HOST, max_workers=4) as r:
+            return await asyncio.gather(
+                *(r.get_job(project_id="p_123", job_id="abc123") for _ in range(10))
+            )
+
+    jobs = run(main())
+
+    assert len(jobs) == 10
+    assert all(j["status"]["code"] == "Ok" for j in jobs)
+    assert len(responses.calls) == 10
+
+
+def test_close(mocker):
+    owned = AsyncRequester(endpoint=FAKE_HOST)
+    shared = Requester(endpoint=FAKE_HOST)
+    wrapper = AsyncRequester(requester=shared)
+    owned_close = mocker.spy(owned.requester.session, "close")
+    shared_close = mocker.spy(shared.session, "close")
+
+    owned.close()
+    wrapper.close()
+
+    # the session of a requester passed in belongs to the caller
+    owned_close.assert_called_once()
+    shared_close.assert_not_called()
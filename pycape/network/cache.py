@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+# Queries whose results are tied to job status, which changes without any
+# client-side mutation, are not cached by default.
+DEFAULT_TTLS = {
+    "GetJob": 0,
+    "ListJobs": 0,
+    "Me": 0,
+}
+
+# Mutation name -> query names whose cached results it may make stale.
+DEFAULT_INVALIDATIONS = {
+    "CreateProject": ("ListProjects",),
+    "ArchiveProject": (
+        "ListProjects",
+        "GetProject",
+        "ListDataViews",
+        "GetDataView",
+        "ListJobs",
+        "GetJob",
+    ),
+    "AddDataView": ("ListProjects", "GetProject", "ListDataViews", "GetDataView"),
+    "RemoveDataView": ("ListProjects", "GetProject", "ListDataViews", "GetDataView"),
+    "CreateTask": ("ListProjects", "GetProject", "ListJobs", "GetJob"),
+    "InitializeSession": ("ListProjects", "GetProject", "ListJobs", "GetJob"),
+    "ApproveJob": ("ListProjects", "GetProject", "ListJobs", "GetJob"),
+}
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of coordinator query responses, keyed by query and variables.
+
+    Entries expire after a per-operation TTL and the least recently used entries are evicted
+    once either `max_entries` or the approximate `max_bytes` budget is exceeded. Mutations drop
+    the cached results of the queries listed for them in `invalidations`.
+
+    A cache should not be shared between requesters authenticated as different users.
+
+    Arguments:
+        ttl (float): Default time to live (in seconds) of a cached response.
+        ttls (dict): Per-operation TTL overrides, by GraphQL operation name. A TTL of 0 \
+        disables caching for that operation.
+        max_entries (int): Maximum number of cached responses.
+        max_bytes (int): Approximate upper bound on the serialized size of cached responses.
+        invalidations (dict): Mapping of mutation name to the query names it invalidates.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        invalidations: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.invalidations = dict(DEFAULT_INVALIDATIONS)
+        self.invalidations.update(invalidations or {})
+
+        # key -> (operation, expires_at, size, data)
+        self._entries: "OrderedDict[str, Tuple[str, float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(query: str, variables: Optional[dict]) -> str:
+        return json.dumps([" ".join(query.split()), variables or {}], sort_keys=True)
+
+    def _ttl(self, operation: str) -> float:
+        return self.ttls.get(operation, self.ttl)
+
+    def _remove(self, key: str) -> None:
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, operation: str, key: str) -> Tuple[bool, Any]:
+        """
+        Returns a `(hit, data)` tuple for a cached response.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, entry[3]
+
+    def set(self, operation: str, key: str, data: Any) -> None:
+        ttl = self._ttl(operation)
+        if ttl <= 0:
+            return
+
+        size = len(json.dumps(data))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (operation, time.monotonic() + ttl, size, data)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *operations: str) -> None:
+        """
+        Drop cached responses of the given query operations, or of every operation if none given.
+        """
+        with self._lock:
+            if not operations:
+                self._entries.clear()
+                self._bytes = 0
+                return
+
+            stale = [k for k, e in self._entries.items() if e[0] in operations]
+            for k in stale:
+                self._remove(k)
+
+    def mutated(self, mutation: str) -> None:
+        """
+        Invalidate the queries affected by a mutation. Unknown mutations invalidate everything.
+        """
+        operations = self.invalidations.get(mutation)
+        if operations is None:
+            self.invalidate()
+        elif operations:
+            self.invalidate(*operations)
@@ -0,0 +1,77 @@
+import pytest
+import responses
+
+from tests.fake import FAKE_HOST
+
+from .cache import ResponseCache
+from .requester import Requester
+
+
+def project_json(name):
+    return {"data": {"project": {"id": "p_123", "name": name}}}
+
+
+class TestResponseCache:
+    def test_lru_eviction(self):
+        c = ResponseCache(max_entries=2)
+        c.set("GetProject", "a", 1)
+        c.set("GetProject", "b", 2)
+        c.get("GetProject", "a")
+        c.set("GetProject", "c", 3)
+
+        assert c.get("GetProject", "a") == (True, 1)
+        assert c.get("GetProject", "b") == (False, None)
+        assert c.get("GetProject", "c") == (True, 3)
+
+    def test_memory_bound(self):
+        c = ResponseCache(max_bytes=10)
+        c.set("GetProject", "a", "x" * 4)
+        c.set("GetProject", "b", "y" * 4)
+        c.set("GetProject", "c", "z" * 100)
+
+        assert len(c) == 1
+        assert c.get("GetProject", "b") == (True, "yyyy")
+
+    def test_ttl(self, mocker):
+        monotonic = mocker.patch("pycape.network.cache.time.monotonic")
+        monotonic.return_value = 0
+        c = ResponseCache(ttl=10, ttls={"ListDataViews": 100})
+        c.set("GetProject", "a", 1)
+        c.set("ListDataViews", "b", 2)
+        c.set("GetJob", "c", 3)
+
+        monotonic.return_value = 50
+        assert c.get("GetProject", "a") == (False, None)
+        assert c.get("ListDataViews", "b") == (True, 2)
+        assert c.get("GetJob", "c") == (False, None)
+
+    @pytest.mark.parametrize(
+        "mutation,expect_hit",
+        [("AddDataView", False), ("ApproveJob", False), ("CreateProject", True)],
+    )
+    def test_mutation_invalidates(self, mutation, expect_hit):
+        c = ResponseCache()
+        c.set("GetProject", "a", 1)
+        c.mutated(mutation)
+
+        assert c.get("GetProject", "a")[0] is expect_hit
+
+
+@responses.activate
+def test_requester_cache():
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=project_json("a"))
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json={"data": {"removeDataView": {"id": "dv_123"}}},
+    )
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=project_json("b"))
+    r = Requester(endpoint=FAKE_HOST, cache=ResponseCache())
+
+    assert r.get_project(id="p_123")["name"] == "a"
+    assert r.get_project(id="p_123")["name"] == "a"
+    assert len(responses.calls) == 1
+
+    r.delete_dataview(id="dv_123")
+    assert r.get_project(id="p_123")["name"] == "b"
+    assert len(responses.calls) == 3
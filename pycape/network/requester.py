@@ -1,15 +1,189 @@
+import functools
 import os
-from typing import Optional, NoReturn
-from urllib.parse import urlparse, urlunparse
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NoReturn
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from urllib.parse import urlparse
+from urllib.parse import urlunparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
-from ..exceptions import GQLException, NotAUserException, InvalidCoordinatorException
+from ..exceptions import CircuitOpenException
+from ..exceptions import GQLException
+from ..exceptions import InvalidCoordinatorException
+from ..exceptions import NotAUserException
 from .api_token import APIToken
 from .base64 import from_string
+from .cache import ResponseCache
+from .retry import SERVER_FAILURE_STATUSES
+from .retry import CircuitBreaker
+from .retry import RetryPolicy
+
+# nested collections that can be selected on a project, all of them are selected
+# when no explicit projection is requested
+PROJECT_INCLUDES = ("organizations", "dataviews", "jobs")
+
+OPERATION_RE = re.compile(r"^\s*(query|mutation)\s+(\w+)")
+
+
+class GQLFuture:
+    """
+    Placeholder for the result of a query queued inside `Requester.batch`.
+
+    The value becomes available through `result()` once the batch has been sent.
+    """
+
+    def __init__(self, path: Tuple[str, ...] = (), default: Any = None):
+        self._path = path
+        self._default = default
+        self._data: Optional[dict] = None
+        self._error: Optional[Exception] = None
+        self._done: bool = False
+
+    def _set_result(self, data: dict) -> None:
+        self._data = data
+        self._done = True
+
+    def _set_error(self, error: Exception) -> None:
+        self._error = error
+        self._done = True
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self) -> Any:
+        if not self._done:
+            raise GQLException("Batched query has not been sent yet")
+        if self._error is not None:
+            raise self._error
+        return Requester._extract(self._data, self._path, self._default)
+
+
+class GQLBatch:
+    """
+    Collects queries issued through a `Requester` and sends them to the coordinator as a single
+    JSON array payload, at most `max_size` operations per HTTP request.
+    """
+
+    def __init__(self, requester: "Requester", max_size: int = 50):
+        if max_size < 1:
+            raise ValueError("Batch max_size must be at least 1")
+        self._requester = requester
+        self.max_size = max_size
+        self._queue: List[Tuple[dict, GQLFuture]] = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _add(self, input_json: dict, path: Tuple[str, ...], default: Any) -> GQLFuture:
+        future = GQLFuture(path=path, default=default)
+        self._queue.append((input_json, future))
+        return future
+
+    def _add_result(self, data: dict, path: Tuple[str, ...], default: Any) -> GQLFuture:
+        future = GQLFuture(path=path, default=default)
+        future._set_result(data)
+        return future
+
+    def flush(self) -> None:
+        """
+        Send every queued query and resolve the corresponding futures.
+        """
+        queue, self._queue = self._queue, []
+        for i in range(0, len(queue), self.max_size):
+            chunk = queue[i : i + self.max_size]
+            responses = self._requester._post_gql(
+                [input_json for input_json, _ in chunk]
+            )
+
+            if not isinstance(responses, list) or len(responses) != len(chunk):
+                raise GQLException(
+                    f"Expected {len(chunk)} batched responses, got: {responses}"
+                )
+
+            for (input_json, future), j in zip(chunk, responses):
+                if "errors" in j:
+                    future._set_error(GQLException(f"An error occurred: {j['errors']}"))
+                else:
+                    self._requester._cache_response(input_json, j.get("data"))
+                    future._set_result(j.get("data"))
+
+
+def unbatched(method: Callable) -> Callable:
+    """
+    Decorates methods of objects holding a `_requester` that need the results of their \
+    queries right away, which a `Requester.batch` only provides once it has exited. Calling \
+    them inside a batch raises a `GQLException` instead of failing on a `GQLFuture`.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._requester.in_batch():
+            raise GQLException(
+                f"{type(self).__name__}.{method.__name__} cannot be called inside "
+                "Requester.batch(), results of batched queries are only available once "
+                "the batch has exited"
+            )
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` that can additionally set socket options (e.g. TCP keep-alive) on the \
+    pooled connections.
+    """
+
+    def __init__(self, socket_options: Optional[List[tuple]] = None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
 
 
 class Requester:
+    """
+    Client for the coordinator API.
+
+    A single `Requester` may be shared by a pool of worker threads: requests go through one \
+    pool of keep-alive connections, and login state, batches, the response cache and the \
+    circuit breaker are safe for concurrent use.
+
+    Arguments:
+        endpoint (str): Coordinator endpoint, defaults to `CAPE_COORDINATOR`.
+        cache (ResponseCache): Optional cache for query responses.
+        retry (RetryPolicy): Retry policy for failed requests.
+        circuit_breaker (CircuitBreaker): Circuit breaker guarding the coordinator.
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of connections kept per host, should be at least \
+        the number of threads sharing the requester.
+        pool_block (bool): Wait for a free connection instead of opening (and discarding) an \
+        extra one when the pool is exhausted.
+        timeout (Union[float, Tuple[float, float]]): Connect and read timeouts in seconds, \
+        `None` waits forever.
+        keep_alive (bool): Reuse connections between requests.
+        tcp_keepalive (bool): Enable TCP keep-alive probes on pooled connections so idle \
+        connections are not silently dropped by load balancers.
+    """
+
     dataview_fragment = """
         id
         name
@@ -35,7 +209,24 @@ class Requester:
         task { type }
     """
 
-    def __init__(self, endpoint: str = None):
+    job_results_fragment = """
+        model_metrics { name value }
+        model_location
+    """
+
+    def __init__(
+        self,
+        endpoint: str = None,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: Union[float, Tuple[float, float], None] = (10.0, 120.0),
+        keep_alive: bool = True,
+        tcp_keepalive: bool = False,
+    ):
         self.endpoint = endpoint or os.environ.get(
             "CAPE_COORDINATOR", "https://app.capeprivacy.com"
         )
@@ -44,7 +235,31 @@ class Requester:
 
         self.gql_endpoint = self._parse_coordinator_endpoint(self.endpoint, "/v1/query")
 
+        self.timeout = timeout
         self.session = requests.Session()
+        adapter = PooledHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            socket_options=(
+                HTTPConnection.default_socket_options
+                + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+                if tcp_keepalive
+                else None
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self.cache: Optional[ResponseCache] = cache
+        self.retry: RetryPolicy = retry or RetryPolicy()
+        self.circuit_breaker: CircuitBreaker = circuit_breaker or CircuitBreaker()
+
+        # batches are tracked per thread so a shared requester can batch independently
+        self._local = threading.local()
+        self._login_lock = threading.Lock()
 
     @staticmethod
     def _check_endpoint(url: str) -> NoReturn:
@@ -74,29 +289,123 @@ class Requester:
         if not token:
             raise Exception("No token provided")
 
-        self.token = token
-        self.api_token = APIToken(self.token)
+        # login state is shared by every thread using this requester
+        with self._login_lock:
+            self.token = token
+            self.api_token = APIToken(self.token)
 
-        resp = self.session.post(
-            self._parse_coordinator_endpoint(self.endpoint, "/v1/login"),
-            json={"token_id": self.api_token.token_id, "secret": self.api_token.secret},
-        )
+            resp = self._post(
+                self._parse_coordinator_endpoint(self.endpoint, "/v1/login"),
+                json={
+                    "token_id": self.api_token.token_id,
+                    "secret": self.api_token.secret,
+                },
+            )
 
-        resp.raise_for_status()
-        json = resp.json()
+            resp.raise_for_status()
+            json = resp.json()
 
-        self.token = from_string(json["token"])
+            self.token = from_string(json["token"])
 
-        self._check_user(token)
+            if self.cache is not None:
+                self.cache.invalidate()
 
-        return json["user_id"]
+            # the user check needs its result now, even inside a batch
+            with self._suspend_batch():
+                self._check_user(token)
 
-    def _gql_req(self, query: str, variables: Optional[dict]) -> dict:
-        input_json = {"query": query, "variables": {}}
-        if variables is not None:
-            input_json["variables"] = variables
+            return json["user_id"]
 
-        r = self.session.post(self.gql_endpoint, json=input_json)
+    @staticmethod
+    def _extract(
+        data: Optional[dict], path: Tuple[str, ...], default: Any = None
+    ) -> Any:
+        for key in path[:-1]:
+            data = (data or {}).get(key)
+        if not path:
+            return data
+        return (data or {}).get(path[-1], default)
+
+    @contextmanager
+    def batch(self, max_size: int = 50) -> Iterator[GQLBatch]:
+        """
+        Queue every query made on this thread within the context and send them together on exit.
+
+        While the batch is open, requester methods return a `GQLFuture` instead of their result;
+        call `result()` on it once the context has exited. Nested calls join the outer batch.
+        Methods of `Cape`, `Project` and `Job` that use the results of their queries raise a
+        `GQLException` inside a batch.
+        """
+        current = getattr(self._local, "batch", None)
+        if current is not None:
+            yield current
+            return
+
+        b = GQLBatch(requester=self, max_size=max_size)
+        self._local.batch = b
+        try:
+            yield b
+        finally:
+            self._local.batch = None
+        b.flush()
+
+    def in_batch(self) -> bool:
+        """
+        Whether a batch is open on this thread, i.e. queries return a `GQLFuture`.
+        """
+        return getattr(self._local, "batch", None) is not None
+
+    @contextmanager
+    def _suspend_batch(self) -> Iterator[None]:
+        batch = getattr(self._local, "batch", None)
+        self._local.batch = None
+        try:
+            yield
+        finally:
+            self._local.batch = batch
+
+    def _post(self, url: str, json: Any, idempotent: bool = True) -> requests.Response:
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                raise CircuitOpenException(
+                    endpoint=self.endpoint, retry_in=self.circuit_breaker.retry_in()
+                )
+
+            resp = None
+            try:
+                resp = self.session.post(url, json=json, timeout=self.timeout)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                self.circuit_breaker.record_failure()
+                if not self.retry.should_retry_error(attempt, e, idempotent=idempotent):
+                    raise
+            except BaseException:
+                # e.g. a connection reset while reading the body, which must not leave a
+                # half-open circuit waiting for its trial request forever
+                self.circuit_breaker.record_failure()
+                raise
+            else:
+                if resp.status_code in SERVER_FAILURE_STATUSES:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+                if not self.retry.should_retry_response(
+                    attempt, resp, idempotent=idempotent
+                ):
+                    return resp
+
+            time.sleep(self.retry.backoff(attempt, resp))
+            attempt += 1
+
+    def _post_gql(self, input_json) -> Any:
+        queries = input_json if isinstance(input_json, list) else [input_json]
+        idempotent = all(self._operation(q["query"])[0] != "mutation" for q in queries)
+
+        r = self._post(self.gql_endpoint, json=input_json, idempotent=idempotent)
 
         j = {}
         try:
@@ -104,61 +413,144 @@ class Requester:
         except ValueError:
             r.raise_for_status()
 
+        return j
+
+    def _gql_req(
+        self,
+        query: str,
+        variables: Optional[dict],
+        path: Tuple[str, ...] = (),
+        default: Any = None,
+    ) -> Any:
+        input_json = {"query": query, "variables": {}}
+        if variables is not None:
+            input_json["variables"] = variables
+
+        batch = getattr(self._local, "batch", None)
+
+        hit, data = self._cached_response(input_json)
+        if hit:
+            if batch is not None:
+                return batch._add_result(data, path=path, default=default)
+            return self._extract(data, path, default)
+
+        if batch is not None:
+            return batch._add(input_json, path=path, default=default)
+
+        j = self._post_gql(input_json)
+
         if "errors" in j:
             raise GQLException(f"An error occurred: {j['errors']}")
-        return j["data"]
 
-    def list_projects(self) -> Optional[list]:
-        return self._gql_req(
-            query=f"""
-            query ListProjects {{
-                projects {{
+        self._cache_response(input_json, j["data"])
+        return self._extract(j["data"], path, default)
+
+    @staticmethod
+    def _operation(query: str) -> Tuple[Optional[str], Optional[str]]:
+        m = OPERATION_RE.match(query)
+        if not m:
+            return None, None
+        return m.group(1), m.group(2)
+
+    def _cached_response(self, input_json: dict) -> Tuple[bool, Any]:
+        if self.cache is None:
+            return False, None
+
+        kind, name = self._operation(input_json["query"])
+        if kind != "query":
+            return False, None
+
+        return self.cache.get(
+            name, self.cache.key(input_json["query"], input_json["variables"])
+        )
+
+    def _cache_response(self, input_json: dict, data: Any) -> None:
+        if self.cache is None:
+            return
+
+        kind, name = self._operation(input_json["query"])
+        if kind == "mutation":
+            self.cache.mutated(name)
+        elif kind == "query":
+            self.cache.set(
+                name, self.cache.key(input_json["query"], input_json["variables"]), data
+            )
+
+    def _project_selection(self, include: Optional[Iterable[str]]) -> str:
+        include = PROJECT_INCLUDES if include is None else tuple(include)
+        unknown = set(include) - set(PROJECT_INCLUDES)
+        if unknown:
+            raise Exception(
+                f"Unknown project fields: {', '.join(sorted(unknown))}. "
+                f"Expected any of: {', '.join(PROJECT_INCLUDES)}"
+            )
+
+        selection = """
                     id
                     name
                     label
-                    description
-                    organizations {{
+                    description"""
+        if "organizations" in include:
+            selection += """
+                    organizations {
                         id
                         name
                         label
-                    }}
+                    }"""
+        if "dataviews" in include:
+            selection += f"""
                     data_views {{
                         {self.dataview_fragment}
-                    }}
+                    }}"""
+        if "jobs" in include:
+            selection += f"""
                     jobs {{
                         {self.job_fragment}
-                    }}
+                    }}"""
+        return selection
+
+    def list_projects(self, include: Optional[Iterable[str]] = None) -> Optional[list]:
+        return self._gql_req(
+            query=f"""
+            query ListProjects {{
+                projects {{{self._project_selection(include)}
                 }}
             }}
             """,
             variables=None,
-        ).get("projects")
+            path=("projects",),
+        )
 
-    def get_project(self, id: str = None, label: str = None) -> Optional[dict]:
+    def list_projects_page(
+        self,
+        first: int,
+        after: Optional[str] = None,
+        include: Optional[Iterable[str]] = None,
+    ) -> Optional[list]:
+        return self._gql_req(
+            query=f"""
+            query ListProjects($first: Int, $after: String) {{
+                projects(first: $first, after: $after) {{{self._project_selection(include)}
+                }}
+            }}
+            """,
+            variables={"first": first, "after": after},
+            path=("projects",),
+        )
+
+    def get_project(
+        self, id: str = None, label: str = None, include: Optional[Iterable[str]] = None
+    ) -> Optional[dict]:
         return self._gql_req(
             query=f"""
             query GetProject($id: String, $label: Label) {{
-                project(id: $id, label: $label) {{
-                    id
-                    name
-                    label
-                    description
-                    organizations {{
-                        id
-                        name
-                        label
-                    }}
-                    data_views {{
-                        {self.dataview_fragment}
-                    }}
-                    jobs {{
-                        {self.job_fragment}
-                    }}
+                project(id: $id, label: $label) {{{self._project_selection(include)}
                 }}
             }}
             """,
             variables={"id": id, "label": label},
-        ).get("project")
+            path=("project",),
+        )
 
     def create_project(self, name: str, owner: str, description: str) -> Optional[dict]:
         return self._gql_req(
@@ -192,7 +584,8 @@ class Requester:
             }}
             """,
             variables={"name": name, "owner": owner, "description": description},
-        ).get("createProject")
+            path=("createProject",),
+        )
 
     def archive_project(self, id: str) -> Optional[dict]:
         return self._gql_req(
@@ -208,7 +601,8 @@ class Requester:
             }
             """,
             variables={"id": id},
-        ).get("archiveProject")
+            path=("archiveProject",),
+        )
 
     def create_dataview(
         self,
@@ -242,27 +636,39 @@ class Requester:
                     "development": development,
                 },
             },
-        ).get("addDataView")
+            path=("addDataView",),
+        )
 
     def list_dataviews(self, project_id: str) -> Optional[list]:
-        return (
-            self._gql_req(
-                query=f"""
+        return self._gql_req(
+            query=f"""
             query ListDataViews($id: String!) {{
                 project(id: $id) {{
                     data_views {{
                       {self.dataview_fragment}
                     }}
-                    jobs {{
-                        {self.job_fragment}
+                }}
+            }}
+            """,
+            variables={"id": project_id},
+            path=("project", "data_views"),
+        )
+
+    def list_dataviews_page(
+        self, project_id: str, first: int, after: Optional[str] = None
+    ) -> Optional[list]:
+        return self._gql_req(
+            query=f"""
+            query ListDataViews($id: String!, $first: Int, $after: String) {{
+                project(id: $id) {{
+                    data_views(first: $first, after: $after) {{
+                      {self.dataview_fragment}
                     }}
                 }}
             }}
             """,
-                variables={"id": project_id},
-            )
-            .get("project", {})
-            .get("data_views")
+            variables={"id": project_id, "first": first, "after": after},
+            path=("project", "data_views"),
         )
 
     def get_dataview(
@@ -270,24 +676,18 @@ class Requester:
     ) -> Optional[dict]:
         if not dataview_id and not uri:
             raise Exception("Required identifier id or uri not specified.")
-        return (
-            self._gql_req(
-                query=f"""
+        return self._gql_req(
+            query=f"""
             query GetDataView($id: String, $project_id: String, $uri: String) {{
                 project(id: $project_id) {{
                     data_views(id: $id, uri: $uri) {{
                       {self.dataview_fragment}
                     }}
-                    jobs {{
-                        {self.job_fragment}
-                    }}
                 }}
             }}
             """,
-                variables={"project_id": project_id, "id": dataview_id, "uri": uri},
-            )
-            .get("project", {})
-            .get("data_views")
+            variables={"project_id": project_id, "id": dataview_id, "uri": uri},
+            path=("project", "data_views"),
         )
 
     def delete_dataview(self, id: str) -> dict:
@@ -300,7 +700,9 @@ class Requester:
                 }
                 """,
             variables={"id": id},
-        ).get("removeDataView", {})
+            path=("removeDataView",),
+            default={},
+        )
 
     def create_job(self, project_id: str, job_type: str, task_config: str) -> dict:
         return self._gql_req(
@@ -316,7 +718,9 @@ class Requester:
                 "task_type": job_type,
                 "task_config": task_config,
             },
-        ).get("createTask", {})
+            path=("createTask",),
+            default={},
+        )
 
     def approve_job(self, job_id: str, org_id: str) -> dict:
         return self._gql_req(
@@ -328,7 +732,9 @@ class Requester:
             }}
             """,
             variables={"job_id": job_id, "organization_id": org_id},
-        ).get("approveJob", {})
+            path=("approveJob",),
+            default={},
+        )
 
     def submit_job(self, job_id: str) -> dict:
         return self._gql_req(
@@ -340,14 +746,15 @@ class Requester:
                     }}
                     """,
             variables={"task_id": job_id},
-        ).get("initializeSession", {})
+            path=("initializeSession",),
+            default={},
+        )
 
     def get_job(
         self, project_id: str, job_id: str, return_params: str
     ) -> Optional[dict]:
-        return (
-            self._gql_req(
-                query=f"""
+        return self._gql_req(
+            query=f"""
             query GetJob($project_id: String! $job_id: String!) {{
                 project(id: $project_id) {{
                   job(id: $job_id) {{
@@ -357,16 +764,13 @@ class Requester:
                 }}
             }}
             """,
-                variables={"project_id": project_id, "job_id": job_id},
-            )
-            .get("project", {})
-            .get("job")
+            variables={"project_id": project_id, "job_id": job_id},
+            path=("project", "job"),
         )
 
     def list_jobs(self, project_id: str) -> Optional[dict]:
-        return (
-            self._gql_req(
-                query=f"""
+        return self._gql_req(
+            query=f"""
             query ListJobs($project_id: String!) {{
                 project(id: $project_id) {{
                   jobs {{
@@ -375,12 +779,64 @@ class Requester:
                 }}
             }}
             """,
-                variables={"project_id": project_id},
-            )
-            .get("project", {})
-            .get("jobs")
+            variables={"project_id": project_id},
+            path=("project", "jobs"),
+        )
+
+    def list_jobs_page(
+        self, project_id: str, first: int, after: Optional[str] = None
+    ) -> Optional[list]:
+        return self._gql_req(
+            query=f"""
+            query ListJobs($project_id: String!, $first: Int, $after: String) {{
+                project(id: $project_id) {{
+                  jobs(first: $first, after: $after) {{
+                    {self.job_fragment}
+                  }}
+                }}
+            }}
+            """,
+            variables={"project_id": project_id, "first": first, "after": after},
+            path=("project", "jobs"),
         )
 
+    @staticmethod
+    def iter_pages(
+        fetch_page: Callable[[int, Optional[str]], Optional[list]],
+        page_size: int = 100,
+        prefetch: bool = False,
+    ) -> Iterator[list]:
+        """
+        Lazily yield pages from a cursor-paginated list query.
+
+        `fetch_page(first, after)` is called with the ID of the last item of the previous page \
+        as cursor until a page shorter than `page_size` is returned. With `prefetch`, the next \
+        page is requested in a background thread while the current one is being consumed.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = fetch_page(page_size, None) or []
+            while page:
+                next_page = None
+                has_next = len(page) >= page_size
+                if has_next and executor is not None:
+                    next_page = executor.submit(fetch_page, page_size, page[-1]["id"])
+
+                yield page
+
+                if not has_next:
+                    return
+                if next_page is not None:
+                    page = next_page.result() or []
+                else:
+                    page = fetch_page(page_size, page[-1]["id"]) or []
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
     def me(self):
         return self._gql_req(
             query="""
@@ -402,4 +858,6 @@ class Requester:
         }
             """,
             variables=None,
-        ).get("me", {})
+            path=("me",),
+            default={},
+        )
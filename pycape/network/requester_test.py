@@ -1,9 +1,13 @@
+import json
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 import pytest
 import responses
 
 from tests.fake import FAKE_HOST
+from tests.fake import FAKE_TOKEN
 
 from ..exceptions import GQLException
 from .requester import Requester
@@ -40,3 +44,183 @@ def test_gql_req(query, variables, body, status, exception):
         responses.add(responses.POST, f"{FAKE_HOST}/v1/query", body=body, status=status)
         r = Requester(endpoint=FAKE_HOST)
         r._gql_req(query=query, variables=variables)
+
+
+@responses.activate
+def test_batch():
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json=[
+            {"data": {"project": {"job": {"id": "job_1", "status": {"code": "Ok"}}}}},
+            {"data": {"project": {"job": {"id": "job_2", "status": {"code": "Ok"}}}}},
+            {"errors": [{"message": "job not found"}]},
+        ],
+    )
+    r = Requester(endpoint=FAKE_HOST)
+
+    with r.batch():
+        futures = [
+            r.get_job(project_id="p_123", job_id=j, return_params="")
+            for j in ("job_1", "job_2", "job_3")
+        ]
+        assert not futures[0].done()
+
+    assert len(responses.calls) == 1
+    assert futures[0].result()["id"] == "job_1"
+    assert futures[1].result()["id"] == "job_2"
+    with pytest.raises(GQLException, match="An error occurred: .*"):
+        futures[2].result()
+
+
+@responses.activate
+def test_batch_max_size():
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json=[{"data": {"project": {"jobs": []}}}] * 2,
+    )
+    r = Requester(endpoint=FAKE_HOST)
+
+    with r.batch(max_size=2):
+        futures = [r.list_jobs(project_id=f"p_{i}") for i in range(4)]
+
+    assert len(responses.calls) == 2
+    assert [f.result() for f in futures] == [[]] * 4
+
+
+@responses.activate
+def test_batch_mismatched_response():
+    responses.add(
+        responses.POST, f"{FAKE_HOST}/v1/query", json={"data": {}},
+    )
+    r = Requester(endpoint=FAKE_HOST)
+
+    with pytest.raises(GQLException, match="Expected 1 batched responses"):
+        with r.batch():
+            r.list_jobs(project_id="p_123")
+
+
+@responses.activate
+def test_batch_login():
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/login",
+        json={"token": "cookie", "user_id": "user_1"},
+    )
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json={"data": {"me": {"__typename": "MeResponse"}}},
+    )
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json=[{"data": {"project": {"jobs": []}}}],
+    )
+    r = Requester(endpoint=FAKE_HOST)
+
+    with r.batch():
+        # the user check is sent right away, the batch stays open
+        assert r.login(token=FAKE_TOKEN) == "user_1"
+        assert r.in_batch()
+        future = r.list_jobs(project_id="p_123")
+
+    assert not r.in_batch()
+    assert len(responses.calls) == 3
+    assert future.result() == []
+
+
+@responses.activate
+@pytest.mark.parametrize(
+    "include,selected,not_selected,exception",
+    [
+        (None, ["organizations", "data_views", "jobs"], [], notraising()),
+        ((), [], ["organizations", "data_views", "jobs"], notraising()),
+        (("organizations",), ["organizations"], ["data_views", "jobs"], notraising()),
+        (
+            ("members",),
+            [],
+            [],
+            pytest.raises(Exception, match="Unknown project fields: members"),
+        ),
+    ],
+)
+def test_get_project_include(include, selected, not_selected, exception):
+    with exception:
+        responses.add(
+            responses.POST,
+            f"{FAKE_HOST}/v1/query",
+            json={"data": {"project": {"id": "p_123"}}},
+        )
+        r = Requester(endpoint=FAKE_HOST)
+        r.get_project(id="p_123", include=include)
+
+        query = json.loads(responses.calls[0].request.body)["query"]
+        assert all(s in query for s in selected)
+        assert not any(s in query for s in not_selected)
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_pages(prefetch):
+    items = [{"id": str(i)} for i in range(5)]
+    calls = []
+
+    def fetch_page(first, after):
+        calls.append(after)
+        start = 0 if after is None else int(after) + 1
+        return items[start : start + first]
+
+    pages = list(Requester.iter_pages(fetch_page, page_size=2, prefetch=prefetch))
+
+    assert pages == [items[0:2], items[2:4], items[4:5]]
+    assert calls == [None, "1", "3"]
+
+
+def test_iter_pages_is_lazy():
+    calls = []
+
+    def fetch_page(first, after):
+        calls.append(after)
+        return [{"id": "a"}, {"id": "b"}]
+
+    pages = Requester.iter_pages(fetch_page, page_size=2)
+    next(pages)
+
+    assert calls == [None]
+
+
+def test_pool_options():
+    r = Requester(
+        endpoint=FAKE_HOST,
+        pool_connections=2,
+        pool_maxsize=64,
+        pool_block=True,
+        keep_alive=False,
+        tcp_keepalive=True,
+    )
+    adapter = r.session.get_adapter(FAKE_HOST)
+
+    assert adapter._pool_maxsize == 64
+    assert adapter._pool_connections == 2
+    assert adapter._pool_block is True
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.socket_options
+    assert r.session.headers["Connection"] == "close"
+
+
+@responses.activate
+def test_concurrent_requests(mocker):
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        json={"data": {"project": {"jobs": []}}},
+    )
+    r = Requester(endpoint=FAKE_HOST, pool_maxsize=8, timeout=(1, 5))
+    post = mocker.spy(r.session, "post")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: r.list_jobs(project_id=str(i)), range(50)))
+
+    assert results == [[]] * 50
+    assert len(responses.calls) == 50
+    assert all(c.kwargs["timeout"] == (1, 5) for c in post.call_args_list)
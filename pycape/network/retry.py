@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+from typing import Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# statuses returned by an overloaded or restarting coordinator (or the proxy in front of it)
+SERVER_FAILURE_STATUSES = frozenset({502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed coordinator request is retried.
+
+    Queries (and login) are retried on connection errors, timeouts and `status_forcelist` \
+    responses. Mutations are only retried when the request provably never reached the \
+    coordinator (the connection could not be established) or was rejected with 429, unless \
+    `retry_mutations` is set. Delays grow exponentially with full jitter and honour the \
+    `Retry-After` header.
+
+    Arguments:
+        max_retries (int): Maximum number of retries per request, 0 disables retrying.
+        backoff_factor (float): Base delay (in seconds) of the exponential backoff.
+        max_backoff (float): Upper bound (in seconds) of a single delay.
+        status_forcelist (Iterable[int]): Response statuses that are retried.
+        retry_mutations (bool): Also retry mutations in all the cases queries are retried.
+        respect_retry_after (bool): Wait at least as long as the `Retry-After` header asks.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        status_forcelist: Iterable[int] = (429, 502, 503, 504),
+        retry_mutations: bool = False,
+        respect_retry_after: bool = True,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.retry_mutations = retry_mutations
+        self.respect_retry_after = respect_retry_after
+
+    @staticmethod
+    def _not_sent(error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def should_retry_error(
+        self, attempt: int, error: Exception, idempotent: bool = True
+    ) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if not isinstance(
+            error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        ):
+            return False
+        return idempotent or self.retry_mutations or self._not_sent(error)
+
+    def should_retry_response(
+        self, attempt: int, response: requests.Response, idempotent: bool = True
+    ) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if response.status_code not in self.status_forcelist:
+            return False
+        return idempotent or self.retry_mutations or response.status_code == 429
+
+    @staticmethod
+    def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(
+        self, attempt: int, response: Optional[requests.Response] = None
+    ) -> float:
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        )
+
+        retry_after = self.retry_after(response) if self.respect_retry_after else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a coordinator that keeps failing.
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts or 502/503/504 \
+    responses) the circuit opens and requests fail immediately with `CircuitOpenException`. \
+    Once `reset_timeout` seconds have passed a single trial request is let through; the circuit \
+    closes again if it succeeds and re-opens if it fails. A trial that does not report back \
+    within `reset_timeout` is given up on and another one is let through.
+
+    Arguments:
+        failure_threshold (int): Consecutive failures after which the circuit opens.
+        reset_timeout (float): Time (in seconds) the circuit stays open before a trial request.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def retry_in(self) -> float:
+        """
+        Seconds until the open circuit lets a trial request through.
+        """
+        since = self._trial_at if self._state == self.HALF_OPEN else self._opened_at
+        return max(0.0, since + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            # only one trial request is in flight while half-open, unless it never reported
+            # back (e.g. its thread died)
+            if self.retry_in() <= 0:
+                self._state = self.HALF_OPEN
+                self._trial_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
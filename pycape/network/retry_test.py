@@ -0,0 +1,184 @@
+import pytest
+import requests
+import responses
+
+from tests.fake import FAKE_HOST
+
+from ..exceptions import CircuitOpenException
+from .requester import Requester
+from .retry import CircuitBreaker
+from .retry import RetryPolicy
+
+QUERY_JSON = {"data": {"project": {"id": "p_123"}}}
+MUTATION_JSON = {"data": {"removeDataView": {"id": "dv_123"}}}
+
+
+@pytest.fixture
+def sleep(mocker):
+    return mocker.patch("pycape.network.requester.time.sleep")
+
+
+class TestRetryPolicy:
+    def test_backoff_bounds(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        assert all(0 <= policy.backoff(0) <= 1 for _ in range(100))
+        assert all(0 <= policy.backoff(10) <= 5 for _ in range(100))
+
+    def test_backoff_retry_after(self):
+        policy = RetryPolicy(backoff_factor=0.1, max_backoff=30)
+        resp = requests.Response()
+        resp.headers["Retry-After"] = "12"
+
+        assert 12 <= policy.backoff(0, resp) <= 12.1
+
+    @pytest.mark.parametrize(
+        "status,idempotent,expect",
+        [
+            (503, True, True),
+            (503, False, False),
+            (429, False, True),
+            (500, True, False),
+            (422, True, False),
+        ],
+    )
+    def test_should_retry_response(self, status, idempotent, expect):
+        resp = requests.Response()
+        resp.status_code = status
+
+        assert RetryPolicy().should_retry_response(0, resp, idempotent) is expect
+
+
+class TestCircuitBreaker:
+    def test_open_and_reset(self, mocker):
+        monotonic = mocker.patch("pycape.network.retry.time.monotonic")
+        monotonic.return_value = 0
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        monotonic.return_value = 11
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_trial_lost(self, mocker):
+        monotonic = mocker.patch("pycape.network.retry.time.monotonic")
+        monotonic.return_value = 0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+
+        monotonic.return_value = 11
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        # the trial never reported back
+        monotonic.return_value = 20
+        assert not breaker.allow()
+        assert breaker.retry_in() == 1
+        monotonic.return_value = 21
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+@responses.activate
+def test_query_retried(sleep):
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", status=502)
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        status=503,
+        headers={"Retry-After": "2"},
+    )
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=QUERY_JSON)
+    r = Requester(endpoint=FAKE_HOST)
+
+    assert r.get_project(id="p_123")["id"] == "p_123"
+    assert len(responses.calls) == 3
+    assert sleep.call_args_list[1].args[0] >= 2
+
+
+@responses.activate
+def test_connection_error_retried(sleep):
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        body=requests.exceptions.ConnectionError("connection reset"),
+    )
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=QUERY_JSON)
+    r = Requester(endpoint=FAKE_HOST)
+
+    assert r.get_project(id="p_123")["id"] == "p_123"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_mutation_not_retried(sleep):
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", status=503)
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=MUTATION_JSON)
+    r = Requester(endpoint=FAKE_HOST)
+
+    with pytest.raises(requests.exceptions.HTTPError, match="503"):
+        r.delete_dataview(id="dv_123")
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_circuit_opens(sleep):
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", status=503)
+    r = Requester(
+        endpoint=FAKE_HOST,
+        retry=RetryPolicy(max_retries=1),
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        r.get_project(id="p_123")
+    with pytest.raises(CircuitOpenException, match="is failing"):
+        r.get_project(id="p_123")
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_circuit_recovers_after_failed_trial(sleep, mocker):
+    monotonic = mocker.patch("pycape.network.retry.time.monotonic")
+    monotonic.return_value = 0
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        body=requests.exceptions.ConnectionError("connection refused"),
+    )
+    # a connection reset while the body is read
+    responses.add(
+        responses.POST,
+        f"{FAKE_HOST}/v1/query",
+        body=requests.exceptions.ChunkedEncodingError("connection reset"),
+    )
+    responses.add(responses.POST, f"{FAKE_HOST}/v1/query", json=QUERY_JSON)
+    r = Requester(
+        endpoint=FAKE_HOST,
+        retry=RetryPolicy(max_retries=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10),
+    )
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        r.get_project(id="p_123")
+
+    monotonic.return_value = 11
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        r.get_project(id="p_123")
+    assert r.circuit_breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenException):
+        r.get_project(id="p_123")
+
+    monotonic.return_value = 22
+    for _ in range(3):
+        assert r.get_project(id="p_123")["id"] == "p_123"
+    assert r.circuit_breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,113 @@
+import io
+import json
+from abc import ABC
+from abc import abstractmethod
+from typing import Iterable
+from typing import Sequence
+from typing import Union
+
+from .lazy import LazyModule
+
+tabulate = LazyModule("tabulate")
+
+
+class Renderer(ABC):
+    """
+    Writes the entities listed by `Cape` and `Project` methods, and their status messages, \
+    to an output stream.
+
+    Rows are passed as a lazy iterable, so renderers that do not need them never build them.
+    """
+
+    @abstractmethod
+    def render(
+        self, out: io.StringIO, columns: Sequence[str], rows: Iterable[Sequence]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def message(self, out: io.StringIO, message: str) -> None:
+        pass
+
+
+class QuietRenderer(Renderer):
+    """
+    Writes nothing, for programmatic use where only the returned values matter.
+    """
+
+    def render(
+        self, out: io.StringIO, columns: Sequence[str], rows: Iterable[Sequence]
+    ) -> None:
+        pass
+
+    def message(self, out: io.StringIO, message: str) -> None:
+        pass
+
+
+class TableRenderer(Renderer):
+    """
+    Writes rows as a plain text table, once all of them are known.
+    """
+
+    def render(
+        self, out: io.StringIO, columns: Sequence[str], rows: Iterable[Sequence]
+    ) -> None:
+        out.write(tabulate.tabulate(list(rows), headers=list(columns)) + "\n")
+
+    def message(self, out: io.StringIO, message: str) -> None:
+        out.write(message + "\n")
+
+
+class JSONRenderer(Renderer):
+    """
+    Writes rows as a single JSON array of objects keyed by column name.
+    """
+
+    def render(
+        self, out: io.StringIO, columns: Sequence[str], rows: Iterable[Sequence]
+    ) -> None:
+        out.write(
+            json.dumps([dict(zip(columns, row)) for row in rows], default=str) + "\n"
+        )
+
+    def message(self, out: io.StringIO, message: str) -> None:
+        out.write(json.dumps({"message": message}) + "\n")
+
+
+class NDJSONRenderer(Renderer):
+    """
+    Streams rows as newline delimited JSON objects, writing each row as soon as it is built.
+    """
+
+    def render(
+        self, out: io.StringIO, columns: Sequence[str], rows: Iterable[Sequence]
+    ) -> None:
+        for row in rows:
+            out.write(json.dumps(dict(zip(columns, row)), default=str) + "\n")
+
+    def message(self, out: io.StringIO, message: str) -> None:
+        out.write(json.dumps({"message": message}) + "\n")
+
+
+RENDERERS = {
+    "quiet": QuietRenderer,
+    "table": TableRenderer,
+    "json": JSONRenderer,
+    "ndjson": NDJSONRenderer,
+}
+
+
+def get_renderer(render: Union[str, Renderer]) -> Renderer:
+    """
+    Returns the renderer for a rendering mode, one of `"quiet"`, `"table"`, `"json"` and \
+    `"ndjson"`, or `render` itself if it already is a `Renderer`.
+    """
+    if isinstance(render, Renderer):
+        return render
+
+    try:
+        return RENDERERS[render]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown render mode {render!r}, expected one of: {', '.join(RENDERERS)}"
+        )
@@ -0,0 +1,76 @@
+from io import StringIO
+
+import pytest
+
+from .render import JSONRenderer
+from .render import NDJSONRenderer
+from .render import QuietRenderer
+from .render import TableRenderer
+from .render import get_renderer
+
+COLUMNS = ("ID", "NAME")
+ROWS = [("a", "x"), ("b", None)]
+
+
+@pytest.mark.parametrize(
+    "renderer,expect",
+    [
+        (TableRenderer(), "ID    NAME\n----  ------\na     x\nb\n"),
+        (JSONRenderer(), '[{"ID": "a", "NAME": "x"}, {"ID": "b", "NAME": null}]\n'),
+        (NDJSONRenderer(), '{"ID": "a", "NAME": "x"}\n{"ID": "b", "NAME": null}\n'),
+        (QuietRenderer(), ""),
+    ],
+)
+def test_render(renderer, expect):
+    out = StringIO()
+    renderer.render(out, COLUMNS, iter(ROWS))
+
+    assert out.getvalue() == expect
+
+
+def test_ndjson_streams_rows():
+    out = StringIO()
+    written = []
+
+    def rows():
+        for row in ROWS:
+            yield row
+            written.append(out.getvalue())
+
+    NDJSONRenderer().render(out, COLUMNS, rows())
+
+    # each row is written before the next one is built
+    assert written == [
+        '{"ID": "a", "NAME": "x"}\n',
+        '{"ID": "a", "NAME": "x"}\n{"ID": "b", "NAME": null}\n',
+    ]
+
+
+def test_quiet_does_not_build_rows():
+    def rows():
+        raise AssertionError("rows should not be built")
+        yield
+
+    QuietRenderer().render(StringIO(), COLUMNS, rows())
+
+
+@pytest.mark.parametrize(
+    "renderer,expect",
+    [
+        (TableRenderer(), "done\n"),
+        (JSONRenderer(), '{"message": "done"}\n'),
+        (QuietRenderer(), ""),
+    ],
+)
+def test_message(renderer, expect):
+    out = StringIO()
+    renderer.message(out, "done")
+
+    assert out.getvalue() == expect
+
+
+def test_get_renderer():
+    renderer = NDJSONRenderer()
+
+    assert get_renderer(renderer) is renderer
+    assert isinstance(get_renderer("table"), TableRenderer)
@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .lazy import LazyModule
+from .vars import S3_MAX_POOL_CONNECTIONS
+
+boto3 = LazyModule("boto3")
+botocore_config = LazyModule("botocore.config")
+
+
+class S3ClientManager:
+    """
+    Process-wide pool of S3 clients, one per region and profile.
+
+    Creating a boto3 client resolves credentials, loads the service model and opens a new \
+    connection pool, so clients are created once and shared: boto3 clients (unlike sessions \
+    and resources) are safe to use from several threads.
+
+    Arguments:
+        max_pool_connections (int): Maximum number of pooled connections of each client.
+        endpoint_url (str): Endpoint to send S3 requests to instead of AWS, e.g. a local \
+        moto or MinIO server. Defaults to the `PYCAPE_S3_ENDPOINT_URL` environment variable.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = S3_MAX_POOL_CONNECTIONS,
+        endpoint_url: Optional[str] = None,
+    ):
+        self.max_pool_connections = max_pool_connections
+        self.endpoint_url = endpoint_url
+        self._clients: Dict[Tuple[Optional[str], Optional[str]], object] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        max_pool_connections: Optional[int] = None,
+        endpoint_url: Optional[str] = None,
+    ) -> None:
+        """
+        Change the options clients are created with. Existing clients are dropped.
+        """
+        with self._lock:
+            if max_pool_connections is not None:
+                self.max_pool_connections = max_pool_connections
+            if endpoint_url is not None:
+                self.endpoint_url = endpoint_url
+            self._clients.clear()
+
+    def clear(self) -> None:
+        """
+        Drop every client, e.g. after credentials changed.
+        """
+        with self._lock:
+            self._clients.clear()
+
+    def client(self, region: Optional[str] = None, profile: Optional[str] = None):
+        """
+        Returns the shared S3 client for a region and profile, creating it on first use. The \
+        default region and credentials are resolved as usual by boto3 when not given.
+        """
+        key = (region, profile)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # sessions are not thread-safe, only use them while holding the lock
+                session = boto3.session.Session(
+                    profile_name=profile, region_name=region
+                )
+                client = session.client(
+                    "s3",
+                    endpoint_url=self.endpoint_url
+                    or os.environ.get("PYCAPE_S3_ENDPOINT_URL"),
+                    config=botocore_config.Config(
+                        max_pool_connections=self.max_pool_connections
+                    ),
+                )
+                self._clients[key] = client
+            return client
+
+
+s3_clients = S3ClientManager()
+
+
+def get_s3_client(region: Optional[str] = None, profile: Optional[str] = None):
+    """
+    Returns the process-wide S3 client for a region and profile (see `S3ClientManager`).
+    """
+    return s3_clients.client(region=region, profile=profile)
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from .s3 import S3ClientManager
+from .s3 import get_s3_client
+from .s3 import s3_clients
+
+
+def test_client_is_shared():
+    manager = S3ClientManager()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: manager.client(), range(32)))
+
+    assert all(c is clients[0] for c in clients)
+    assert manager.client(region="eu-west-1") is not clients[0]
+    assert manager.client(region="eu-west-1").meta.region_name == "eu-west-1"
+
+
+def test_configure(monkeypatch):
+    monkeypatch.delenv("PYCAPE_S3_ENDPOINT_URL", raising=False)
+    manager = S3ClientManager(max_pool_connections=4)
+    client = manager.client()
+    assert client.meta.config.max_pool_connections == 4
+
+    manager.configure(max_pool_connections=16, endpoint_url="http://localhost:9000")
+
+    configured = manager.client()
+    assert configured is not client
+    assert configured.meta.config.max_pool_connections == 16
+    assert configured.meta.endpoint_url == "http://localhost:9000"
+
+
+def test_endpoint_from_environment(monkeypatch):
+    monkeypatch.setenv("PYCAPE_S3_ENDPOINT_URL", "http://localhost:9000")
+
+    assert S3ClientManager().client().meta.endpoint_url == "http://localhost:9000"
+
+
+def test_get_s3_client(s3_client):
+    put_s3_object("s3/data.csv", b"a\n")
+
+    assert get_s3_client() is s3_clients.client()
+    body = get_s3_client().get_object(Bucket=BUCKET_NAME, Key="s3/data.csv")["Body"]
+    assert body.read() == b"a\n"
@@ -1,30 +1,66 @@
+import io
 import pathlib
+import random
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
 from urllib.parse import urlparse
 
-import boto3
 import re
 
 from .exceptions import StorageException, StorageSchemeException
+from .lazy import LazyModule
+from .s3 import get_s3_client
 
+botocore_exceptions = LazyModule("botocore.exceptions")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+PARQUET_MAGIC = b"PAR1"
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
 
-def filter_date(string: str) -> datetime:
-    acceptable_fmts = (
-        "%Y",
-        "%Y-%m-%d",
-        "%b %d, %Y",
-        "%b %d, %Y",
-        "%B %d, %Y",
-        "%B %d %Y",
-        "%m/%d/%Y",
-        "%m/%d/%y",
-        "%b %Y",
-        "%B%Y",
-        "%b %d,%Y",
-    )
 
+# Accepted date formats, each with a regex that cheaply rules out values that cannot
+# match it before they are parsed
+DATE_FORMATS = (
+    ("%Y", re.compile(r"^\d{4}$")),
+    ("%Y-%m-%d", re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$")),
+    ("%b %d, %Y", re.compile(r"^[A-Za-z]{3} \d{1,2}, \d{4}$")),
+    ("%B %d, %Y", re.compile(r"^[A-Za-z]{3,9} \d{1,2}, \d{4}$")),
+    ("%B %d %Y", re.compile(r"^[A-Za-z]{3,9} \d{1,2} \d{4}$")),
+    ("%m/%d/%Y", re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$")),
+    ("%m/%d/%y", re.compile(r"^\d{1,2}/\d{1,2}/\d{2}$")),
+    ("%b %Y", re.compile(r"^[A-Za-z]{3} \d{4}$")),
+    ("%B%Y", re.compile(r"^[A-Za-z]{3,9}\d{4}$")),
+    ("%b %d,%Y", re.compile(r"^[A-Za-z]{3} \d{1,2},\d{4}$")),
+)
+
+
+def filter_date(string: str) -> datetime:
     date = None
-    for fmt in acceptable_fmts:
+    for fmt, pattern in DATE_FORMATS:
+        if not pattern.match(string):
+            continue
         try:
             date = datetime.strptime(string, fmt)
             break
@@ -35,18 +71,552 @@ def filter_date(string: str) -> datetime:
 
 
 def setup_boto_file(
-    uri: pathlib.PosixPath, temp_file_name: str, download_path: str = None
+    uri: pathlib.PosixPath, temp_file_name: str, download_path: str = None, client=None
 ) -> str:
     if not download_path:
         download_path = uri.path.lstrip("/")
-    # tell boto3 we are pulling from s3, p.netloc will be the bucket
-    b = boto3.resource(uri.scheme).Bucket(uri.netloc)
 
-    b.download_file(download_path, temp_file_name)
+    if client is None:
+        client = get_s3_client()
+
+    # uri.netloc is the bucket
+    client.download_file(uri.netloc, download_path, temp_file_name)
 
     return temp_file_name
 
 
+def read_boto_object(
+    uri: pathlib.PosixPath,
+    download_path: str = None,
+    byte_range: Optional[Tuple[int, Optional[int]]] = None,
+    client=None,
+) -> io.BytesIO:
+    """
+    Read an S3 object (or an inclusive `(start, end)` byte range of it) straight into memory, \
+    without a round trip through the local disk.
+    """
+    if not download_path:
+        download_path = uri.path.lstrip("/")
+    if client is None:
+        client = get_s3_client()
+
+    kwargs = {}
+    if byte_range is not None:
+        start, end = byte_range
+        kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+
+    body = client.get_object(Bucket=uri.netloc, Key=download_path, **kwargs)["Body"]
+    try:
+        return io.BytesIO(body.read())
+    finally:
+        body.close()
+
+
+def read_boto_head(
+    uri: pathlib.PosixPath,
+    min_lines: int,
+    initial_bytes: int = 64 * 1024,
+    max_bytes: Optional[int] = None,
+    download_path: str = None,
+    client=None,
+) -> io.BytesIO:
+    """
+    Read the head of an S3 object with ranged GETs, doubling the range until it holds at least \
+    `min_lines` complete lines (or the whole object, or `max_bytes`). A trailing partial line \
+    is dropped unless the end of the object was reached.
+    """
+    if not download_path:
+        download_path = uri.path.lstrip("/")
+    if client is None:
+        client = get_s3_client()
+
+    size = initial_bytes
+    while True:
+        try:
+            resp = client.get_object(
+                Bucket=uri.netloc, Key=download_path, Range=f"bytes=0-{size - 1}"
+            )
+        except botocore_exceptions.ClientError as e:
+            # ranges are not satisfiable on empty objects
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return io.BytesIO()
+            raise
+
+        try:
+            data = resp["Body"].read()
+        finally:
+            resp["Body"].close()
+
+        content_range = resp.get("ContentRange")
+        total = int(content_range.rsplit("/", 1)[-1]) if content_range else len(data)
+        complete = len(data) >= total
+
+        if (
+            complete
+            or data.count(b"\n") >= min_lines
+            or (max_bytes is not None and size >= max_bytes)
+        ):
+            break
+
+        size *= 2
+        if max_bytes is not None:
+            size = min(size, max_bytes)
+
+    last_newline = data.rfind(b"\n")
+    if not complete and last_newline != -1:
+        data = data[: last_newline + 1]
+
+    return io.BytesIO(data)
+
+
+def read_boto_sample(
+    uri: pathlib.PosixPath,
+    head_lines: int,
+    sample_ranges: int = 0,
+    range_bytes: int = 64 * 1024,
+    initial_bytes: int = 64 * 1024,
+    max_bytes: Optional[int] = None,
+    seed: Optional[int] = None,
+    client=None,
+) -> Tuple[io.BytesIO, List[bytes]]:
+    """
+    Sample an S3 object with ranged GETs: its head (see `read_boto_head`) plus \
+    `sample_ranges` non-overlapping ranges of `range_bytes` drawn at random from the rest of \
+    the object, each trimmed to the complete lines it contains. Small objects are read whole.
+
+    Returns:
+        The head, and a list with the complete lines of each sampled range.
+    """
+    download_path = uri.path.lstrip("/")
+    if client is None:
+        client = get_s3_client()
+
+    head = read_boto_head(
+        uri,
+        min_lines=head_lines,
+        initial_bytes=initial_bytes,
+        max_bytes=max_bytes,
+        download_path=download_path,
+        client=client,
+    )
+    if sample_ranges <= 0:
+        return head, []
+
+    size = client.head_object(Bucket=uri.netloc, Key=download_path)["ContentLength"]
+    start = len(head.getvalue())
+    remaining = size - start
+    if remaining <= 0:
+        return head, []
+
+    if remaining <= sample_ranges * range_bytes:
+        rest = read_boto_object(
+            uri, download_path=download_path, byte_range=(start, None), client=client
+        )
+        return head, [rest.getvalue()]
+
+    # draw one range from each of `sample_ranges` equal strata so ranges never overlap
+    rng = random.Random(seed)
+    stratum = remaining // sample_ranges
+    offsets = [
+        start + i * stratum + rng.randrange(stratum - range_bytes + 1)
+        for i in range(sample_ranges)
+    ]
+
+    chunks = []
+    for offset in offsets:
+        data = read_boto_object(
+            uri,
+            download_path=download_path,
+            byte_range=(offset, offset + range_bytes - 1),
+            client=client,
+        ).getvalue()
+        # drop the partial lines at both ends of the range
+        first, last = data.find(b"\n"), data.rfind(b"\n")
+        if first != -1 and last > first:
+            chunks.append(data[first + 1 : last + 1])
+
+    return head, chunks
+
+
+def detect_format(key: str, magic: bytes = b"") -> Tuple[str, Optional[str]]:
+    """
+    Detect the `(format, compression)` of a dataset from its key's extensions, falling back to \
+    the object's leading magic bytes. Formats are "csv", "jsonl" and "parquet", compressions \
+    are "gzip", "zstd" or `None`.
+    """
+    suffixes = [x.lower() for x in pathlib.PurePosixPath(key).suffixes]
+
+    compression = None
+    if suffixes and suffixes[-1] in COMPRESSION_EXTENSIONS:
+        compression = COMPRESSION_EXTENSIONS[suffixes.pop()]
+    elif magic.startswith(GZIP_MAGIC):
+        compression = "gzip"
+    elif magic.startswith(ZSTD_MAGIC):
+        compression = "zstd"
+
+    if suffixes and suffixes[-1] in FORMAT_EXTENSIONS:
+        return FORMAT_EXTENSIONS[suffixes[-1]], compression
+    if compression is None and magic.startswith(PARQUET_MAGIC):
+        return "parquet", None
+    return "csv", compression
+
+
+def detect_boto_format(
+    uri: pathlib.PosixPath, client=None
+) -> Tuple[str, Optional[str]]:
+    """
+    Detect the `(format, compression)` of an S3 object (see `detect_format`). Its first bytes \
+    are only fetched, with a tiny ranged GET, when the key has no recognized extension.
+    """
+    key = uri.path.lstrip("/")
+    suffixes = [x.lower() for x in pathlib.PurePosixPath(key).suffixes]
+    if suffixes and (
+        suffixes[-1] in FORMAT_EXTENSIONS or suffixes[-1] in COMPRESSION_EXTENSIONS
+    ):
+        return detect_format(key)
+
+    try:
+        magic = read_boto_object(
+            uri, download_path=key, byte_range=(0, 3), client=client
+        ).getvalue()
+    except botocore_exceptions.ClientError as e:
+        # empty objects have no satisfiable range
+        if e.response.get("Error", {}).get("Code") != "InvalidRange":
+            raise
+        magic = b""
+
+    return detect_format(key, magic)
+
+
+def _decompressor(compression: str):
+    if compression == "gzip":
+        # accept the gzip header and trailer
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "The zstandard package is required to read zstd compressed datasets"
+            )
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def read_boto_decompressed_head(
+    uri: pathlib.PosixPath,
+    compression: str,
+    min_lines: int,
+    chunk_bytes: int = 64 * 1024,
+    max_bytes: Optional[int] = None,
+    download_path: str = None,
+    client=None,
+) -> io.BytesIO:
+    """
+    Read and decompress a compressed S3 object with sequential ranged GETs until the \
+    decompressed data holds at least `min_lines` complete lines, the object ends, or \
+    `max_bytes` compressed bytes were read. A trailing partial line is dropped unless the end \
+    of the object was reached.
+    """
+    if not download_path:
+        download_path = uri.path.lstrip("/")
+    if client is None:
+        client = get_s3_client()
+
+    decompressor = _decompressor(compression)
+    out = bytearray()
+    start = 0
+    complete = False
+    while True:
+        try:
+            resp = client.get_object(
+                Bucket=uri.netloc,
+                Key=download_path,
+                Range=f"bytes={start}-{start + chunk_bytes - 1}",
+            )
+        except botocore_exceptions.ClientError as e:
+            # ranges are not satisfiable past the end of (or on empty) objects
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                complete = True
+                break
+            raise
+
+        try:
+            data = resp["Body"].read()
+        finally:
+            resp["Body"].close()
+
+        out += decompressor.decompress(data)
+        start += len(data)
+
+        content_range = resp.get("ContentRange")
+        total = int(content_range.rsplit("/", 1)[-1]) if content_range else start
+        if start >= total:
+            complete = True
+            break
+        if out.count(b"\n") >= min_lines or (
+            max_bytes is not None and start >= max_bytes
+        ):
+            break
+
+    last_newline = out.rfind(b"\n")
+    if not complete and last_newline != -1:
+        del out[last_newline + 1 :]
+
+    return io.BytesIO(bytes(out))
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    Seekable, read-only file object over an S3 object that fetches the bytes it is asked for \
+    with ranged GETs, reading at least `block_bytes` at a time. Reads near the end of the \
+    object fetch its whole tail, so e.g. a Parquet footer is typically read in a single request.
+    """
+
+    def __init__(
+        self, uri: pathlib.PosixPath, block_bytes: int = 64 * 1024, client=None
+    ):
+        self.uri = uri
+        self.key = uri.path.lstrip("/")
+        self.block_bytes = block_bytes
+        self.client = client or get_s3_client()
+        self.size = self.client.head_object(Bucket=uri.netloc, Key=self.key)[
+            "ContentLength"
+        ]
+        self.requests = 0
+
+        self._pos = 0
+        self._buf_start = 0
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, self._pos)
+        return self._pos
+
+    def _fetch(self, start: int, end: int) -> None:
+        self._buf = read_boto_object(
+            self.uri,
+            download_path=self.key,
+            byte_range=(start, end - 1),
+            client=self.client,
+        ).getvalue()
+        self._buf_start = start
+        self.requests += 1
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self.size - self._pos)
+        if n <= 0:
+            return 0
+
+        end = self._pos + n
+        if not (
+            self._buf_start <= self._pos and end <= self._buf_start + len(self._buf)
+        ):
+            if self._pos >= self.size - self.block_bytes:
+                self._fetch(
+                    max(0, min(self._pos, self.size - self.block_bytes)), self.size
+                )
+            else:
+                self._fetch(
+                    self._pos, min(self.size, self._pos + max(n, self.block_bytes))
+                )
+
+        offset = self._pos - self._buf_start
+        b[:n] = self._buf[offset : offset + n]
+        self._pos = end
+        return n
+
+
+def iter_boto_chunks(
+    uri: pathlib.PosixPath,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    max_workers: int = 8,
+    size: Optional[int] = None,
+    client=None,
+) -> Iterator[bytes]:
+    """
+    Stream an S3 object as consecutive chunks of `chunk_bytes`, fetched with up to \
+    `max_workers` concurrent ranged GETs. Chunks are yielded in order, and at most \
+    `max_workers` of them are held in memory at once.
+    """
+    download_path = uri.path.lstrip("/")
+    if client is None:
+        client = get_s3_client()
+    if size is None:
+        size = client.head_object(Bucket=uri.netloc, Key=download_path)["ContentLength"]
+
+    ranges = (
+        (start, min(start + chunk_bytes, size) - 1)
+        for start in range(0, size, chunk_bytes)
+    )
+
+    def fetch(byte_range):
+        return read_boto_object(
+            uri, download_path=download_path, byte_range=byte_range, client=client
+        ).getvalue()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque(pool.submit(fetch, r) for r in islice(ranges, max_workers))
+        while pending:
+            chunk = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append(pool.submit(fetch, next_range))
+            yield chunk
+
+
+def iter_boto_lines(
+    uri: pathlib.PosixPath,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    max_workers: int = 8,
+    client=None,
+) -> Iterator[bytes]:
+    """
+    Stream an S3 object (see `iter_boto_chunks`) as blocks of complete lines: each chunk is \
+    split after its last newline and the partial line is carried over to the next block. The \
+    last block may not end with a newline.
+    """
+    carry = b""
+    for chunk in iter_boto_chunks(
+        uri, chunk_bytes=chunk_bytes, max_workers=max_workers, client=client
+    ):
+        data = carry + chunk
+        last_newline = data.rfind(b"\n")
+        if last_newline == -1:
+            carry = data
+            continue
+
+        carry = data[last_newline + 1 :]
+        yield data[: last_newline + 1]
+
+    if carry:
+        yield carry
+
+
+class S3MultipartWriter:
+    """
+    Write-only stream to an S3 object, uploaded as a multipart upload whose parts of \
+    `part_bytes` (at least 5 MiB, except for the last one) are sent by up to `max_workers` \
+    threads while more data is written. At most `max_workers` parts are held in memory at \
+    once. The object is created when the writer is closed; the upload is aborted if the \
+    writer is exited on an exception.
+    """
+
+    def __init__(
+        self,
+        uri: pathlib.PosixPath,
+        part_bytes: int = 8 * 1024 * 1024,
+        max_workers: int = 8,
+        content_type: Optional[str] = None,
+        client=None,
+    ):
+        self.uri = uri
+        self.key = uri.path.lstrip("/")
+        self.part_bytes = part_bytes
+        self.max_workers = max_workers
+        self.client = client or get_s3_client()
+        self.bytes_written = 0
+
+        extra = {"ContentType": content_type} if content_type else {}
+        self.upload_id = self.client.create_multipart_upload(
+            Bucket=uri.netloc, Key=self.key, **extra
+        )["UploadId"]
+
+        self._buf = bytearray()
+        self._parts = []
+        self._pending = deque()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._closed = False
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _upload_part(self, number: int, body: bytes) -> dict:
+        response = self.client.upload_part(
+            Bucket=self.uri.netloc,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def _submit(self, body: bytes) -> None:
+        if len(self._pending) >= self.max_workers:
+            self._parts.append(self._pending.popleft().result())
+        number = len(self._parts) + len(self._pending) + 1
+        self._pending.append(self._pool.submit(self._upload_part, number, body))
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        self.bytes_written += len(data)
+        while len(self._buf) >= self.part_bytes:
+            self._submit(bytes(self._buf[: self.part_bytes]))
+            del self._buf[: self.part_bytes]
+        return len(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        try:
+            if self._buf or not (self._parts or self._pending):
+                self._submit(bytes(self._buf))
+                self._buf = bytearray()
+            while self._pending:
+                self._parts.append(self._pending.popleft().result())
+
+            self.client.complete_multipart_upload(
+                Bucket=self.uri.netloc,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        except Exception:
+            self.abort()
+            raise
+
+        self._closed = True
+        self._pool.shutdown()
+
+    def abort(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        for future in self._pending:
+            future.cancel()
+        self._pool.shutdown()
+        self.client.abort_multipart_upload(
+            Bucket=self.uri.netloc, Key=self.key, UploadId=self.upload_id
+        )
+
+
 def validate_s3_location(uri: str):
     p = urlparse(uri)
     # check bucket for special characters beyond
@@ -0,0 +1,238 @@
+import gzip
+from urllib.parse import urlparse
+
+import boto3
+import pytest
+
+from conftest import BUCKET_NAME
+from tests.fake import put_s3_object
+
+from .utils import S3MultipartWriter
+from .utils import S3RangeReader
+from .utils import detect_boto_format
+from .utils import detect_format
+from .utils import iter_boto_chunks
+from .utils import iter_boto_lines
+from .utils import read_boto_decompressed_head
+from .utils import read_boto_head
+from .utils import read_boto_object
+from .utils import read_boto_sample
+
+
+def test_read_boto_object(s3_client):
+    put_s3_object("utils/data.csv", b"a,b\n1,2\n3,4\n")
+    uri = urlparse(f"s3://{BUCKET_NAME}/utils/data.csv")
+
+    assert read_boto_object(uri).getvalue() == b"a,b\n1,2\n3,4\n"
+    assert read_boto_object(uri, byte_range=(0, 3)).getvalue() == b"a,b\n"
+    assert read_boto_object(uri, byte_range=(8, None)).getvalue() == b"3,4\n"
+
+
+def test_read_boto_head(s3_client, mocker):
+    rows = b"".join(b"%d,%d\n" % (i, i * 2) for i in range(1000))
+    put_s3_object("utils/big.csv", b"a,b\n" + rows)
+    put_s3_object("utils/empty.csv", b"")
+    client = boto3.client("s3")
+    get_object = mocker.spy(client, "get_object")
+
+    head = read_boto_head(
+        urlparse(f"s3://{BUCKET_NAME}/utils/big.csv"),
+        min_lines=20,
+        initial_bytes=16,
+        client=client,
+    ).getvalue()
+
+    assert head.count(b"\n") >= 20
+    assert head.endswith(b"\n")
+    assert len(head) < len(rows)
+    assert [c.kwargs["Range"] for c in get_object.call_args_list] == [
+        "bytes=0-15",
+        "bytes=0-31",
+        "bytes=0-63",
+        "bytes=0-127",
+    ]
+
+    whole = read_boto_head(
+        urlparse(f"s3://{BUCKET_NAME}/utils/big.csv"), min_lines=10 ** 6, client=client
+    ).getvalue()
+    assert whole == b"a,b\n" + rows
+
+    empty = read_boto_head(
+        urlparse(f"s3://{BUCKET_NAME}/utils/empty.csv"), min_lines=2, client=client
+    ).getvalue()
+    assert empty == b""
+
+
+def test_read_boto_sample(s3_client):
+    lines = [b"%06d\n" % i for i in range(10000)]
+    put_s3_object("utils/sample.csv", b"n\n" + b"".join(lines))
+
+    head, chunks = read_boto_sample(
+        urlparse(f"s3://{BUCKET_NAME}/utils/sample.csv"),
+        head_lines=10,
+        sample_ranges=4,
+        range_bytes=100,
+        initial_bytes=64,
+        seed=1,
+    )
+
+    assert head.getvalue().startswith(b"n\n000000\n")
+    assert len(chunks) == 4
+    sampled = [line + b"\n" for c in chunks for line in c.splitlines()]
+    assert all(line in lines for line in sampled)
+    assert len(set(sampled)) == len(sampled)
+
+
+@pytest.mark.parametrize(
+    "key,magic,expect",
+    [
+        ("data.csv", b"", ("csv", None)),
+        ("data.csv.gz", b"", ("csv", "gzip")),
+        ("data.CSV.ZST", b"", ("csv", "zstd")),
+        ("data.jsonl", b"", ("jsonl", None)),
+        ("data.ndjson.gz", b"", ("jsonl", "gzip")),
+        ("data.parquet", b"", ("parquet", None)),
+        ("part-0000", b"PAR1", ("parquet", None)),
+        ("part-0000", b"\x1f\x8b\x08\x00", ("csv", "gzip")),
+        ("part-0000", b"\x28\xb5\x2f\xfd", ("csv", "zstd")),
+        ("part-0000", b"a,b\n", ("csv", None)),
+    ],
+)
+def test_detect_format(key, magic, expect):
+    assert detect_format(key, magic) == expect
+
+
+def test_detect_boto_format(s3_client, mocker):
+    put_s3_object("utils/export.csv.gz", gzip.compress(b"a\n1\n"))
+    put_s3_object("utils/export", gzip.compress(b"a\n1\n"))
+    put_s3_object("utils/blank", b"")
+    client = boto3.client("s3")
+    get_object = mocker.spy(client, "get_object")
+
+    assert detect_boto_format(
+        urlparse(f"s3://{BUCKET_NAME}/utils/export.csv.gz"), client=client
+    ) == ("csv", "gzip")
+    assert get_object.call_count == 0
+
+    assert detect_boto_format(
+        urlparse(f"s3://{BUCKET_NAME}/utils/export"), client=client
+    ) == ("csv", "gzip")
+    assert get_object.call_args.kwargs["Range"] == "bytes=0-3"
+
+    assert detect_boto_format(
+        urlparse(f"s3://{BUCKET_NAME}/utils/blank"), client=client
+    ) == ("csv", None)
+
+
+def test_read_boto_decompressed_head(s3_client, mocker):
+    rows = b"".join(b"%d,%d\n" % (i, i * 2) for i in range(100000))
+    body = gzip.compress(b"a,b\n" + rows)
+    put_s3_object("utils/big.csv.gz", body)
+    client = boto3.client("s3")
+    get_object = mocker.spy(client, "get_object")
+    uri = urlparse(f"s3://{BUCKET_NAME}/utils/big.csv.gz")
+
+    head = read_boto_decompressed_head(
+        uri, "gzip", min_lines=50, chunk_bytes=1024, client=client
+    ).getvalue()
+
+    assert head.startswith(b"a,b\n0,0\n")
+    assert head.count(b"\n") >= 50
+    assert head.endswith(b"\n")
+    # only the first compressed chunk was needed
+    assert [c.kwargs["Range"] for c in get_object.call_args_list] == ["bytes=0-1023"]
+
+    whole = read_boto_decompressed_head(
+        uri, "gzip", min_lines=10 ** 6, chunk_bytes=64 * 1024, client=client
+    ).getvalue()
+    assert whole == b"a,b\n" + rows
+
+
+def test_s3_range_reader(s3_client, mocker):
+    body = bytes(range(256)) * 100
+    put_s3_object("utils/blob", body)
+    client = boto3.client("s3")
+
+    reader = S3RangeReader(
+        urlparse(f"s3://{BUCKET_NAME}/utils/blob"), block_bytes=1024, client=client
+    )
+    assert reader.size == len(body)
+
+    reader.seek(-8, 2)
+    assert reader.read(8) == body[-8:]
+    # the tail block is fetched once and serves nearby reads
+    reader.seek(-512, 2)
+    assert reader.read(4) == body[-512:-508]
+    assert reader.requests == 1
+
+    reader.seek(10)
+    assert reader.read(20) == body[10:30]
+    assert reader.tell() == 30
+    assert reader.read(10 ** 6) == body[30:]
+
+
+def test_iter_boto_chunks(s3_client):
+    body = b"".join(b"%d,%d\n" % (i, i * 3) for i in range(1000))
+    put_s3_object("utils/rows", body)
+    uri = urlparse(f"s3://{BUCKET_NAME}/utils/rows")
+
+    chunks = list(iter_boto_chunks(uri, chunk_bytes=1000, max_workers=4))
+
+    assert b"".join(chunks) == body
+    assert [len(c) for c in chunks[:-1]] == [1000] * (len(chunks) - 1)
+
+    blocks = list(iter_boto_lines(uri, chunk_bytes=1000, max_workers=4))
+
+    assert b"".join(blocks) == body
+    assert all(b.endswith(b"\n") for b in blocks)
+    assert len(blocks) == len(chunks)
+
+
+def test_iter_boto_lines_long_lines(s3_client):
+    body = b"a" * 2500 + b"\nb\nc"
+    put_s3_object("utils/long", body)
+
+    blocks = list(
+        iter_boto_lines(urlparse(f"s3://{BUCKET_NAME}/utils/long"), chunk_bytes=1000)
+    )
+
+    # lines spanning chunks are carried over into the block that completes them
+    assert blocks == [b"a" * 2500 + b"\nb\n", b"c"]
+
+
+@pytest.mark.parametrize("total", [0, 100, 1000, 1024])
+def test_s3_multipart_writer(s3_client, mocker, total):
+    mocker.patch("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 256)
+    client = boto3.client("s3")
+    upload_part = mocker.spy(client, "upload_part")
+    body = bytes(i % 251 for i in range(total))
+
+    with S3MultipartWriter(
+        urlparse(f"s3://{BUCKET_NAME}/utils/multipart"),
+        part_bytes=256,
+        max_workers=2,
+        client=client,
+    ) as out:
+        for i in range(0, total, 100):
+            out.write(body[i : i + 100])
+
+    assert out.bytes_written == total
+    assert upload_part.call_count == max(1, -(-total // 256))
+    obj = client.get_object(Bucket=BUCKET_NAME, Key="utils/multipart")
+    assert obj["Body"].read() == body
+
+
+def test_s3_multipart_writer_abort(s3_client):
+    client = boto3.client("s3")
+
+    with pytest.raises(ValueError):
+        with S3MultipartWriter(
+            urlparse(f"s3://{BUCKET_NAME}/utils/aborted"), client=client
+        ) as out:
+            out.write(b"partial")
+            raise ValueError()
+
+    assert "Uploads" not in client.list_multipart_uploads(Bucket=BUCKET_NAME)
+    assert "Contents" not in client.list_objects_v2(
+        Bucket=BUCKET_NAME, Prefix="utils/aborted"
+    )
@@ -1,5 +1,8 @@
 JOB_TYPE_LR = "LINEAR_REGRESSION"
 
+# Job status codes after which a job's status no longer changes
+JOB_TERMINAL_STATUSES = frozenset({"Completed", "Error", "Stopped", "Rejected"})
+
 # Mapping of pandas datatypes to json datatypes
 # dtypes object -> string
 # dtypes int64 -> integer
@@ -13,3 +16,47 @@ PANDAS_TO_JSON_DATATYPES = {
     "datetime64[ns]": "datetime",
     "category": "any",
 }
+
+# Schema inference samples the first SCHEMA_SAMPLE_ROWS data rows of a dataset plus
+# SCHEMA_SAMPLE_RANGES randomly placed ranges of SCHEMA_SAMPLE_RANGE_BYTES from the rest of it
+SCHEMA_SAMPLE_ROWS = 1000
+SCHEMA_SAMPLE_RANGES = 8
+SCHEMA_SAMPLE_RANGE_BYTES = 64 * 1024
+
+# Size of the first ranged read of a dataset's head during schema inference, it is doubled
+# until SCHEMA_SAMPLE_ROWS complete rows are available or SCHEMA_MAX_BYTES is reached
+SCHEMA_INITIAL_BYTES = 64 * 1024
+SCHEMA_MAX_BYTES = 64 * 1024 * 1024
+
+# Minimal share of a column's sampled values that must be dates in one of DATE_FORMATS for it
+# to be a datetime
+SCHEMA_DATETIME_CONFIDENCE = 0.95
+
+# Inferred schemas are cached on disk under SCHEMA_CACHE_DIR (overridden by the
+# PYCAPE_CACHE_DIR environment variable), keyed by the dataset's S3 ETag and size. The least
+# recently used schemas are evicted past SCHEMA_CACHE_MAX_ENTRIES or SCHEMA_CACHE_MAX_BYTES.
+SCHEMA_CACHE_DIR = "~/.cache/pycape"
+SCHEMA_CACHE_MAX_ENTRIES = 10000
+SCHEMA_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Size of the connection pool of each shared S3 client, i.e. how many requests to S3 can be
+# in flight at once per region and profile. PYCAPE_S3_ENDPOINT_URL points S3 clients to
+# another endpoint (e.g. a local moto or MinIO server).
+S3_MAX_POOL_CONNECTIONS = 50
+
+# Datasets are streamed from S3 in chunks of STREAM_CHUNK_BYTES, with up to
+# STREAM_MAX_WORKERS concurrent ranged reads
+STREAM_CHUNK_BYTES = 8 * 1024 * 1024
+STREAM_MAX_WORKERS = 8
+
+# VerticallyPartitionedLinearRegression expects the maximum of every input column to be
+# in [SCALING_MIN_MAX, SCALING_MAX_MAX)
+SCALING_MIN_MAX = 1.0
+SCALING_MAX_MAX = 10.0
+
+# Fixed-point encoding the Cape Worker is assumed to use for linear regression: values are
+# encoded on a ring of FIXEDPOINT_RING_BITS bits with FIXEDPOINT_INTEGRAL_PRECISION bits for
+# their integral part and FIXEDPOINT_FRACTIONAL_PRECISION bits for their fractional part
+FIXEDPOINT_RING_BITS = 128
+FIXEDPOINT_INTEGRAL_PRECISION = 24
+FIXEDPOINT_FRACTIONAL_PRECISION = 40
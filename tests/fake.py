@@ -1,6 +1,9 @@
+import boto3
 import pandas as pd
 from random import random, randint
 
+from conftest import BUCKET_NAME
+
 
 FAKE_HOST = "http://cape.com"
 FAKE_TOKEN = "abc,123"
@@ -22,3 +25,9 @@ def fake_csv_dob_date_field():
 def fake_dataframe():
     d = {"col1": [1, 2], "col2": [3, 4]}
     return pd.DataFrame(data=d)
+
+
+def put_s3_object(key, body):
+    """Write body to key in the mocked bucket, returns its S3 URI."""
+    boto3.resource("s3").Bucket(BUCKET_NAME).put_object(Key=key, Body=body)
+    return f"s3://{BUCKET_NAME}/{key}"